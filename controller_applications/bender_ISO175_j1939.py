@@ -1,10 +1,92 @@
+from collections.abc import Mapping
+from functools import cached_property
 from typing import Dict
 import can
 import struct
+import time
 import j1939
 
+from utils.can_filters import j1939_pgn_filters
+
 type CYCLIC_MESSAGE_TYPE = tuple[function, int]
 
+R_ISO_STATUS_MEANINGS = {
+    0xFC: "estimated isolation value during startup",
+    0xFD: "first measured isolation value during startup",
+    0xFE: "isolation value in normal operation",
+    0xFF: "SNV",
+}
+DEVICE_STATES = ("Init", "Normal", "SelfTest")
+
+
+class GeneralInfoView(Mapping):
+    """PGN 65281 (General Info) that decodes a key the first time it is read.
+
+    Same keys and values as the dict built by ``ISO175_CA.decode_pgn_65281`` (and compares equal to
+    it), but only the bytes behind the keys that are read get unpacked and looked up. Each key is
+    also an attribute: ``view["alarms"] == view.alarms``.
+    """
+
+    KEYS = (
+        "r_iso_corrected",
+        "r_iso_status",
+        "r_iso_status_meaning",
+        "measurement_counter",
+        "alarms",
+        "device_state",
+        "device_state_meaning",
+    )
+    _KEY_SET = frozenset(KEYS)
+
+    def __init__(self, data: bytes):
+        if len(data) < 7:
+            raise ValueError(f"PGN 65281 needs 7 bytes, got {len(data)}")
+        self.data = bytes(data)
+
+    @cached_property
+    def r_iso_corrected(self):
+        r_iso_corr = self.data[0] | self.data[1] << 8
+        return r_iso_corr if r_iso_corr != 0xFFFF else "SNV"
+
+    @cached_property
+    def r_iso_status(self):
+        return self.data[2]
+
+    @cached_property
+    def r_iso_status_meaning(self):
+        return R_ISO_STATUS_MEANINGS.get(self.data[2], "unknown status")
+
+    @cached_property
+    def measurement_counter(self):
+        return self.data[3]
+
+    @cached_property
+    def alarms(self):
+        return self.data[4] | self.data[5] << 8
+
+    @cached_property
+    def device_state(self):
+        return self.data[6]
+
+    @cached_property
+    def device_state_meaning(self):
+        device_state = self.data[6]
+        return DEVICE_STATES[device_state] if device_state < 3 else "Unknown"
+
+    def __getitem__(self, key):
+        if key not in self._KEY_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __repr__(self):
+        return f"GeneralInfoView({self.data.hex()})"
+
 
 class ISO175_CA(j1939.ControllerApplication):
     """Decoder class for ISO175 device messages following J1939 protocol.
@@ -64,10 +146,20 @@ class ISO175_CA(j1939.ControllerApplication):
 
     """
 
-    def __init__(self, name, device_address_preferred=None) -> None:
-        # Initialize decoders dictionary
+    def __init__(self, name, device_address_preferred=None, sink=None, tracer=None) -> None:
+        """
+        :param sink: optional ``sink(source, pgn, decoded)`` called by on_message for every decoded
+            frame (see ``utils.sinks``), with ``name`` as the source
+        :param tracer: optional latency tracer (see ``utils.latency_trace``) that on_message reports
+            every frame decoded with a receive timestamp to
+        """
+        self.name = name
+        self.sink = sink
+        self.tracer = tracer
+        # Initialize decoders dictionary. General Info arrives most often and is mostly checked for
+        # the alarms, so it is decoded lazily.
         self.decoders = {
-            65281: self.decode_pgn_65281,
+            65281: self.decode_pgn_65281_view,
             65282: self.decode_pgn_65282,
             65283: self.decode_pgn_65283,
             65284: self.decode_pgn_65284,
@@ -84,6 +176,8 @@ class ISO175_CA(j1939.ControllerApplication):
         self.isolation_detail = {}
         self.voltage_info = {}
         self.it_system_info = {}
+        # PGN -> receive timestamp of the frame the stored values were decoded from
+        self.timestamps = {}
 
         # Call parent class constructor
         j1939.ControllerApplication.__init__(self, name, device_address_preferred)
@@ -96,26 +190,34 @@ class ISO175_CA(j1939.ControllerApplication):
         """Stops the Controller Application."""
         return j1939.ControllerApplication.stop(self)
 
-    def on_message(self, pgn, data):
+    def on_message(self, pgn, data, timestamp=None):
         """Handle incoming messages.
 
         Args:
             pgn: Parameter Group Number of the message
             data: Data of the PDU
+            timestamp: receive timestamp of the frame (``msg.timestamp``). The j1939 ECU doesn't
+                pass it on, so frames it delivers are stamped with the time they were decoded.
         """
-        print(f"PGN {pgn} length {len(data)}")
-
         # Try to decode the message
         if pgn in self.decoders:
             result = self.decode(pgn, data)
-            # Print the decoded information if successful
-            if isinstance(result, dict):
-                if "error" not in result:
-                    print(f"\nDecoded PGN {pgn}:")
-                else:
-                    print("Could not decode the message!")
-                for key, value in result.items():
-                    print(f"  {key}: {value}")
+            if not isinstance(result, Mapping):
+                return
+            self.timestamps[pgn] = time.time() if timestamp is None else timestamp
+            if self.tracer is not None:
+                self.tracer.decoded(pgn, timestamp)
+            # Hand the decoded information to the sink
+            if self.sink is not None:
+                self.sink(self.name, pgn, result)
+
+    def age(self, pgn, now=None):
+        """Seconds since the frame behind the stored values of ``pgn`` was received (None if no
+        frame was decoded yet)."""
+        timestamp = self.timestamps.get(pgn)
+        if timestamp is None:
+            return None
+        return (time.time() if now is None else now) - timestamp
 
     def decode(self, pgn: int, data: bytes):
         """Decode a message based on its PGN.
@@ -130,6 +232,14 @@ class ISO175_CA(j1939.ControllerApplication):
         decoder = self.decoders.get(pgn)
         return decoder(data) if decoder else {"error": f"No decoder for PGN {pgn}"}
 
+    def can_filters(self):
+        """python-can filters matching the PGNs this CA can decode, from any source address."""
+        return j1939_pgn_filters(self.decoders)
+
+    def _report_error(self, pgn, error):
+        if self.sink is not None:
+            self.sink(self.name, pgn, {"error": f"Error decoding PGN {pgn}: {error}"})
+
     def decode_pgn_65281(self, data: bytes):
         """Decode PGN 65281 - General Info containing device status and measurements."""
         try:
@@ -144,12 +254,7 @@ class ISO175_CA(j1939.ControllerApplication):
             ]  # Bitfield containing alarm states
             device_state = data[6]  # Current state of the device
 
-            r_iso_status_meaning = {
-                0xFC: "estimated isolation value during startup",
-                0xFD: "first measured isolation value during startup",
-                0xFE: "isolation value in normal operation",
-                0xFF: "SNV",
-            }.get(r_iso_status, "unknown status")
+            r_iso_status_meaning = R_ISO_STATUS_MEANINGS.get(r_iso_status, "unknown status")
 
             # Store decoded values as instance variables
             self.general_info = {
@@ -160,16 +265,26 @@ class ISO175_CA(j1939.ControllerApplication):
                 "alarms": alarms,
                 "device_state": device_state,
                 "device_state_meaning": (
-                    ["Init", "Normal", "SelfTest"][device_state]
-                    if device_state < 3
-                    else "Unknown"
+                    DEVICE_STATES[device_state] if device_state < 3 else "Unknown"
                 ),
             }
             return self.general_info
         except Exception as e:
-            print(f"Error decoding PGN 65281: {e}")
+            self._report_error(65281, e)
             return False
 
+    def decode_pgn_65281_view(self, data: bytes):
+        """Lazy decode of PGN 65281 for consumers that read a few keys (see GeneralInfoView).
+
+        Stores the view as ``general_info``, like decode_pgn_65281 stores its dict.
+        """
+        try:
+            self.general_info = GeneralInfoView(data)
+        except ValueError as e:
+            self._report_error(65281, e)
+            return False
+        return self.general_info
+
     def decode_pgn_65282(self, data: bytes):
         """Decode PGN 65282 - Isolation Detail containing detailed isolation measurements."""
         try:
@@ -190,7 +305,7 @@ class ISO175_CA(j1939.ControllerApplication):
             }
             return self.isolation_detail
         except Exception as e:
-            print(f"Error decoding PGN 65282: {e}")
+            self._report_error(65282, e)
             return False
 
     def decode_pgn_65283(self, data: bytes):
@@ -209,7 +324,7 @@ class ISO175_CA(j1939.ControllerApplication):
             }
             return self.voltage_info
         except Exception as e:
-            print(f"Error decoding PGN 65283: {e}")
+            self._report_error(65283, e)
             return False
 
     def decode_pgn_65284(self, data: bytes):
@@ -235,7 +350,7 @@ class ISO175_CA(j1939.ControllerApplication):
             }
             return self.it_system_info
         except Exception as e:
-            print(f"Error decoding PGN 65284: {e}")
+            self._report_error(65284, e)
             return False
 
 
@@ -248,8 +363,13 @@ if __name__ == "__main__":
     # Connect to the CAN bus
     ecu.connect(bustype="socketcan", channel="can0", bitrate=500000)
 
+    def print_decoded(source, pgn, decoded):
+        print(f"\nDecoded PGN {pgn}:")
+        for key, value in decoded.items():
+            print(f"  {key}: {value}")
+
     # Create and add the ISO175 controller application
-    iso175 = ISO175_CA("ISO175")
+    iso175 = ISO175_CA("ISO175", sink=print_decoded)
     ecu.add_ca(controller_application=iso175)
 
     try:
@@ -1,8 +1,12 @@
+from dataclasses import dataclass
 from enum import Enum
 import struct
+import threading
 from typing import Dict
 import j1939
 
+from utils.can_filters import j1939_pgn_filters
+
 # import logging
 
 
@@ -15,6 +19,177 @@ import j1939
 ## For python 3.12:
 type CYCLIC_MESSAGE_TYPE = tuple[function, int]
 
+# Precompiled payload layouts, one per multi-field PGN (little-endian, "x" skips unused bytes).
+# Compiling them once avoids re-parsing a format string on every frame.
+EEC1_STRUCT = struct.Struct("<xBBHBB")  # 61444: demand torque, actual torque, speed, TSC1 SA, starter
+EEC2_STRUCT = struct.Struct("<xBB")  # 61443: accelerator pedal position, engine load
+EEC3_STRUCT = struct.Struct("<xH")  # 65247: desired engine speed
+LFE_STRUCT = struct.Struct("<H4xB")  # 65266: fuel rate, throttle position
+VEP1_STRUCT = struct.Struct("<4xH")  # 65271: battery potential
+LFC_STRUCT = struct.Struct("<4xI")  # 65257: total fuel used
+SHUTDN_STRUCT = struct.Struct("<3xBB")  # 65252: wait to start lamp, shutdown status
+
+
+class _PayloadInput:
+    """
+    Setpoint a transmitted payload is encoded from. Assigning it drops the cached payloads of
+    ``pgns`` (see ``Kubota_D902k_CA.payload``), under the payload lock so a cyclic callback encoding
+    at the same time can't cache a payload built from the old value.
+    """
+
+    def __init__(self, *pgns):
+        self.pgns = pgns
+
+    def __set_name__(self, owner, name):
+        self.attribute = "_" + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance.__dict__[self.attribute]
+
+    def __set__(self, instance, value):
+        with instance._payload_lock:
+            instance.__dict__[self.attribute] = value
+            for pgn in self.pgns:
+                instance._payloads.pop(pgn, None)
+
+
+# Decoded values for each PGN. The CA keeps one instance of each and overwrites it on every frame, so
+# the hot path allocates nothing; as_dict() gives the human-readable view returned by decode_<pgn>.
+@dataclass(slots=True)
+class EEC1Record:
+    """PGN 61444 - Engine Speed, Torque, Starter Mode"""
+
+    engine_speed_rpm: float = 0.0
+    demand_torque_percent: int = 0
+    actual_torque_percent: int = 0
+    starter_mode: int = 0
+    tsc1_source_address: int = 0
+
+    def as_dict(self):
+        return {
+            "PGN": 61444,
+            "Engine Speed (RPM)": self.engine_speed_rpm,
+            "Driver's Demand Torque (%)": self.demand_torque_percent,
+            "Actual Engine Torque (%)": self.actual_torque_percent,
+            "Starter Mode": self.starter_mode,
+            "Starter Message": Kubota_D902k_CA.ENGINE_STARTER_MODE.get(
+                self.starter_mode, "STATUS UNKNOWN"
+            ),
+            "TSC1 Source Address": self.tsc1_source_address,
+        }
+
+
+@dataclass(slots=True)
+class EEC2Record:
+    """PGN 61443 - Pedal Position, Engine Load"""
+
+    engine_load_percent: float = 0.0
+    accelerator_pedal_position_percent: float = 0.0
+
+    def as_dict(self):
+        return {
+            "PGN": 61443,
+            "Engine Load (%)": self.engine_load_percent,
+            "Accelerator Pedal Position (%)": self.accelerator_pedal_position_percent,
+        }
+
+
+@dataclass(slots=True)
+class EEC3Record:
+    """PGN 65247 - Desired Engine Speed"""
+
+    desired_engine_speed_rpm: float = 0.0
+
+    def as_dict(self):
+        return {
+            "PGN": 65247,
+            "Desired Engine Speed (RPM)": self.desired_engine_speed_rpm,
+        }
+
+
+@dataclass(slots=True)
+class ET1Record:
+    """PGN 65262 - Engine Coolant Temperature"""
+
+    coolant_temp_c: int = 0
+
+    def as_dict(self):
+        return {
+            "PGN": 65262,
+            "Engine Coolant Temp (°C)": self.coolant_temp_c,
+        }
+
+
+@dataclass(slots=True)
+class LFERecord:
+    """PGN 65266 - Fuel Rate, Throttle Position"""
+
+    fuel_rate_lph: float = 0.0
+    throttle_position_percent: float = 0.0
+
+    def as_dict(self):
+        return {
+            "PGN": 65266,
+            "Fuel Rate (L/h)": self.fuel_rate_lph,
+            "Throttle Position (%)": self.throttle_position_percent,
+        }
+
+
+@dataclass(slots=True)
+class VEP1Record:
+    """PGN 65271 - Battery Potential"""
+
+    battery_voltage_v: float = 0.0
+
+    def as_dict(self):
+        return {
+            "PGN": 65271,
+            "Battery Voltage (V)": self.battery_voltage_v,
+        }
+
+
+@dataclass(slots=True)
+class AMBRecord:
+    """PGN 65269 - Barometric Pressure"""
+
+    barometric_pressure_kpa: float = 0.0
+
+    def as_dict(self):
+        return {
+            "PGN": 65269,
+            "Barometric Pressure (kPa)": self.barometric_pressure_kpa,
+        }
+
+
+@dataclass(slots=True)
+class LFCRecord:
+    """PGN 65257 - Total Fuel Used"""
+
+    total_fuel_used_l: float = 0.0
+
+    def as_dict(self):
+        return {
+            "PGN": 65257,
+            "Total Fuel Used (L)": self.total_fuel_used_l,
+        }
+
+
+@dataclass(slots=True)
+class SHUTDNRecord:
+    """PGN 65252 - Wait to Start Lamp, Shutdown Status"""
+
+    wait_to_start_lamp: int = 0
+    shutdown_active: int = 0
+
+    def as_dict(self):
+        return {
+            "PGN": 65252,
+            "Wait to Start Lamp": self.wait_to_start_lamp,
+            "Shutdown Active": self.shutdown_active,
+        }
+
 
 class Kubota_D902k_CA(j1939.ControllerApplication):
     """
@@ -32,6 +207,20 @@ class Kubota_D902k_CA(j1939.ControllerApplication):
     PGN_TRANSMIT_VEHICLE_SPEED = 65265  # pgn  for the vehicle speed.
     PGN_TRANSMIT_ENGINE_CONTROL = 65363  # PGN for the engine control
 
+    # Setpoints the transmitted payloads are encoded from. Assigning one of them drops the cached
+    # payloads of the PGNs listed, so the cyclic callbacks only re-encode after a setpoint changed.
+    neutral_switch = _PayloadInput(PGN_TRANSMIT_ENGINE_CONTROL)
+    accelerator_pedal_error_info = _PayloadInput(PGN_TRANSMIT_ENGINE_CONTROL)
+    icr_integration_paragraph_stop = _PayloadInput(PGN_TRANSMIT_ENGINE_CONTROL)
+    icr_proportion_paragraph_stop = _PayloadInput(PGN_TRANSMIT_ENGINE_CONTROL)
+    icr_target_engine_speed = _PayloadInput(PGN_TRANSMIT_ENGINE_CONTROL)
+    governor_characteristic_info = _PayloadInput(PGN_TRANSMIT_ENGINE_CONTROL)
+    droop_map_select_info = _PayloadInput(PGN_TRANSMIT_ENGINE_CONTROL)
+    engine_stop_info = _PayloadInput(PGN_TRANSMIT_ENGINE_CONTROL)
+    accelerator_pedal_position = _PayloadInput(PGN_TRANSMIT_ENGINE_CONTROL)
+    vehicle_speed = _PayloadInput(PGN_TRANSMIT_ENGINE_CONTROL, PGN_TRANSMIT_VEHICLE_SPEED)
+    park_brake = _PayloadInput(PGN_TRANSMIT_VEHICLE_SPEED)
+
     """0000: start not requested
     0010: starter active (gear engaged)
     0100: starter inhibited due to engine already running
@@ -45,7 +234,27 @@ class Kubota_D902k_CA(j1939.ControllerApplication):
         0b1100: "START INHIBITED ",
     }
 
-    def __init__(self, name, device_address_preferred=None) -> None:
+    def __init__(
+        self, name, device_address_preferred=None, scheduler=None, sink=None
+    ) -> None:
+        """
+        :param scheduler: optional cyclic scheduler (e.g. ``utils.cyclic_scheduler.CyclicScheduler``)
+            with ``add(period_s, callback)``/``remove(callback)`` to drive the cyclic messages
+            instead of the ECU timer events
+        :param sink: optional ``sink(source, pgn, decoded)`` called by on_message for every decoded
+            frame (see ``utils.sinks``), with ``name`` as the source
+        """
+        # Held while a payload is encoded and stored, and while a setpoint drops it, so a cyclic
+        # callback can't cache a payload encoded from the values before the setpoint changed
+        self._payload_lock = threading.Lock()
+        self._payloads = {}  # PGN -> encoded payload, see _PayloadInput
+        self.name = name
+        self.sink = sink
+        self.scheduler = scheduler
+        self.payload_encoders = {
+            self.PGN_TRANSMIT_ENGINE_CONTROL: self.encode_65363,
+            self.PGN_TRANSMIT_VEHICLE_SPEED: self.encode_65265,
+        }
         self.decoders = {
             61444: self.decode_61444,
             61443: self.decode_61443,
@@ -57,6 +266,29 @@ class Kubota_D902k_CA(j1939.ControllerApplication):
             65257: self.decode_65257,
             65252: self.decode_65252,
         }
+        # Reusable records, overwritten in place by the decode_<pgn>_record methods
+        self.records = {
+            61444: EEC1Record(),
+            61443: EEC2Record(),
+            65247: EEC3Record(),
+            65262: ET1Record(),
+            65266: LFERecord(),
+            65271: VEP1Record(),
+            65269: AMBRecord(),
+            65257: LFCRecord(),
+            65252: SHUTDNRecord(),
+        }
+        self.record_decoders = {
+            61444: self.decode_61444_record,
+            61443: self.decode_61443_record,
+            65247: self.decode_65247_record,
+            65262: self.decode_65262_record,
+            65266: self.decode_65266_record,
+            65271: self.decode_65271_record,
+            65269: self.decode_65269_record,
+            65257: self.decode_65257_record,
+            65252: self.decode_65252_record,
+        }
         self.vehicle_speed = j1939.ControllerApplication.FieldValue.NOT_AVAILABLE_8
         self.throttle_pos = j1939.ControllerApplication.FieldValue.NOT_AVAILABLE_8
         self.park_brake = j1939.ControllerApplication.FieldValue.NOT_AVAILABLE_8
@@ -73,21 +305,33 @@ class Kubota_D902k_CA(j1939.ControllerApplication):
         self.accelerator_pedal_position: float = 0.0  # 0-100, percent
         self.vehicle_speed: float = 0.0  # 0-642.55, km/h
         self.cyclic_message_functions: Dict[int, CYCLIC_MESSAGE_TYPE] = {
-            65265: (self.timer_callback_65265, 100),
-            6563: (self.timer_callback_6563, 10),
+            self.PGN_TRANSMIT_VEHICLE_SPEED: (self.timer_callback_65265, 100),
+            self.PGN_TRANSMIT_ENGINE_CONTROL: (self.timer_callback_6563, 10),
         }
 
         # old fashion calling convention for compatibility with Python2
         j1939.ControllerApplication.__init__(self, name, device_address_preferred)
 
+    def payload(self, pgn) -> bytes:
+        """Encoded payload of a transmitted PGN, only re-encoded after one of its inputs changed."""
+        payload = self._payloads.get(pgn)
+        if payload is None:
+            with self._payload_lock:
+                payload = self._payloads.get(pgn)
+                if payload is None:
+                    payload = self._payloads[pgn] = bytes(self.payload_encoders[pgn]())
+        return payload
+
     def start(self):
         """Starts the CA
         (OVERLOADED function)
         """
-        # add our timer event
-        if self._ecu is not None:
-            for callback, period in self.cyclic_message_functions.items():
-                self._ecu.add_timer(period, callback)
+        # add our timer events, the periods are in ms
+        for callback, period in self.cyclic_message_functions.values():
+            if self.scheduler is not None:
+                self.scheduler.add(period / 1000, callback)
+            elif self._ecu is not None:
+                self._ecu.add_timer(period / 1000, callback)
 
         # call the super class function
         return j1939.ControllerApplication.start(self)
@@ -96,9 +340,11 @@ class Kubota_D902k_CA(j1939.ControllerApplication):
         """Stops the CA
         (OVERLOADED function)
         """
-        if self._ecu is not None:
-            for callback, period in self.cyclic_message_functions.items():
-                self._ecu.remove_timer(period, callback)
+        for callback, _ in self.cyclic_message_functions.values():
+            if self.scheduler is not None:
+                self.scheduler.remove(callback)
+            elif self._ecu is not None:
+                self._ecu.remove_timer(callback)
 
     def on_message(self, pgn, data):
         """Feed incoming message to this CA.
@@ -108,80 +354,105 @@ class Kubota_D902k_CA(j1939.ControllerApplication):
         :param bytearray data:
             Data of the PDU
         """
-        print("PGN {} length {}".format(pgn, len(data)))
-
         # Try to decode the message
-        if pgn in self.decoders.keys():
-            result = self.decode(pgn, data)
-            # Print the decoded information if successful
-            if type(result) == dict:
-                if "error" not in result:
-                    print(f"\nDecoded PGN {pgn}:")
-                else:
-                    print("Could not decode the message!")
-                for key, value in result.items():
-                    print(f"  {key}: {value}")
+        if pgn in self.decoders:
+            try:
+                result = self.decode(pgn, data)
+            except (ValueError, IndexError, struct.error) as e:
+                result = {"error": f"Error decoding PGN {pgn}: {e}"}
+            # Hand the decoded information to the sink if successful
+            if self.sink is not None:
+                self.sink(self.name, pgn, result)
 
     def decode(self, pgn, data):
         """Dispatch decoder based on PGN."""
         decoder = self.decoders.get(pgn)
         return decoder(data) if decoder else {"error": f"No decoder for PGN {pgn}"}
 
+    def can_filters(self):
+        """python-can filters matching the PGNs this CA can decode, from any source address."""
+        return j1939_pgn_filters(self.decoders)
+
+    def decode_record(self, pgn, data):
+        """Decode into the reusable record for ``pgn`` and return it (None if there is no decoder).
+
+        This is the allocation-free counterpart of decode(); the record is overwritten by the next
+        frame of the same PGN, so copy out what you need to keep.
+        """
+        decoder = self.record_decoders.get(pgn)
+        return decoder(data) if decoder else None
+
+    def decode_61444_record(self, data):
+        record = self.records[61444]
+        (
+            demand_torque,
+            actual_torque,
+            engine_speed_bits,
+            record.tsc1_source_address,
+            record.starter_mode,
+        ) = EEC1_STRUCT.unpack_from(data)
+        record.demand_torque_percent = demand_torque - 125
+        record.actual_torque_percent = actual_torque - 125
+        record.engine_speed_rpm = self._engine_speed_bits_to_rpm(engine_speed_bits)
+        return record
+
     def decode_61444(self, data):
         """EEC1 - Engine Speed, Torque, Starter Mode, etc."""
-        demand_torque = data[1] - 125
-        actual_torque = data[2] - 125
-        engine_speed = self._engine_speed_bits_to_rpm(
-            struct.unpack_from("<H", data, 3)[0]
-        )
-        tsc1_src_address = data[5]
-        # starter_mode = (
-        #     data[6] & 0xF0
-        # ) >> 4  # TODO: Not convinced this is right. Needs to be checked
-        starter_mode = data[6]
-        return {
-            "PGN": 61444,
-            "Engine Speed (RPM)": engine_speed,
-            "Driver's Demand Torque (%)": demand_torque,
-            "Actual Engine Torque (%)": actual_torque,
-            "Starter Mode": starter_mode,
-            "Starter Message": self.ENGINE_STARTER_MODE.get(
-                starter_mode, "STATUS UNKNOWN"
-            ),
-            "TSC1 Source Address": tsc1_src_address,
-        }
+        return self.decode_61444_record(data).as_dict()
+
+    def decode_61443_record(self, data):
+        record = self.records[61443]
+        accel_bits, engine_load = EEC2_STRUCT.unpack_from(data)
+        record.engine_load_percent = engine_load * 1.0
+        record.accelerator_pedal_position_percent = accel_bits * 0.4
+        return record
 
     def decode_61443(self, data):
         """EEC2 - Pedal Position, Engine Load"""
-        engine_load = data[2] * 1.0
-        accel_pos = data[1] * 0.4
-        return {
-            "PGN": 61443,
-            "Engine Load (%)": engine_load,
-            "Accelerator Pedal Position (%)": accel_pos,
-        }
+        return self.decode_61443_record(data).as_dict()
+
+    def decode_65247_record(self, data):
+        record = self.records[65247]
+        record.desired_engine_speed_rpm = EEC3_STRUCT.unpack_from(data)[0] * 0.125
+        return record
 
     def decode_65247(self, data):
         """EEC3 - Desired Engine Speed"""
-        desired_speed = struct.unpack_from("<H", data, 1)[0] * 0.125
-        return {
-            "PGN": 65247,
-            "Desired Engine Speed (RPM)": desired_speed,
-        }
+        return self.decode_65247_record(data).as_dict()
+
+    def decode_65262_record(self, data):
+        record = self.records[65262]
+        record.coolant_temp_c = data[0] - 40
+        return record
 
     def decode_65262(self, data):
         """ET1 - Engine Coolant Temperature"""
-        temp_c = data[0] - 40
-        return {
-            "PGN": 65262,
-            "Engine Coolant Temp (°C)": temp_c,
-        }
+        return self.decode_65262_record(data).as_dict()
 
     def set_vehicle_speed_65265(self, km_hr: float):
-        """Transmit vehicle speed"""
-        self.vehicle_speed = int(km_hr / 250.996)
+        """Transmit vehicle speed, in km/h (encode_65265 scales it to 1/256 km/h per bit)"""
+        self.vehicle_speed = km_hr
         # CCVS	18FEF1VA*	65265	2-3	2 bytes	84	Vehicle Speed		X	6	100	0 to 250.996 km/h, 1/256 km/h per bit, 0 offset
 
+    def encode_65265(self) -> bytes:
+        """
+        Encodes PGN 65265 (CCVS - Cruise Control/Vehicle Speed).
+        Period:         100 ms
+        Data Length:    8   bytes
+
+        Byte 1, bits 3-4:   Parking Brake Switch (00: not set, 01: set), 11 if not available
+        Bytes 2-3:          Wheel-Based Vehicle Speed, 0 to 250.996 km/h, 1/256 km/h per bit,
+                            little-endian
+        Everything else is sent as not available (all ones).
+        """
+        data = bytearray(b"\xff" * 8)
+        if self.park_brake in (0, 1):
+            data[0] = 0xF3 | (int(self.park_brake) << 2)
+        speed_bits = max(0, min(0xFAFF, int(round(self.vehicle_speed * 256))))
+        data[1] = speed_bits & 0xFF
+        data[2] = (speed_bits >> 8) & 0xFF
+        return data
+
     def timer_callback_65265(self, cookie):
         """Callback for sending the vehicle speed message for the kubota to read
 
@@ -206,8 +477,7 @@ class Kubota_D902k_CA(j1939.ControllerApplication):
         self.send_message(
             priority=6,
             parameter_group_number=self.PGN_TRANSMIT_VEHICLE_SPEED,
-            # data=self.vehicle_speed,
-            # TODO THIS IS WRONG! WHERE IS THE REST OF THE DATA BYTES ARRAY
+            data=self.payload(self.PGN_TRANSMIT_VEHICLE_SPEED),
         )
 
         # returning true keeps the timer event active
@@ -215,61 +485,65 @@ class Kubota_D902k_CA(j1939.ControllerApplication):
 
     def set_throttle_percent(self, throttle_percent: int):
         self.throttle_pos = throttle_percent
+        # The throttle reaches the engine as the accelerator pedal position of PGN 65363
+        self.accelerator_pedal_position = throttle_percent
+
+    def decode_65266_record(self, data):
+        record = self.records[65266]
+        # 2 bytes, position 1-2,  0 to 3212.75 L/h, 0.05 L/h per bit, 0 offset
+        fuel_rate_bits, throttle_bits = LFE_STRUCT.unpack_from(data)
+        record.fuel_rate_lph = self._fuel_rate_bits_to_litres(fuel_rate_bits)
+        record.throttle_position_percent = self._throttle_bits_to_percent(throttle_bits)
+        return record
 
     def decode_65266(self, data):
         """LFE - Fuel Rate, Throttle Position"""
+        return self.decode_65266_record(data).as_dict()
 
-        # 2 bytes, position 1-2,  0 to 3212.75 L/h, 0.05 L/h per bit, 0 offset
-        fuel_rate = self._fuel_rate_bits_to_litres(struct.unpack_from("<H", data, 0)[0])
-
-        throttle = self._throttle_bits_to_percent(data[6])
-        return {
-            "PGN": 65266,
-            "Fuel Rate (L/h)": fuel_rate,
-            "Throttle Position (%)": throttle,
-        }
+    def decode_65271_record(self, data):
+        record = self.records[65271]
+        # position 5-6, 2 bytes,  0 to 3212.75 V, 0.05 V/bit, 0 offset, rate 1000ms
+        record.battery_voltage_v = (
+            VEP1_STRUCT.unpack_from(data)[0] * self.BITS_PER_VOLT_BATTERY_POTENTIAL
+        )
+        return record
 
     def decode_65271(self, data):
         """VEP1 - Battery Potential"""
-        # position 5-6, 2 bytes,  0 to 3212.75 V, 0.05 V/bit, 0 offset, rate 1000ms
-        voltage = (
-            struct.unpack_from("<H", data, 4)[0] * self.BITS_PER_VOLT_BATTERY_POTENTIAL
-        )
-        return {
-            "PGN": 65271,
-            "Battery Voltage (V)": voltage,
-        }
+        return self.decode_65271_record(data).as_dict()
+
+    def decode_65269_record(self, data):
+        record = self.records[65269]
+        #  0 to 125 kPa, 0.5 kPa/bit, 0 offset
+        record.barometric_pressure_kpa = data[0] * self.BITS_PER_KPA_BAROMETRIC_PRESSURE
+        return record
 
     def decode_65269(self, data):
         """AMB - Barometric Pressure"""
-        #  0 to 125 kPa, 0.5 kPa/bit, 0 offset
-        pressure = data[0] * self.BITS_PER_KPA_BAROMETRIC_PRESSURE
-        return {
-            "PGN": 65269,
-            "Barometric Pressure (kPa)": pressure,
-        }
+        return self.decode_65269_record(data).as_dict()
+
+    def decode_65257_record(self, data):
+        record = self.records[65257]
+        #  0 to 2105540607.5 L, 0.5 L/bit, 0 offset
+        record.total_fuel_used_l = (
+            LFC_STRUCT.unpack_from(data)[0] * self.BITS_PER_LITRE_TOTAL_FUEL_USED
+        )
+        return record
 
     def decode_65257(self, data):
         """LFC - Total Fuel Used"""
-        #  0 to 2105540607.5 L, 0.5 L/bit, 0 offset
+        return self.decode_65257_record(data).as_dict()
 
-        fuel_total = (
-            struct.unpack_from("<I", data, 4)[0] * self.BITS_PER_LITRE_TOTAL_FUEL_USED
-        )
-        return {
-            "PGN": 65257,
-            "Total Fuel Used (L)": fuel_total,
-        }
+    def decode_65252_record(self, data):
+        record = self.records[65252]
+        wait_to_start, shutdown = SHUTDN_STRUCT.unpack_from(data)
+        record.wait_to_start_lamp = wait_to_start & 0x03
+        record.shutdown_active = shutdown & 0x03
+        return record
 
     def decode_65252(self, data):
         """SHUTDN - Wait to Start Lamp, Shutdown Status"""
-        wait_to_start = data[3] & 0x03
-        shutdown = data[4] & 0x03
-        return {
-            "PGN": 65252,
-            "Wait to Start Lamp": wait_to_start,
-            "Shutdown Active": shutdown,
-        }
+        return self.decode_65252_record(data).as_dict()
 
     def encode_65363(self) -> bytes:
         """
@@ -401,12 +675,10 @@ class Kubota_D902k_CA(j1939.ControllerApplication):
         # )
         # TODO Assert that the PGN is correct
 
-        data = self.encode_65363()
-
         self.send_message(
             priority=6,
             parameter_group_number=self.PGN_TRANSMIT_ENGINE_CONTROL,
-            data=data,
+            data=self.payload(self.PGN_TRANSMIT_ENGINE_CONTROL),
         )
 
         # returning true keeps the timer event active
@@ -552,7 +824,12 @@ if __name__ == "__main__":
     # ecu.connect(bustype='vector', app_name='CANalyzer', channel=0, bitrate=500000)
     # ecu.connect(bustype='nican', channel='CAN0', bitrate=500000)
 
-    kubota = Kubota_D902k_CA("KubotaD902K")
+    def print_decoded(source, pgn, decoded):
+        print(f"\nDecoded PGN {pgn}:")
+        for key, value in decoded.items():
+            print(f"  {key}: {value}")
+
+    kubota = Kubota_D902k_CA("KubotaD902K", sink=print_decoded)
     if not TESTING:
         ecu.add_ca(controller_application=kubota)
 
@@ -4,13 +4,19 @@ Controller and interface to communicate with the "Isabellenhuette IVT-S HIGH PRE
 
 """
 
+import asyncio
 import can
 import logging
 import struct
+import threading
 import time
 
+from collections import deque
+from concurrent.futures import Future
 from enum import Enum
 
+import numpy as np
+
 
 class Mode(Enum):
     RESET = 0
@@ -19,6 +25,138 @@ class Mode(Enum):
     ERROR = 3
 
 
+SAMPLE_DTYPE = np.dtype(
+    [("timestamp", "f8"), ("value", "f8"), ("msg_count", "u1"), ("state_bits", "u1")]
+)
+
+
+class SampleRing:
+    """
+    Preallocated ring buffer of IVT samples (see ``SAMPLE_DTYPE``).
+
+    Every sample is written twice, at ``i`` and ``i + capacity``, so the last N samples are always
+    one contiguous slice and ``last`` can return a view instead of stitching two halves together.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.buffer = np.zeros(2 * capacity, dtype=SAMPLE_DTYPE)
+        self.head = 0  # next write position, 0..capacity-1
+        self.count = 0  # samples written in total
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def append(self, timestamp, value, msg_count, state_bits):
+        sample = (timestamp, value, msg_count, state_bits)
+        self.buffer[self.head] = sample
+        self.buffer[self.head + self.capacity] = sample
+        self.head = (self.head + 1) % self.capacity
+        self.count += 1
+
+    def last(self, n=None):
+        """Zero-copy view of the last ``n`` samples (default: all buffered), oldest first.
+
+        The view is overwritten as new samples come in; copy it to keep it.
+        """
+        n = len(self) if n is None else min(n, len(self))
+        end = self.head + self.capacity
+        return self.buffer[end - n : end]
+
+
+class SequenceTracker:
+    """
+    Checks the 4-bit msg_count of one result channel for lost and repeated frames.
+
+    The count goes up by one per frame and wraps from 15 to 0. A jump of k > 1 means k - 1 frames
+    were dropped, no change means a duplicate. Losing 16 frames in a row can't be told apart from
+    losing none.
+    """
+
+    __slots__ = ("last", "frames", "dropped", "duplicates", "wraps")
+
+    def __init__(self):
+        self.last = None
+        self.frames = 0
+        self.dropped = 0
+        self.duplicates = 0
+        self.wraps = 0
+
+    def update(self, msg_count):
+        self.frames += 1
+        last = self.last
+        self.last = msg_count
+        if last is None:
+            return
+        step = (msg_count - last) & 0x0F
+        if step == 0:
+            self.duplicates += 1
+            return
+        self.dropped += step - 1
+        if msg_count < last:
+            self.wraps += 1
+
+    def counters(self):
+        return {
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "duplicates": self.duplicates,
+            "wraps": self.wraps,
+        }
+
+
+class ResponseCorrelator:
+    """
+    Outstanding commands, keyed by command byte. The sensor echoes the command byte in byte 0 of its
+    response with bit 7 set (0x34 -> 0xB4), so each response resolves the oldest outstanding command
+    with the same byte. Commands with different bytes can be in flight at the same time.
+
+    Works with any future that has ``done()`` and ``set_result()`` (asyncio or concurrent.futures).
+    Commands are added from the caller's thread and resolved from the notifier thread, so every
+    access to the outstanding commands holds a lock.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(futures) for futures in self._pending.values())
+
+    @staticmethod
+    def command_byte(data):
+        return data[0] & 0x7F
+
+    def add(self, command, future):
+        with self._lock:
+            self._pending.setdefault(command, deque()).append(future)
+
+    def discard(self, future):
+        """Forget a command that timed out or was cancelled."""
+        with self._lock:
+            for command, futures in self._pending.items():
+                if future in futures:
+                    futures.remove(future)
+                    if not futures:
+                        del self._pending[command]
+                    return
+
+    def resolve(self, data):
+        """Resolve the command ``data`` answers. Returns False for unsolicited responses."""
+        command = self.command_byte(data)
+        with self._lock:
+            futures = self._pending.get(command)
+            while futures:
+                future = futures.popleft()
+                if not futures:
+                    del self._pending[command]
+                if not future.done():
+                    future.set_result(bytes(data))
+                    return True
+        return False
+
+
 class IVTSensor:
     """
     Controller-style class for the Isabellenhuette IVT-S-1K-U3-I-CAN2 sensor.
@@ -38,29 +176,74 @@ class IVTSensor:
         0x07: ("energy_count", "Wh"),
     }
     MAX_ID = max(MESSAGE_IDS.keys())
+    RESULT_IDS = range(BASE_ID, BASE_ID + MAX_ID + 1)  # 0x521..0x528
+
+    # Result frame: mux ID, state bits (high nibble) / msg_count (low nibble), signed value
+    RESULT_FORMAT = struct.Struct(">BBi")
+    # Per mux ID (= slot in the latest-value arrays): label and divisor to engineering units
+    LABELS = tuple(label for _, (label, _) in sorted(MESSAGE_IDS.items()))
+    DIVISORS = tuple(
+        10.0 if unit == "0.1C" else 1 for _, (_, unit) in sorted(MESSAGE_IDS.items())
+    )
 
     CMD_ID = 0x411
     RESP_ID = 0x511
 
+    # Command payloads (big endian, padded to 8 bytes by send_command)
+    START_COMMAND = struct.pack(">BBBBH", 0x34, 0x01, 0x01, 0x00, 0x0000)
+    STOP_COMMAND = struct.pack(">BBBBH", 0x34, 0x00, 0x00, 0x00, 0x0000)
+    RESET_ERRORS_COMMAND = struct.pack(">BBBBI", 0x30, 0x03, 0x00, 0x00, 0x00000000)
+
+    @staticmethod
+    def trigger_command(channels=0xFF):
+        return struct.pack(">BH", 0x31, channels)
+
     def __init__(
-        self, name="IVT", channel="can0", bitrate=500000, logger=None, bus=None
+        self,
+        name="IVT",
+        channel="can0",
+        bitrate=500000,
+        logger=None,
+        bus=None,
+        connect=True,
     ):
+        """
+        :param bus: python-can bus to use instead of opening ``channel``
+        :param connect: set to False to only use the decoders (e.g. for recorded logs), no bus is
+            opened and the sensor cannot be started
+        """
         self.name = name
         self.channel = channel
         self.bitrate = bitrate
         self.logger = logger or logging.getLogger(__name__)
         self.logger.setLevel(logging.DEBUG)
         self.running = False
-        self.results = {}
+        # Latest raw value and status byte per mux ID, None until the first frame
+        self.raw_values = [None] * len(self.LABELS)
+        self.status = [0] * len(self.LABELS)
         self.mode = Mode.RESET
+        self.pending = ResponseCorrelator()
+        self.streams = None
+        self.sequences = [SequenceTracker() for _ in self.LABELS]
         self.bus = (
             bus
-            if bus is not None
+            if bus is not None or not connect
             else can.interface.Bus(
-                channel=self.channel, bustype="socketcan", bitrate=self.bitrate
+                channel=self.channel,
+                bustype="socketcan",
+                bitrate=self.bitrate,
+                can_filters=self.can_filters(),
             )
         )
 
+    @classmethod
+    def can_filters(cls):
+        """python-can filters matching the result messages and command responses only."""
+        return [
+            {"can_id": can_id, "can_mask": 0x7FF, "extended": False}
+            for can_id in (*cls.RESULT_IDS, cls.RESP_ID)
+        ]
+
     def start(self):
         self.running = True
         # TODO: Check if this works:
@@ -77,12 +260,47 @@ class IVTSensor:
         self.mode = Mode.STOP
         self._stop_sensor()
 
+    def enable_streaming(self, capacity=4096):
+        """Keep every result sample in a ``SampleRing`` per channel, not only the latest value.
+
+        In streaming mode result frames go through ``stream_frame`` rather than ``on_message``, so
+        no dict is built per frame.
+        """
+        self.streams = {
+            label: SampleRing(capacity) for label, _ in self.MESSAGE_IDS.values()
+        }
+
+    def stream_frame(self, timestamp, data):
+        """Append one result frame to its channel's ring buffer."""
+        mux_id = self._store(data)
+        if mux_id is None:
+            return
+        status = self.status[mux_id]
+        self.streams[self.LABELS[mux_id]].append(
+            timestamp,
+            self.raw_values[mux_id] / self.DIVISORS[mux_id],
+            status & 0x0F,
+            status >> 4,
+        )
+
+    def window(self, label, n=None):
+        """Zero-copy view of the last ``n`` samples of a channel, e.g. ``window("current", 1000)``."""
+        return self.streams[label].last(n)
+
     def _on_can_message(self, msg):
-        if msg.arbitration_id >= self.BASE_ID and msg.arbitration_id <= self.MAX_ID:
+        if msg.arbitration_id in self.RESULT_IDS:
+            if self.streams is not None:
+                self.stream_frame(msg.timestamp, msg.data)
+                return
             mux_id = msg.data[0]
             self.on_message(mux_id, msg.data)
         elif msg.arbitration_id == self.RESP_ID:
             self.logger.debug(f"Received response: {msg}")
+            self._on_response(msg.data)
+
+    def _on_response(self, data):
+        if self.pending and not self.pending.resolve(data):
+            self.logger.debug(f"Unsolicited response: {bytes(data).hex()}")
 
     def on_message(self, pgn, data):
         self.logger.debug(f"Recieved the following message for ID {pgn}:\n{data}")
@@ -96,28 +314,59 @@ class IVTSensor:
         else:
             return {"error": f"No decoder for PGN/Mux {pgn}"}
 
+    def _store(self, data):
+        """Unpack a result frame into the latest-value arrays. Returns its mux ID, or None."""
+        if len(data) != self.RESULT_FORMAT.size:
+            return None
+        mux_id, status, raw_val = self.RESULT_FORMAT.unpack(data)
+        try:
+            self.raw_values[mux_id] = raw_val
+        except IndexError:
+            return None
+        self.status[mux_id] = status
+        self.sequences[mux_id].update(status & 0x0F)
+        return mux_id
+
     def _decode_mux(self, data: bytes):
-        if len(data) != 6:
+        mux_id = self._store(data)
+        if mux_id is None:
             self.logger.warning("Unexpected data length")
             return {}
+        return self.result(mux_id)
 
-        mux_id = data[0]
-        msg_count = data[1] & 0x0F
-        state_bits = (data[1] >> 4) & 0x0F
-        raw_val = int.from_bytes(data[2:6], byteorder="big", signed=True)
+    def value(self, mux_id):
+        """Latest value of a channel in engineering units (None before its first frame)."""
+        raw_val = self.raw_values[mux_id]
+        divisor = self.DIVISORS[mux_id]
+        return raw_val if divisor == 1 or raw_val is None else raw_val / divisor
 
-        label, unit = self.MESSAGE_IDS[mux_id]
-        value = raw_val / 10.0 if unit == "0.1C" else raw_val
-        self.results[label] = value
+    def result(self, mux_id):
+        """The latest frame of a channel as a dict, as returned by ``_decode_mux``."""
+        status = self.status[mux_id]
+        return {
+            "label": self.LABELS[mux_id],
+            "value": self.value(mux_id),
+            "unit": self.MESSAGE_IDS[mux_id][1],
+            "state_bits": status >> 4,
+            "msg_count": status & 0x0F,
+        }
 
+    @property
+    def results(self):
+        """{label: latest value} of the channels received so far, built on every access."""
         return {
-            "label": label,
-            "value": value,
-            "unit": unit,
-            "state_bits": state_bits,
-            "msg_count": msg_count,
+            label: self.value(mux_id)
+            for mux_id, label in enumerate(self.LABELS)
+            if self.raw_values[mux_id] is not None
         }
 
+    @results.setter
+    def results(self, values):
+        self.raw_values = [
+            None if label not in values else values[label] * divisor
+            for label, divisor in zip(self.LABELS, self.DIVISORS)
+        ]
+
     def send_command(self, data: bytes):
         msg = can.Message(
             arbitration_id=self.CMD_ID,
@@ -127,38 +376,155 @@ class IVTSensor:
         self.logger.debug(f"Sending command: {msg}")
         self.bus.send(msg)
 
-    def read_response(self, timeout=1.0):
+    def read_response(self, timeout=1.0, command=None):
+        """Wait for a response frame, for ``command`` (a command byte) if given.
+
+        Frames read while waiting are not dropped: results are decoded and other responses resolve
+        the commands they belong to. Only usable before ``start()``: after it the notifier reads the
+        bus, use ``command`` (or ``submit_command``/``wait_responses``) instead.
+        """
+        if self.running:
+            raise RuntimeError("The notifier reads the bus while the sensor runs, use command()")
         start = time.time()
         while time.time() - start < timeout:
             msg = self.bus.recv(timeout)
-            if msg and msg.arbitration_id == self.RESP_ID:
+            if not msg:
+                continue
+            if msg.arbitration_id == self.RESP_ID:
                 self.logger.debug(f"Received response: {msg}")
-                return msg
+                if command is None or ResponseCorrelator.command_byte(msg.data) == command:
+                    return msg
+                self._on_response(msg.data)
+            elif msg.arbitration_id in self.RESULT_IDS:
+                self.on_message(msg.data[0], msg.data)
         self.logger.warning("No response received.")
         return None
 
-    def _start_sensor(self):
-        data = struct.pack(">BBBBH", 0x34, 0x01, 0x01, 0x00, 0x0000)
+    def submit_command(self, data: bytes) -> Future:
+        """Send a command without waiting; the future resolves with its response payload.
+
+        Responses are picked up by the notifier once the sensor is started, or by
+        ``wait_responses``.
+        """
+        future = Future()
+        self.pending.add(data[0], future)
         self.send_command(data)
-        self.read_response()
+        return future
+
+    def wait_responses(self, futures, timeout=1.0):
+        """Wait for submitted commands, returning their response payloads (None if unanswered)."""
+        deadline = time.monotonic() + timeout
+        if not self.running:
+            # No notifier owns the bus yet, so read it here
+            while not all(future.done() for future in futures):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                msg = self.bus.recv(remaining)
+                if msg:
+                    self._on_can_message(msg)
+
+        responses = []
+        for future in futures:
+            try:
+                responses.append(future.result(max(0.0, deadline - time.monotonic())))
+            except TimeoutError:
+                self.pending.discard(future)
+                future.cancel()
+                responses.append(None)
+        if None in responses:
+            self.logger.warning("No response received.")
+        return responses
+
+    def configure(self, commands, timeout=1.0):
+        """Send several commands back to back and wait for all their responses at once."""
+        return self.wait_responses([self.submit_command(data) for data in commands], timeout)
+
+    def command(self, data: bytes, timeout=1.0):
+        """Send a command and wait for its response payload (None if unanswered).
+
+        Works before and after ``start()``: the response is matched by the correlator, whether the
+        notifier or ``wait_responses`` reads it off the bus.
+        """
+        return self.wait_responses([self.submit_command(data)], timeout)[0]
+
+    def _start_sensor(self):
+        return self.command(self.START_COMMAND)
 
     def _stop_sensor(self):
-        data = struct.pack(">BBBBH", 0x34, 0x00, 0x00, 0x00, 0x0000)
-        self.send_command(data)
-        self.read_response()
+        return self.command(self.STOP_COMMAND)
 
     def reset_errors(self):
-        data = struct.pack(">BBBBI", 0x30, 0x03, 0x00, 0x00, 0x00000000)
-        self.send_command(data)
-        self.read_response()
+        return self.command(self.RESET_ERRORS_COMMAND)
 
     def trigger_measurement(self, channels=0xFF):
-        data = struct.pack(">BH", 0x31, channels)
-        self.send_command(data)
-        self.read_response()
+        return self.command(self.trigger_command(channels))
 
     def get_latest_results(self):
-        return self.results.copy()
+        return self.results
+
+    def sequence_counters(self):
+        """{label: {"frames", "dropped", "duplicates", "wraps"}} per result channel."""
+        return {
+            label: tracker.counters() for label, tracker in zip(self.LABELS, self.sequences)
+        }
+
+
+class AsyncIVTSensor:
+    """
+    asyncio front end for an IVTSensor: commands are awaitables that resolve when the sensor's
+    response frame arrives, instead of blocking in read_response.
+
+    Frames are not read here. Whoever owns the bus (see utils.async_can.AsyncCanStack) routes the
+    result IDs to ``sensor._decode_mux`` and ``RESP_ID`` frames to ``on_response``. Responses are
+    matched to commands by command byte, so commands can be pipelined with ``configure`` or
+    ``asyncio.gather``.
+    """
+
+    def __init__(self, sensor: IVTSensor, timeout=1.0):
+        self.sensor = sensor
+        self.timeout = timeout
+        self.pending = ResponseCorrelator()
+
+    @property
+    def logger(self):
+        return self.sensor.logger
+
+    def on_response(self, data):
+        """Resolve the outstanding command a response payload answers."""
+        if not self.pending.resolve(data):
+            self.logger.debug(f"Unsolicited response: {bytes(data).hex()}")
+
+    async def command(self, data: bytes, timeout=None):
+        """Send a command and wait for its response payload (None on timeout)."""
+        future = asyncio.get_running_loop().create_future()
+        self.pending.add(data[0], future)
+        self.sensor.send_command(data)
+        try:
+            return await asyncio.wait_for(
+                future, self.timeout if timeout is None else timeout
+            )
+        except asyncio.TimeoutError:
+            self.logger.warning("No response received.")
+            return None
+        finally:
+            self.pending.discard(future)
+
+    async def configure(self, commands, timeout=None):
+        """Send several commands back to back and wait for all their responses at once."""
+        return await asyncio.gather(*(self.command(data, timeout) for data in commands))
+
+    async def start_sensor(self):
+        return await self.command(self.sensor.START_COMMAND)
+
+    async def stop_sensor(self):
+        return await self.command(self.sensor.STOP_COMMAND)
+
+    async def reset_errors(self):
+        return await self.command(self.sensor.RESET_ERRORS_COMMAND)
+
+    async def trigger_measurement(self, channels=0xFF):
+        return await self.command(self.sensor.trigger_command(channels))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+"""
+Several Kubota D902K gensets on one bus, handled by one object.
+
+A ``Kubota_D902k_CA`` per engine means a decoders dict of bound methods, a set of reusable records,
+timers and a print per frame for every engine. ``KubotaFleet`` keeps a single CA as the decoder for
+all of them and stores the decoded state struct-of-arrays: one NumPy column per record field (the
+``EEC1Record``... fields of ``ca_kubota_engine``), one row per engine. Adding an engine adds a row,
+not another set of objects.
+
+Frames are routed on the raw 29-bit arbitration ID, which carries the engine's source address: the
+first frame of every ID resolves PGN and row, later frames cost one dict lookup. The engines'
+cyclic transmissions share one scheduler (e.g. ``utils.cyclic_scheduler.CyclicScheduler``): one
+callback per period for the whole fleet.
+
+Usage:
+    fleet = KubotaFleet(scheduler=scheduler)
+    fleet.add_engine(0x00)
+    fleet.add_engine(0x01)
+    notifier = can.Notifier(bus, [fleet.on_message_received])
+    fleet.columns["engine_speed_rpm"]  # array, one value per engine
+    fleet.engine(0x01)                 # {"engine_speed_rpm": ..., ...}
+"""
+
+import dataclasses
+import logging
+import struct
+from functools import partial
+
+import numpy as np
+
+from controller_applications.ca_kubota_engine import Kubota_D902k_CA
+from utils.j1939_can_utils import can_id_to_pgn
+
+logger = logging.getLogger(__name__)
+
+
+class KubotaFleet:
+    def __init__(self, decoder=None, scheduler=None, capacity=4, auto_add=True):
+        """
+        :param decoder: Kubota_D902k_CA whose record decoders are shared by all engines
+        :param scheduler: scheduler with ``add(period_s, callback)``/``remove(callback)`` for the
+            cyclic transmissions of the engines' controllers, required to ``start()`` with
+            controllers
+        :param capacity: rows to allocate up front, the columns grow by doubling
+        :param auto_add: give engines a row when their first frame arrives
+        """
+        self.decoder = decoder or Kubota_D902k_CA("KubotaFleet")
+        self.scheduler = scheduler
+        self.auto_add = auto_add
+        self.source_addresses = []  # row -> source address
+        self.rows = {}  # source address -> row
+        self.controllers = {}  # source address -> CA used to transmit to that engine
+        self.decode_errors = 0
+        self._routes = {}  # raw arbitration ID -> (row, record decoder, fields) or None
+        self._ticks = []
+
+        # One column per record field, named after the field
+        self.fields = {}  # PGN -> field names
+        self.columns = {}
+        for pgn, record in self.decoder.records.items():
+            self.fields[pgn] = tuple(field.name for field in dataclasses.fields(record))
+            for field in dataclasses.fields(record):
+                dtype = np.float64 if field.type is float else np.int64
+                self.columns[field.name] = np.zeros(capacity, dtype=dtype)
+        self.last_seen = np.full(capacity, np.nan)
+
+    def __len__(self):
+        return len(self.source_addresses)
+
+    @property
+    def capacity(self):
+        return len(self.last_seen)
+
+    def add_engine(self, source_address, controller=None):
+        """Give an engine a row (if it has none yet) and return it."""
+        if controller is not None:
+            self.controllers[source_address] = controller
+        row = self.rows.get(source_address)
+        if row is not None:
+            return row
+        row = len(self.source_addresses)
+        if row == self.capacity:
+            self._grow(2 * self.capacity)
+        self.source_addresses.append(source_address)
+        self.rows[source_address] = row
+        # Routes cached as misses may belong to this engine now
+        self._routes.clear()
+        return row
+
+    def _grow(self, capacity):
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: len(column)] = column
+            self.columns[name] = grown
+        last_seen = np.full(capacity, np.nan)
+        last_seen[: len(self.last_seen)] = self.last_seen
+        self.last_seen = last_seen
+        # Routes hold references to the old columns
+        self._routes.clear()
+
+    def _resolve(self, arbitration_id):
+        try:
+            pgn = can_id_to_pgn(arbitration_id)
+        except ValueError:
+            return None  # extended data page / data page 1: not J1939 page 0
+        source_address = arbitration_id & 0xFF
+        record_decoder = self.decoder.record_decoders.get(pgn)
+        if record_decoder is None:
+            return None
+        row = self.rows.get(source_address)
+        if row is None:
+            if not self.auto_add:
+                return None
+            row = self.add_engine(source_address)
+        fields = tuple((name, self.columns[name]) for name in self.fields[pgn])
+        return row, record_decoder, fields
+
+    def handle(self, arbitration_id, data, timestamp=None):
+        """Decode one frame into its engine's row. Returns the row, or None if not decoded."""
+        try:
+            route = self._routes[arbitration_id]
+        except KeyError:
+            route = self._routes[arbitration_id] = self._resolve(arbitration_id)
+        if route is None:
+            return None
+        row, record_decoder, fields = route
+        try:
+            record = record_decoder(data)
+        except (ValueError, IndexError, struct.error):
+            self.decode_errors += 1
+            return None
+        for name, column in fields:
+            column[row] = getattr(record, name)
+        if timestamp is not None:
+            self.last_seen[row] = timestamp
+        return row
+
+    def on_message_received(self, msg):
+        """python-can listener entry point."""
+        if msg.is_extended_id:
+            self.handle(msg.arbitration_id, msg.data, msg.timestamp)
+
+    def engine(self, source_address):
+        """One engine's decoded state as a dict of field -> value."""
+        row = self.rows[source_address]
+        return {name: column[row].item() for name, column in self.columns.items()}
+
+    def start(self):
+        """Register the controllers' cyclic messages: one scheduler callback per period."""
+        if self.controllers and self.scheduler is None:
+            raise ValueError("KubotaFleet needs a scheduler to send the controllers' messages")
+        by_period = {}
+        for controller in self.controllers.values():
+            for callback, period in controller.cyclic_message_functions.values():
+                by_period.setdefault(period, []).append(callback)
+        for period, callbacks in by_period.items():
+            tick = partial(self._tick, callbacks)
+            self._ticks.append(tick)
+            # The periods are in ms, as in Kubota_D902k_CA
+            self.scheduler.add(period / 1000, tick)
+
+    def stop(self):
+        for tick in self._ticks:
+            self.scheduler.remove(tick)
+        self._ticks = []
+
+    @staticmethod
+    def _tick(callbacks, cookie):
+        # Same contract as a single CA's timers: an engine whose callback returns False stops
+        # sending, one whose callback raises is logged and keeps its slot. Neither holds up the
+        # other engines.
+        for callback in list(callbacks):
+            try:
+                keep = callback(cookie)
+            except Exception:
+                logger.exception("Fleet callback %r failed", callback)
+                keep = True
+            if not keep:
+                callbacks.remove(callback)
+        return bool(callbacks)
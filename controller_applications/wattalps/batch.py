@@ -0,0 +1,71 @@
+"""
+Columnar decoding of recorded wattalps traffic with NumPy.
+
+Decoding a log one frame at a time through ``decode_info``/``decode_sp_detail_2s`` builds a
+dataclass per frame. Here the payloads of a whole recording are viewed as one big-endian 64-bit word
+per frame and every signal is pulled out of all frames of a message with a single shift and mask
+over the column. The shifts, masks, scale, offset and signedness come from ``SIGNAL_LAYOUTS`` in the
+generated module, i.e. from the same DBC lines as the scalar decoders.
+
+Usage:
+    columns = decode_batch(ids, payloads)
+    info = columns[MESSAGE_ID_BMS_VMU_INFO]
+    info["current"]  # float64 array, one value per BMS_VMU_INFO frame
+    info["index"]    # rows of ``payloads`` those frames came from
+"""
+
+import numpy as np
+
+from controller_applications.wattalps.messages.generated import SIGNAL_LAYOUTS
+
+CAN_EFF_MASK = 0x1FFFFFFF
+
+
+def payload_words(payloads) -> np.ndarray:
+    """View an (N, 8) uint8 payload array as N native-order uint64 words (big-endian payload)."""
+    payloads = np.ascontiguousarray(payloads, dtype=np.uint8)
+    if payloads.ndim != 2 or payloads.shape[1] != 8:
+        raise ValueError(f"Expected an (N, 8) payload array, got {payloads.shape}")
+    # Shorter frames are zero-padded at the end, which SIGNAL_LAYOUTS already accounts for
+    return payloads.view(">u8")[:, 0].astype(np.uint64)
+
+
+def decode_signals(words: np.ndarray, layout) -> dict[str, np.ndarray]:
+    """Decode every signal of one message from its column of payload words."""
+    columns = {}
+    for name, shift, mask, sign_bit, factor, offset, is_flag in layout:
+        raw = (words >> np.uint64(shift)) & np.uint64(mask)
+        if is_flag:
+            columns[name] = raw.astype(bool)
+            continue
+        if sign_bit:
+            raw = (raw.astype(np.int64) ^ sign_bit) - sign_bit
+        if factor == 1 and offset == 0:
+            columns[name] = raw.astype(np.int64)
+        else:
+            columns[name] = raw * factor + offset
+    return columns
+
+
+def decode_batch(ids, payloads, message_ids=None) -> dict[int, dict[str, np.ndarray]]:
+    """Decode a recording into one set of signal columns per message.
+
+    :param ids: (N,) arbitration IDs, with or without the extended frame flag
+    :param payloads: (N, 8) uint8 payloads, zero-padded for frames shorter than 8 bytes
+    :param message_ids: ``MESSAGE_ID_*`` values to decode (default: every message in the DBC)
+    :return: {message_id: {"index": rows, signal_name: values, ...}} for messages that were present
+    """
+    ids = np.asarray(ids).astype(np.uint32) & np.uint32(CAN_EFF_MASK)
+    words = payload_words(payloads)
+    if len(ids) != len(words):
+        raise ValueError(f"{len(ids)} IDs for {len(words)} payloads")
+
+    result = {}
+    for message_id in SIGNAL_LAYOUTS if message_ids is None else message_ids:
+        index = np.flatnonzero(ids == (message_id & CAN_EFF_MASK))
+        if not len(index):
+            continue
+        columns = decode_signals(words[index], SIGNAL_LAYOUTS[message_id])
+        columns["index"] = index
+        result[message_id] = columns
+    return result
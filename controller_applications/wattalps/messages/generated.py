@@ -0,0 +1,1337 @@
+"""
+Generated by utils/dbc_codegen.py from wattalps.dbc. Do not edit by hand, re-run the generator.
+
+Each decode_<message> turns the payload into one integer and pulls every signal out with a
+precomputed shift and mask. Signal names are the snake_case DBC names, or the names the
+hand-written msg_* modules use where those differ (--names).
+
+Start bits of BMS_VMU_FAILURE count over the whole frame (--frame-numbered).
+"""
+
+
+# VMU_BMS_STATUS
+MESSAGE_ID_VMU_BMS_STATUS = 2180972544
+
+
+def decode_vmu_bms_status(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"VMU_BMS_STATUS is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ BmsDestAddr : 8|8@1+ (1,0) [256|0] "" Vector__XXX
+        "bms_dest_addr": (raw >> 48) & 0xff,
+        # SG_ InsuResMeasEn : 4|1@1- (1,0) [0|1] "" Vector__XXX
+        "insu_res_meas_en": bool((raw >> 60) & 0x01),
+        # SG_ AskMode : 0|2@1+ (1,0) [0|2] "" Vector__XXX
+        "ask_mode": (raw >> 56) & 0x3,
+    }
+
+
+def encode_vmu_bms_status(signals: dict) -> bytes:
+    raw = 0
+    # SG_ BmsDestAddr : 8|8@1+ (1,0) [256|0] "" Vector__XXX
+    raw |= (int(signals.get("bms_dest_addr", 0)) & 0xff) << 48
+    # SG_ InsuResMeasEn : 4|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("insu_res_meas_en", 0)) & 0x1) << 60
+    # SG_ AskMode : 0|2@1+ (1,0) [0|2] "" Vector__XXX
+    raw |= (int(signals.get("ask_mode", 0)) & 0x3) << 56
+    return raw.to_bytes(8, "big")
+
+
+# VMU_BMS_FORCE_HEATING
+MESSAGE_ID_VMU_BMS_FORCE_HEATING = 2180976640
+
+
+def decode_vmu_bms_force_heating(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"VMU_BMS_FORCE_HEATING is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ BmsDestAddr : 8|8@1+ (1,0) [256|0] "" Vector__XXX
+        "bms_dest_addr": (raw >> 48) & 0xff,
+        # SG_ ForceOff : 1|1@1- (1,0) [0|1] "" Vector__XXX
+        "force_off": bool((raw >> 57) & 0x01),
+        # SG_ ForceOn : 0|1@1- (1,0) [0|1] "" Vector__XXX
+        "force_on": bool((raw >> 56) & 0x01),
+    }
+
+
+def encode_vmu_bms_force_heating(signals: dict) -> bytes:
+    raw = 0
+    # SG_ BmsDestAddr : 8|8@1+ (1,0) [256|0] "" Vector__XXX
+    raw |= (int(signals.get("bms_dest_addr", 0)) & 0xff) << 48
+    # SG_ ForceOff : 1|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("force_off", 0)) & 0x1) << 57
+    # SG_ ForceOn : 0|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("force_on", 0)) & 0x1) << 56
+    return raw.to_bytes(8, "big")
+
+
+# VMU_BMS_FORCE_COOLING
+MESSAGE_ID_VMU_BMS_FORCE_COOLING = 2180976896
+
+
+def decode_vmu_bms_force_cooling(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"VMU_BMS_FORCE_COOLING is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ BmsDestAddr : 8|8@1+ (1,0) [256|0] "" Vector__XXX
+        "bms_dest_addr": (raw >> 48) & 0xff,
+        # SG_ ForceOff : 1|1@1- (1,0) [0|1] "" Vector__XXX
+        "force_off": bool((raw >> 57) & 0x01),
+        # SG_ ForceOn : 0|1@1- (1,0) [0|1] "" Vector__XXX
+        "force_on": bool((raw >> 56) & 0x01),
+    }
+
+
+def encode_vmu_bms_force_cooling(signals: dict) -> bytes:
+    raw = 0
+    # SG_ BmsDestAddr : 8|8@1+ (1,0) [256|0] "" Vector__XXX
+    raw |= (int(signals.get("bms_dest_addr", 0)) & 0xff) << 48
+    # SG_ ForceOff : 1|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("force_off", 0)) & 0x1) << 57
+    # SG_ ForceOn : 0|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("force_on", 0)) & 0x1) << 56
+    return raw.to_bytes(8, "big")
+
+
+# VMU_BMS_FORCE_PUMPING
+MESSAGE_ID_VMU_BMS_FORCE_PUMPING = 2180977152
+
+
+def decode_vmu_bms_force_pumping(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"VMU_BMS_FORCE_PUMPING is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ BmsDestAddr : 8|8@1+ (1,0) [256|0] "" Vector__XXX
+        "bms_dest_addr": (raw >> 48) & 0xff,
+        # SG_ ForceOn : 0|1@1- (1,0) [0|1] "" Vector__XXX
+        "force_on": bool((raw >> 56) & 0x01),
+    }
+
+
+def encode_vmu_bms_force_pumping(signals: dict) -> bytes:
+    raw = 0
+    # SG_ BmsDestAddr : 8|8@1+ (1,0) [256|0] "" Vector__XXX
+    raw |= (int(signals.get("bms_dest_addr", 0)) & 0xff) << 48
+    # SG_ ForceOn : 0|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("force_on", 0)) & 0x1) << 56
+    return raw.to_bytes(8, "big")
+
+
+# VMU_BMS_GEN_DATA_RECORD_1
+MESSAGE_ID_VMU_BMS_GEN_DATA_RECORD_1 = 2180980736
+
+
+def decode_vmu_bms_gen_data_record_1(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"VMU_BMS_GEN_DATA_RECORD_1 is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ GenRecordValue2 : 32|32@1- (1,0) [2.14748e+009|-2.14748e+009] "" Vector__XXX
+        "gen_record_value2": ((raw & 0xffffffff) ^ 0x80000000) - 0x80000000,
+        # SG_ GenRecordValue1 : 0|32@1- (1,0) [2.14748e+009|-2.14748e+009] "" Vector__XXX
+        "gen_record_value1": (((raw >> 32) & 0xffffffff) ^ 0x80000000) - 0x80000000,
+    }
+
+
+def encode_vmu_bms_gen_data_record_1(signals: dict) -> bytes:
+    raw = 0
+    # SG_ GenRecordValue2 : 32|32@1- (1,0) [2.14748e+009|-2.14748e+009] "" Vector__XXX
+    raw |= int(signals.get("gen_record_value2", 0)) & 0xffffffff
+    # SG_ GenRecordValue1 : 0|32@1- (1,0) [2.14748e+009|-2.14748e+009] "" Vector__XXX
+    raw |= (int(signals.get("gen_record_value1", 0)) & 0xffffffff) << 32
+    return raw.to_bytes(8, "big")
+
+
+# VMU_BMS_GEN_DATA_RECORD_2
+MESSAGE_ID_VMU_BMS_GEN_DATA_RECORD_2 = 2180980992
+
+
+def decode_vmu_bms_gen_data_record_2(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"VMU_BMS_GEN_DATA_RECORD_2 is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ GenRecordValue4 : 32|32@1- (1,0) [2.14748e+009|-2.14748e+009] "" Vector__XXX
+        "gen_record_value4": ((raw & 0xffffffff) ^ 0x80000000) - 0x80000000,
+        # SG_ GenRecordValue3 : 0|32@1- (1,0) [2.14748e+009|-2.14748e+009] "" Vector__XXX
+        "gen_record_value3": (((raw >> 32) & 0xffffffff) ^ 0x80000000) - 0x80000000,
+    }
+
+
+def encode_vmu_bms_gen_data_record_2(signals: dict) -> bytes:
+    raw = 0
+    # SG_ GenRecordValue4 : 32|32@1- (1,0) [2.14748e+009|-2.14748e+009] "" Vector__XXX
+    raw |= int(signals.get("gen_record_value4", 0)) & 0xffffffff
+    # SG_ GenRecordValue3 : 0|32@1- (1,0) [2.14748e+009|-2.14748e+009] "" Vector__XXX
+    raw |= (int(signals.get("gen_record_value3", 0)) & 0xffffffff) << 32
+    return raw.to_bytes(8, "big")
+
+
+# VMU_BMS_GEN_DATA_RECORD_3
+MESSAGE_ID_VMU_BMS_GEN_DATA_RECORD_3 = 2180981248
+
+
+def decode_vmu_bms_gen_data_record_3(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"VMU_BMS_GEN_DATA_RECORD_3 is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ GenRecordValue6 : 32|32@1- (1,0) [2.14748e+009|-2.14748e+009] "" Vector__XXX
+        "gen_record_value6": ((raw & 0xffffffff) ^ 0x80000000) - 0x80000000,
+        # SG_ GenRecordValue5 : 0|32@1- (1,0) [2.14748e+009|-2.14748e+009] "" Vector__XXX
+        "gen_record_value5": (((raw >> 32) & 0xffffffff) ^ 0x80000000) - 0x80000000,
+    }
+
+
+def encode_vmu_bms_gen_data_record_3(signals: dict) -> bytes:
+    raw = 0
+    # SG_ GenRecordValue6 : 32|32@1- (1,0) [2.14748e+009|-2.14748e+009] "" Vector__XXX
+    raw |= int(signals.get("gen_record_value6", 0)) & 0xffffffff
+    # SG_ GenRecordValue5 : 0|32@1- (1,0) [2.14748e+009|-2.14748e+009] "" Vector__XXX
+    raw |= (int(signals.get("gen_record_value5", 0)) & 0xffffffff) << 32
+    return raw.to_bytes(8, "big")
+
+
+# BMS_VMU_STATUS
+MESSAGE_ID_BMS_VMU_STATUS = 2566848798
+
+
+def decode_bms_vmu_status(data: bytes) -> dict:
+    if len(data) != 4:
+        raise ValueError(f"BMS_VMU_STATUS is 4 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ ChargePhase : 28|4@1+ (1,0) [0|7] "" Vector__XXX
+        "charge_phase": (raw >> 4) & 0xf,
+        # SG_ IsThermalForcing : 25|1@1- (1,0) [0|1] "" Vector__XXX
+        "is_thermal_forcing": bool((raw >> 1) & 0x01),
+        # SG_ IsCooling : 24|1@1- (1,0) [0|1] "" Vector__XXX
+        "is_cooling": bool(raw & 0x01),
+        # SG_ IsPumping : 23|1@1- (1,0) [0|1] "" Vector__XXX
+        "is_pumping": bool((raw >> 15) & 0x01),
+        # SG_ IsHeating : 22|1@1- (1,0) [0|1] "" Vector__XXX
+        "is_heating": bool((raw >> 14) & 0x01),
+        # SG_ IsDcContactorClosed : 21|1@1- (1,0) [0|1] "" Vector__XXX
+        "is_dc_contactor_closed": bool((raw >> 13) & 0x01),
+        # SG_ IsEndOfCharge : 20|1@1- (1,0) [0|1] "" Vector__XXX
+        "is_end_of_charge": bool((raw >> 12) & 0x01),
+        # SG_ IsBalancing : 19|1@1- (1,0) [0|1] "" Vector__XXX
+        "is_balancing": bool((raw >> 11) & 0x01),
+        # SG_ IsAlert : 18|1@1- (1,0) [0|1] "" Vector__XXX
+        "is_alert": bool((raw >> 10) & 0x01),
+        # SG_ IsWarning : 17|1@1- (1,0) [0|1] "" Vector__XXX
+        "is_warning": bool((raw >> 9) & 0x01),
+        # SG_ IsFailure : 16|1@1- (1,0) [0|1] "" Vector__XXX
+        "is_failure": bool((raw >> 8) & 0x01),
+        # SG_ Soc : 8|8@1+ (1,0) [0|100] "%" Vector__XXX
+        "soc": (raw >> 16) & 0xff,
+        # SG_ Mode : 0|3@1+ (1,0) [0|7] "" Vector__XXX
+        "mode": (raw >> 24) & 0x7,
+    }
+
+
+def encode_bms_vmu_status(signals: dict) -> bytes:
+    raw = 0
+    # SG_ ChargePhase : 28|4@1+ (1,0) [0|7] "" Vector__XXX
+    raw |= (int(signals.get("charge_phase", 0)) & 0xf) << 4
+    # SG_ IsThermalForcing : 25|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("is_thermal_forcing", 0)) & 0x1) << 1
+    # SG_ IsCooling : 24|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= int(signals.get("is_cooling", 0)) & 0x1
+    # SG_ IsPumping : 23|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("is_pumping", 0)) & 0x1) << 15
+    # SG_ IsHeating : 22|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("is_heating", 0)) & 0x1) << 14
+    # SG_ IsDcContactorClosed : 21|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("is_dc_contactor_closed", 0)) & 0x1) << 13
+    # SG_ IsEndOfCharge : 20|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("is_end_of_charge", 0)) & 0x1) << 12
+    # SG_ IsBalancing : 19|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("is_balancing", 0)) & 0x1) << 11
+    # SG_ IsAlert : 18|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("is_alert", 0)) & 0x1) << 10
+    # SG_ IsWarning : 17|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("is_warning", 0)) & 0x1) << 9
+    # SG_ IsFailure : 16|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("is_failure", 0)) & 0x1) << 8
+    # SG_ Soc : 8|8@1+ (1,0) [0|100] "%" Vector__XXX
+    raw |= (int(signals.get("soc", 0)) & 0xff) << 16
+    # SG_ Mode : 0|3@1+ (1,0) [0|7] "" Vector__XXX
+    raw |= (int(signals.get("mode", 0)) & 0x7) << 24
+    return raw.to_bytes(4, "big")
+
+
+# BMS_VMU_SP_CHARGE
+MESSAGE_ID_BMS_VMU_SP_CHARGE = 2566849054
+
+
+def decode_bms_vmu_sp_charge(data: bytes) -> dict:
+    if len(data) != 4:
+        raise ValueError(f"BMS_VMU_SP_CHARGE is 4 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ MaxChargeCurrent : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "max_charge_current": (raw & 0xffff) * 0.1,
+        # SG_ ChargeVoltage : 0|16@1+ (0.1,0) [0|6553.5] "V" Vector__XXX
+        "max_charge_voltage": ((raw >> 16) & 0xffff) * 0.1,
+    }
+
+
+def encode_bms_vmu_sp_charge(signals: dict) -> bytes:
+    raw = 0
+    # SG_ MaxChargeCurrent : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= round(signals.get("max_charge_current", 0) / 0.1) & 0xffff
+    # SG_ ChargeVoltage : 0|16@1+ (0.1,0) [0|6553.5] "V" Vector__XXX
+    raw |= (round(signals.get("max_charge_voltage", 0) / 0.1) & 0xffff) << 16
+    return raw.to_bytes(4, "big")
+
+
+# BMS_VMU_SP_DRIVE
+MESSAGE_ID_BMS_VMU_SP_DRIVE = 2566849310
+
+
+def decode_bms_vmu_sp_drive(data: bytes) -> dict:
+    if len(data) != 4:
+        raise ValueError(f"BMS_VMU_SP_DRIVE is 4 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ MaxRegenCurrent : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "max_regen_current": (raw & 0xffff) * 0.1,
+        # SG_ MaxDischargeCurrent : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "max_discharge_current": ((raw >> 16) & 0xffff) * 0.1,
+    }
+
+
+def encode_bms_vmu_sp_drive(signals: dict) -> bytes:
+    raw = 0
+    # SG_ MaxRegenCurrent : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= round(signals.get("max_regen_current", 0) / 0.1) & 0xffff
+    # SG_ MaxDischargeCurrent : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("max_discharge_current", 0) / 0.1) & 0xffff) << 16
+    return raw.to_bytes(4, "big")
+
+
+# BMS_VMU_SP_DETAIL_2S
+MESSAGE_ID_BMS_VMU_SP_DETAIL_2S = 2566849566
+
+
+def decode_bms_vmu_sp_detail_2s(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"BMS_VMU_SP_DETAIL_2S is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ DischargeAlertThreshold2s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "discharge_alert_threshold_2s": (raw & 0xffff) * 0.1,
+        # SG_ DischargeMeasuredCurrent2s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "discharge_measured_current_2s": ((raw >> 16) & 0xffff) * 0.1,
+        # SG_ ChargeAlertThreshold2s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "charge_alert_threshold_2s": ((raw >> 32) & 0xffff) * 0.1,
+        # SG_ ChargeMeasuredCurrent2s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "charge_measured_current_2s": ((raw >> 48) & 0xffff) * 0.1,
+    }
+
+
+def encode_bms_vmu_sp_detail_2s(signals: dict) -> bytes:
+    raw = 0
+    # SG_ DischargeAlertThreshold2s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= round(signals.get("discharge_alert_threshold_2s", 0) / 0.1) & 0xffff
+    # SG_ DischargeMeasuredCurrent2s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("discharge_measured_current_2s", 0) / 0.1) & 0xffff) << 16
+    # SG_ ChargeAlertThreshold2s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("charge_alert_threshold_2s", 0) / 0.1) & 0xffff) << 32
+    # SG_ ChargeMeasuredCurrent2s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("charge_measured_current_2s", 0) / 0.1) & 0xffff) << 48
+    return raw.to_bytes(8, "big")
+
+
+# BMS_VMU_SP_DETAIL_5S
+MESSAGE_ID_BMS_VMU_SP_DETAIL_5S = 2566849822
+
+
+def decode_bms_vmu_sp_detail_5s(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"BMS_VMU_SP_DETAIL_5S is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ DischargeAlertThreshold5s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "discharge_alert_threshold_5s": (raw & 0xffff) * 0.1,
+        # SG_ DischargeMeasuredCurrent5s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "discharge_measured_current_5s": ((raw >> 16) & 0xffff) * 0.1,
+        # SG_ ChargeAlertThreshold5s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "charge_alert_threshold_5s": ((raw >> 32) & 0xffff) * 0.1,
+        # SG_ ChargeMeasuredCurrent5s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "charge_measured_current_5s": ((raw >> 48) & 0xffff) * 0.1,
+    }
+
+
+def encode_bms_vmu_sp_detail_5s(signals: dict) -> bytes:
+    raw = 0
+    # SG_ DischargeAlertThreshold5s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= round(signals.get("discharge_alert_threshold_5s", 0) / 0.1) & 0xffff
+    # SG_ DischargeMeasuredCurrent5s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("discharge_measured_current_5s", 0) / 0.1) & 0xffff) << 16
+    # SG_ ChargeAlertThreshold5s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("charge_alert_threshold_5s", 0) / 0.1) & 0xffff) << 32
+    # SG_ ChargeMeasuredCurrent5s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("charge_measured_current_5s", 0) / 0.1) & 0xffff) << 48
+    return raw.to_bytes(8, "big")
+
+
+# BMS_VMU_SP_DETAIL_10S
+MESSAGE_ID_BMS_VMU_SP_DETAIL_10S = 2566850078
+
+
+def decode_bms_vmu_sp_detail_10s(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"BMS_VMU_SP_DETAIL_10S is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ DischargeAlertThreshold10s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "discharge_alert_threshold_10s": (raw & 0xffff) * 0.1,
+        # SG_ DischargeMeasuredCurrent10s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "discharge_measured_current_10s": ((raw >> 16) & 0xffff) * 0.1,
+        # SG_ ChargeAlertThreshold10s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "charge_alert_threshold_10s": ((raw >> 32) & 0xffff) * 0.1,
+        # SG_ ChargeMeasuredCurrent10s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "charge_measured_current_10s": ((raw >> 48) & 0xffff) * 0.1,
+    }
+
+
+def encode_bms_vmu_sp_detail_10s(signals: dict) -> bytes:
+    raw = 0
+    # SG_ DischargeAlertThreshold10s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= round(signals.get("discharge_alert_threshold_10s", 0) / 0.1) & 0xffff
+    # SG_ DischargeMeasuredCurrent10s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("discharge_measured_current_10s", 0) / 0.1) & 0xffff) << 16
+    # SG_ ChargeAlertThreshold10s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("charge_alert_threshold_10s", 0) / 0.1) & 0xffff) << 32
+    # SG_ ChargeMeasuredCurrent10s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("charge_measured_current_10s", 0) / 0.1) & 0xffff) << 48
+    return raw.to_bytes(8, "big")
+
+
+# BMS_VMU_SP_DETAIL_30S
+MESSAGE_ID_BMS_VMU_SP_DETAIL_30S = 2566850334
+
+
+def decode_bms_vmu_sp_detail_30s(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"BMS_VMU_SP_DETAIL_30S is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ DischargeAlertThreshold30s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "discharge_alert_threshold_30s": (raw & 0xffff) * 0.1,
+        # SG_ DischargeMeasuredCurrent30s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "discharge_measured_current_30s": ((raw >> 16) & 0xffff) * 0.1,
+        # SG_ ChargeAlertThreshold30s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "charge_alert_threshold_30s": ((raw >> 32) & 0xffff) * 0.1,
+        # SG_ ChargeMeasuredCurrent30s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "charge_measured_current_30s": ((raw >> 48) & 0xffff) * 0.1,
+    }
+
+
+def encode_bms_vmu_sp_detail_30s(signals: dict) -> bytes:
+    raw = 0
+    # SG_ DischargeAlertThreshold30s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= round(signals.get("discharge_alert_threshold_30s", 0) / 0.1) & 0xffff
+    # SG_ DischargeMeasuredCurrent30s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("discharge_measured_current_30s", 0) / 0.1) & 0xffff) << 16
+    # SG_ ChargeAlertThreshold30s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("charge_alert_threshold_30s", 0) / 0.1) & 0xffff) << 32
+    # SG_ ChargeMeasuredCurrent30s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("charge_measured_current_30s", 0) / 0.1) & 0xffff) << 48
+    return raw.to_bytes(8, "big")
+
+
+# BMS_VMU_SP_DETAIL_60S
+MESSAGE_ID_BMS_VMU_SP_DETAIL_60S = 2566850590
+
+
+def decode_bms_vmu_sp_detail_60s(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"BMS_VMU_SP_DETAIL_60S is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ DischargeAlertThreshold60s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "discharge_alert_threshold_60s": (raw & 0xffff) * 0.1,
+        # SG_ DischargeMeasuredCurrent60s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "discharge_measured_current_60s": ((raw >> 16) & 0xffff) * 0.1,
+        # SG_ ChargeAlertThreshold60s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "charge_alert_threshold_60s": ((raw >> 32) & 0xffff) * 0.1,
+        # SG_ ChargeMeasuredCurrent60s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "charge_measured_current_60s": ((raw >> 48) & 0xffff) * 0.1,
+    }
+
+
+def encode_bms_vmu_sp_detail_60s(signals: dict) -> bytes:
+    raw = 0
+    # SG_ DischargeAlertThreshold60s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= round(signals.get("discharge_alert_threshold_60s", 0) / 0.1) & 0xffff
+    # SG_ DischargeMeasuredCurrent60s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("discharge_measured_current_60s", 0) / 0.1) & 0xffff) << 16
+    # SG_ ChargeAlertThreshold60s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("charge_alert_threshold_60s", 0) / 0.1) & 0xffff) << 32
+    # SG_ ChargeMeasuredCurrent60s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("charge_measured_current_60s", 0) / 0.1) & 0xffff) << 48
+    return raw.to_bytes(8, "big")
+
+
+# BMS_VMU_SP_DETAIL_RMS_1
+MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_1 = 2566850846
+
+
+def decode_bms_vmu_sp_detail_rms_1(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"BMS_VMU_SP_DETAIL_RMS_1 is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ RmsAlertThreshold5s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_alert_threshold_5s": (raw & 0xffff) * 0.1,
+        # SG_ RmsMeasuredCurrent5s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_measured_current_5s": ((raw >> 16) & 0xffff) * 0.1,
+        # SG_ RmsAlertThreshold2s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_alert_threshold_2s": ((raw >> 32) & 0xffff) * 0.1,
+        # SG_ RmsMeasuredCurrent2s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_measured_current_2s": ((raw >> 48) & 0xffff) * 0.1,
+    }
+
+
+def encode_bms_vmu_sp_detail_rms_1(signals: dict) -> bytes:
+    raw = 0
+    # SG_ RmsAlertThreshold5s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= round(signals.get("rms_alert_threshold_5s", 0) / 0.1) & 0xffff
+    # SG_ RmsMeasuredCurrent5s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("rms_measured_current_5s", 0) / 0.1) & 0xffff) << 16
+    # SG_ RmsAlertThreshold2s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("rms_alert_threshold_2s", 0) / 0.1) & 0xffff) << 32
+    # SG_ RmsMeasuredCurrent2s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("rms_measured_current_2s", 0) / 0.1) & 0xffff) << 48
+    return raw.to_bytes(8, "big")
+
+
+# BMS_VMU_SP_DETAIL_RMS_2
+MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_2 = 2566851102
+
+
+def decode_bms_vmu_sp_detail_rms_2(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"BMS_VMU_SP_DETAIL_RMS_2 is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ RmsAlertThreshold30s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_alert_threshold_30s": (raw & 0xffff) * 0.1,
+        # SG_ RmsMeasuredCurrent30s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_measured_current_30s": ((raw >> 16) & 0xffff) * 0.1,
+        # SG_ RmsAlertThreshold10s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_alert_threshold_10s": ((raw >> 32) & 0xffff) * 0.1,
+        # SG_ RmsMeasuredCurrent10s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_measured_current_10s": ((raw >> 48) & 0xffff) * 0.1,
+    }
+
+
+def encode_bms_vmu_sp_detail_rms_2(signals: dict) -> bytes:
+    raw = 0
+    # SG_ RmsAlertThreshold30s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= round(signals.get("rms_alert_threshold_30s", 0) / 0.1) & 0xffff
+    # SG_ RmsMeasuredCurrent30s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("rms_measured_current_30s", 0) / 0.1) & 0xffff) << 16
+    # SG_ RmsAlertThreshold10s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("rms_alert_threshold_10s", 0) / 0.1) & 0xffff) << 32
+    # SG_ RmsMeasuredCurrent10s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("rms_measured_current_10s", 0) / 0.1) & 0xffff) << 48
+    return raw.to_bytes(8, "big")
+
+
+# BMS_VMU_SP_DETAIL_RMS_3
+MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_3 = 2566851358
+
+
+def decode_bms_vmu_sp_detail_rms_3(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"BMS_VMU_SP_DETAIL_RMS_3 is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ RmsAlertThreshold120s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_alert_threshold_120s": (raw & 0xffff) * 0.1,
+        # SG_ RmsMeasuredCurrent120s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_measured_current_120s": ((raw >> 16) & 0xffff) * 0.1,
+        # SG_ RmsAlertThreshold60s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_alert_threshold_60s": ((raw >> 32) & 0xffff) * 0.1,
+        # SG_ RmsMeasuredCurrent60s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_measured_current_60s": ((raw >> 48) & 0xffff) * 0.1,
+    }
+
+
+def encode_bms_vmu_sp_detail_rms_3(signals: dict) -> bytes:
+    raw = 0
+    # SG_ RmsAlertThreshold120s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= round(signals.get("rms_alert_threshold_120s", 0) / 0.1) & 0xffff
+    # SG_ RmsMeasuredCurrent120s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("rms_measured_current_120s", 0) / 0.1) & 0xffff) << 16
+    # SG_ RmsAlertThreshold60s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("rms_alert_threshold_60s", 0) / 0.1) & 0xffff) << 32
+    # SG_ RmsMeasuredCurrent60s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("rms_measured_current_60s", 0) / 0.1) & 0xffff) << 48
+    return raw.to_bytes(8, "big")
+
+
+# BMS_VMU_SP_DETAIL_RMS_4
+MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_4 = 2566851614
+
+
+def decode_bms_vmu_sp_detail_rms_4(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"BMS_VMU_SP_DETAIL_RMS_4 is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ RmsAlertThreshold480s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_alert_threshold_480s": (raw & 0xffff) * 0.1,
+        # SG_ RmsMeasuredCurrent480s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_measured_current_480s": ((raw >> 16) & 0xffff) * 0.1,
+        # SG_ RmsAlertThreshold240s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_alert_threshold_240s": ((raw >> 32) & 0xffff) * 0.1,
+        # SG_ RmsMeasuredCurrent240s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_measured_current_240s": ((raw >> 48) & 0xffff) * 0.1,
+    }
+
+
+def encode_bms_vmu_sp_detail_rms_4(signals: dict) -> bytes:
+    raw = 0
+    # SG_ RmsAlertThreshold480s : 48|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= round(signals.get("rms_alert_threshold_480s", 0) / 0.1) & 0xffff
+    # SG_ RmsMeasuredCurrent480s : 32|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("rms_measured_current_480s", 0) / 0.1) & 0xffff) << 16
+    # SG_ RmsAlertThreshold240s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("rms_alert_threshold_240s", 0) / 0.1) & 0xffff) << 32
+    # SG_ RmsMeasuredCurrent240s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("rms_measured_current_240s", 0) / 0.1) & 0xffff) << 48
+    return raw.to_bytes(8, "big")
+
+
+# BMS_VMU_SP_DETAIL_RMS_5
+MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_5 = 2566851870
+
+
+def decode_bms_vmu_sp_detail_rms_5(data: bytes) -> dict:
+    if len(data) != 4:
+        raise ValueError(f"BMS_VMU_SP_DETAIL_RMS_5 is 4 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ RmsAlertThreshold900s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_alert_threshold_900s": (raw & 0xffff) * 0.1,
+        # SG_ RmsMeasuredCurrent900s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+        "rms_measured_current_900s": ((raw >> 16) & 0xffff) * 0.1,
+    }
+
+
+def encode_bms_vmu_sp_detail_rms_5(signals: dict) -> bytes:
+    raw = 0
+    # SG_ RmsAlertThreshold900s : 16|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= round(signals.get("rms_alert_threshold_900s", 0) / 0.1) & 0xffff
+    # SG_ RmsMeasuredCurrent900s : 0|16@1+ (0.1,0) [0|6553.5] "A" Vector__XXX
+    raw |= (round(signals.get("rms_measured_current_900s", 0) / 0.1) & 0xffff) << 16
+    return raw.to_bytes(4, "big")
+
+
+# BMS_VMU_FAILURE
+MESSAGE_ID_BMS_VMU_FAILURE = 2566852638
+
+
+def decode_bms_vmu_failure(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"BMS_VMU_FAILURE is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ Safety_Reserved : 61|3@1+ (1,0) [0|0] "" Vector__XXX
+        "safety_reserved": (raw >> 61) & 0x7,
+        # SG_ Safety_ApplComm : 60|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_appl_comm": bool((raw >> 60) & 0x01),
+        # SG_ Safety_JunctionBoxTemperature : 59|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_junction_box_temperature": bool((raw >> 59) & 0x01),
+        # SG_ Safety_ContextAlim : 58|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_context_alim": bool((raw >> 58) & 0x01),
+        # SG_ Safety_Vpack : 57|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_vpack": bool((raw >> 57) & 0x01),
+        # SG_ Safety_CurrSensor : 56|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_curr_sensor": bool((raw >> 56) & 0x01),
+        # SG_ Safety_TempSensor : 55|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_temp_sensor": bool((raw >> 55) & 0x01),
+        # SG_ Safety_VoltSensor : 54|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_volt_sensor": bool((raw >> 54) & 0x01),
+        # SG_ Safety_Hvil : 53|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_hvil": bool((raw >> 53) & 0x01),
+        # SG_ Safety_EmergencyStop : 52|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_emergency_stop": bool((raw >> 52) & 0x01),
+        # SG_ Safety_CommAuxShunt : 51|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_comm_aux_shunt": bool((raw >> 51) & 0x01),
+        # SG_ Safety_SlaveMaxim : 50|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_slave_maxim": bool((raw >> 50) & 0x01),
+        # SG_ Safety_SlaveMeasTimeout : 49|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_slave_meas_timeout": bool((raw >> 49) & 0x01),
+        # SG_ Safety_SlaveId : 48|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_slave_id": bool((raw >> 48) & 0x01),
+        # SG_ Safety_SlaveNumber : 47|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_slave_number": bool((raw >> 47) & 0x01),
+        # SG_ Safety_SlaveComm : 46|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_slave_comm": bool((raw >> 46) & 0x01),
+        # SG_ Safety_SlaveSpiComm : 45|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_slave_spi_comm": bool((raw >> 45) & 0x01),
+        # SG_ Safety_Config : 44|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_config": bool((raw >> 44) & 0x01),
+        # SG_ Safety_Contactor : 43|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_contactor": bool((raw >> 43) & 0x01),
+        # SG_ Safety_Oil : 42|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_oil": bool((raw >> 42) & 0x01),
+        # SG_ Safety_Curmax60s : 41|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_curmax60s": bool((raw >> 41) & 0x01),
+        # SG_ Safety_Curmax30s : 40|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_curmax30s": bool((raw >> 40) & 0x01),
+        # SG_ Safety_Curmax10s : 39|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_curmax10s": bool((raw >> 39) & 0x01),
+        # SG_ Safety_Curmax5s : 38|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_curmax5s": bool((raw >> 38) & 0x01),
+        # SG_ Safety_Curmax2s : 37|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_curmax2s": bool((raw >> 37) & 0x01),
+        # SG_ Safety_VoltImbalance : 36|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_volt_imbalance": bool((raw >> 36) & 0x01),
+        # SG_ Safety_Voltmin : 35|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_voltmin": bool((raw >> 35) & 0x01),
+        # SG_ Safety_Voltmax : 34|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_voltmax": bool((raw >> 34) & 0x01),
+        # SG_ Safety_TempImbalance : 33|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_temp_imbalance": bool((raw >> 33) & 0x01),
+        # SG_ Safety_TempmaxMod : 32|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_tempmax_mod": bool((raw >> 32) & 0x01),
+        # SG_ Reserved : 11|21@1+ (1,0) [0|0] "" Vector__XXX
+        "reserved": (raw >> 11) & 0x1fffff,
+        # SG_ CurmaxFuse : 10|1@1- (1,0) [0|1] "" Vector__XXX
+        "curmax_fuse": bool((raw >> 10) & 0x01),
+        # SG_ Charger : 9|1@1- (1,0) [0|1] "" Vector__XXX
+        "charger": bool((raw >> 9) & 0x01),
+        # SG_ InternalTemperature : 8|1@1- (1,0) [0|1] "" Vector__XXX
+        "internal_temperature": bool((raw >> 8) & 0x01),
+        # SG_ InternalPowerAlimentation : 7|1@1- (1,0) [0|1] "" Vector__XXX
+        "internal_power_alimentation": bool((raw >> 7) & 0x01),
+        # SG_ PrechargeContactor : 6|1@1- (1,0) [0|1] "" Vector__XXX
+        "precharge_contactor": bool((raw >> 6) & 0x01),
+        # SG_ Contactor : 5|1@1- (1,0) [0|1] "" Vector__XXX
+        "contactor": bool((raw >> 5) & 0x01),
+        # SG_ Config : 4|1@1- (1,0) [0|1] "" Vector__XXX
+        "config": bool((raw >> 4) & 0x01),
+        # SG_ AuxShunt : 3|1@1- (1,0) [0|1] "" Vector__XXX
+        "aux_shunt": bool((raw >> 3) & 0x01),
+        # SG_ uCCommunication : 2|1@1- (1,0) [0|1] "" Vector__XXX
+        "uc_communication": bool((raw >> 2) & 0x01),
+        # SG_ ExternalCommunication : 1|1@1- (1,0) [0|1] "" Vector__XXX
+        "external_communication": bool((raw >> 1) & 0x01),
+        # SG_ Safety_Generic : 0|1@1- (1,0) [0|1] "" Vector__XXX
+        "safety_generic": bool(raw & 0x01),
+    }
+
+
+def encode_bms_vmu_failure(signals: dict) -> bytes:
+    raw = 0
+    # SG_ Safety_Reserved : 61|3@1+ (1,0) [0|0] "" Vector__XXX
+    raw |= (int(signals.get("safety_reserved", 0)) & 0x7) << 61
+    # SG_ Safety_ApplComm : 60|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_appl_comm", 0)) & 0x1) << 60
+    # SG_ Safety_JunctionBoxTemperature : 59|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_junction_box_temperature", 0)) & 0x1) << 59
+    # SG_ Safety_ContextAlim : 58|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_context_alim", 0)) & 0x1) << 58
+    # SG_ Safety_Vpack : 57|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_vpack", 0)) & 0x1) << 57
+    # SG_ Safety_CurrSensor : 56|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_curr_sensor", 0)) & 0x1) << 56
+    # SG_ Safety_TempSensor : 55|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_temp_sensor", 0)) & 0x1) << 55
+    # SG_ Safety_VoltSensor : 54|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_volt_sensor", 0)) & 0x1) << 54
+    # SG_ Safety_Hvil : 53|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_hvil", 0)) & 0x1) << 53
+    # SG_ Safety_EmergencyStop : 52|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_emergency_stop", 0)) & 0x1) << 52
+    # SG_ Safety_CommAuxShunt : 51|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_comm_aux_shunt", 0)) & 0x1) << 51
+    # SG_ Safety_SlaveMaxim : 50|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_slave_maxim", 0)) & 0x1) << 50
+    # SG_ Safety_SlaveMeasTimeout : 49|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_slave_meas_timeout", 0)) & 0x1) << 49
+    # SG_ Safety_SlaveId : 48|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_slave_id", 0)) & 0x1) << 48
+    # SG_ Safety_SlaveNumber : 47|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_slave_number", 0)) & 0x1) << 47
+    # SG_ Safety_SlaveComm : 46|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_slave_comm", 0)) & 0x1) << 46
+    # SG_ Safety_SlaveSpiComm : 45|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_slave_spi_comm", 0)) & 0x1) << 45
+    # SG_ Safety_Config : 44|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_config", 0)) & 0x1) << 44
+    # SG_ Safety_Contactor : 43|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_contactor", 0)) & 0x1) << 43
+    # SG_ Safety_Oil : 42|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_oil", 0)) & 0x1) << 42
+    # SG_ Safety_Curmax60s : 41|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_curmax60s", 0)) & 0x1) << 41
+    # SG_ Safety_Curmax30s : 40|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_curmax30s", 0)) & 0x1) << 40
+    # SG_ Safety_Curmax10s : 39|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_curmax10s", 0)) & 0x1) << 39
+    # SG_ Safety_Curmax5s : 38|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_curmax5s", 0)) & 0x1) << 38
+    # SG_ Safety_Curmax2s : 37|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_curmax2s", 0)) & 0x1) << 37
+    # SG_ Safety_VoltImbalance : 36|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_volt_imbalance", 0)) & 0x1) << 36
+    # SG_ Safety_Voltmin : 35|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_voltmin", 0)) & 0x1) << 35
+    # SG_ Safety_Voltmax : 34|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_voltmax", 0)) & 0x1) << 34
+    # SG_ Safety_TempImbalance : 33|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_temp_imbalance", 0)) & 0x1) << 33
+    # SG_ Safety_TempmaxMod : 32|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("safety_tempmax_mod", 0)) & 0x1) << 32
+    # SG_ Reserved : 11|21@1+ (1,0) [0|0] "" Vector__XXX
+    raw |= (int(signals.get("reserved", 0)) & 0x1fffff) << 11
+    # SG_ CurmaxFuse : 10|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("curmax_fuse", 0)) & 0x1) << 10
+    # SG_ Charger : 9|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("charger", 0)) & 0x1) << 9
+    # SG_ InternalTemperature : 8|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("internal_temperature", 0)) & 0x1) << 8
+    # SG_ InternalPowerAlimentation : 7|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("internal_power_alimentation", 0)) & 0x1) << 7
+    # SG_ PrechargeContactor : 6|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("precharge_contactor", 0)) & 0x1) << 6
+    # SG_ Contactor : 5|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("contactor", 0)) & 0x1) << 5
+    # SG_ Config : 4|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("config", 0)) & 0x1) << 4
+    # SG_ AuxShunt : 3|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("aux_shunt", 0)) & 0x1) << 3
+    # SG_ uCCommunication : 2|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("uc_communication", 0)) & 0x1) << 2
+    # SG_ ExternalCommunication : 1|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= (int(signals.get("external_communication", 0)) & 0x1) << 1
+    # SG_ Safety_Generic : 0|1@1- (1,0) [0|1] "" Vector__XXX
+    raw |= int(signals.get("safety_generic", 0)) & 0x1
+    return raw.to_bytes(8, "big")
+
+
+# BMS_VMU_INFO
+MESSAGE_ID_BMS_VMU_INFO = 2566856734
+
+
+def decode_bms_vmu_info(data: bytes) -> dict:
+    if len(data) != 7:
+        raise ValueError(f"BMS_VMU_INFO is 7 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ SOH : 48|8@1+ (1,0) [0|100] "%" Vector__XXX
+        "soh": raw & 0xff,
+        # SG_ DownStreamVoltage : 32|16@1+ (0.1,0) [0|6553.5] "V" Vector__XXX
+        "downstream_voltage": ((raw >> 8) & 0xffff) * 0.1,
+        # SG_ UpStreamVoltage : 16|16@1+ (0.1,0) [0|6553.5] "V" Vector__XXX
+        "upstream_voltage": ((raw >> 24) & 0xffff) * 0.1,
+        # SG_ Current : 0|16@1- (0.1,0) [-3276.8|3276.7] "A" Vector__XXX
+        "current": ((((raw >> 40) & 0xffff) ^ 0x8000) - 0x8000) * 0.1,
+    }
+
+
+def encode_bms_vmu_info(signals: dict) -> bytes:
+    raw = 0
+    # SG_ SOH : 48|8@1+ (1,0) [0|100] "%" Vector__XXX
+    raw |= int(signals.get("soh", 0)) & 0xff
+    # SG_ DownStreamVoltage : 32|16@1+ (0.1,0) [0|6553.5] "V" Vector__XXX
+    raw |= (round(signals.get("downstream_voltage", 0) / 0.1) & 0xffff) << 8
+    # SG_ UpStreamVoltage : 16|16@1+ (0.1,0) [0|6553.5] "V" Vector__XXX
+    raw |= (round(signals.get("upstream_voltage", 0) / 0.1) & 0xffff) << 24
+    # SG_ Current : 0|16@1- (0.1,0) [-3276.8|3276.7] "A" Vector__XXX
+    raw |= (round(signals.get("current", 0) / 0.1) & 0xffff) << 40
+    return raw.to_bytes(7, "big")
+
+
+# BMS_VMU_INFO_CELLS
+MESSAGE_ID_BMS_VMU_INFO_CELLS = 2566856990
+
+
+def decode_bms_vmu_info_cells(data: bytes) -> dict:
+    if len(data) != 6:
+        raise ValueError(f"BMS_VMU_INFO_CELLS is 6 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ MaximumCellVoltage : 32|16@1+ (1,0) [0|5000] "mV" Vector__XXX
+        "maximum_cell_voltage": raw & 0xffff,
+        # SG_ AverageCellVoltage : 16|16@1+ (1,0) [0|5000] "mV" Vector__XXX
+        "average_cell_voltage": (raw >> 16) & 0xffff,
+        # SG_ MinimumCellVoltage : 0|16@1+ (1,0) [0|5000] "mV" Vector__XXX
+        "minimum_cell_voltage": (raw >> 32) & 0xffff,
+    }
+
+
+def encode_bms_vmu_info_cells(signals: dict) -> bytes:
+    raw = 0
+    # SG_ MaximumCellVoltage : 32|16@1+ (1,0) [0|5000] "mV" Vector__XXX
+    raw |= int(signals.get("maximum_cell_voltage", 0)) & 0xffff
+    # SG_ AverageCellVoltage : 16|16@1+ (1,0) [0|5000] "mV" Vector__XXX
+    raw |= (int(signals.get("average_cell_voltage", 0)) & 0xffff) << 16
+    # SG_ MinimumCellVoltage : 0|16@1+ (1,0) [0|5000] "mV" Vector__XXX
+    raw |= (int(signals.get("minimum_cell_voltage", 0)) & 0xffff) << 32
+    return raw.to_bytes(6, "big")
+
+
+# BMS_VMU_INFO_TEMPERATURE
+MESSAGE_ID_BMS_VMU_INFO_TEMPERATURE = 2566857246
+
+
+def decode_bms_vmu_info_temperature(data: bytes) -> dict:
+    if len(data) != 3:
+        raise ValueError(f"BMS_VMU_INFO_TEMPERATURE is 3 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ MaximumCellTemperature : 16|8@1- (1,0) [-128|127] "°C" Vector__XXX
+        "maximum_cell_temperature": ((raw & 0xff) ^ 0x80) - 0x80,
+        # SG_ AverageCellTemperature : 8|8@1- (1,0) [-128|127] "°C" Vector__XXX
+        "average_cell_temperature": (((raw >> 8) & 0xff) ^ 0x80) - 0x80,
+        # SG_ MinimumCellTemperature : 0|8@1- (1,0) [-128|127] "°C" Vector__XXX
+        "minimum_cell_temperature": (((raw >> 16) & 0xff) ^ 0x80) - 0x80,
+    }
+
+
+def encode_bms_vmu_info_temperature(signals: dict) -> bytes:
+    raw = 0
+    # SG_ MaximumCellTemperature : 16|8@1- (1,0) [-128|127] "°C" Vector__XXX
+    raw |= int(signals.get("maximum_cell_temperature", 0)) & 0xff
+    # SG_ AverageCellTemperature : 8|8@1- (1,0) [-128|127] "°C" Vector__XXX
+    raw |= (int(signals.get("average_cell_temperature", 0)) & 0xff) << 8
+    # SG_ MinimumCellTemperature : 0|8@1- (1,0) [-128|127] "°C" Vector__XXX
+    raw |= (int(signals.get("minimum_cell_temperature", 0)) & 0xff) << 16
+    return raw.to_bytes(3, "big")
+
+
+# BMS_VMU_INFO_INSULATION
+MESSAGE_ID_BMS_VMU_INFO_INSULATION = 2566857502
+
+
+def decode_bms_vmu_info_insulation(data: bytes) -> dict:
+    if len(data) != 4:
+        raise ValueError(f"BMS_VMU_INFO_INSULATION is 4 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ InsulationResistance : 0|32@1+ (1,0) [0|1e+006] "kOhm" Vector__XXX
+        "insulation_resistance": raw & 0xffffffff,
+    }
+
+
+def encode_bms_vmu_info_insulation(signals: dict) -> bytes:
+    raw = 0
+    # SG_ InsulationResistance : 0|32@1+ (1,0) [0|1e+006] "kOhm" Vector__XXX
+    raw |= int(signals.get("insulation_resistance", 0)) & 0xffffffff
+    return raw.to_bytes(4, "big")
+
+
+# BMS_VMU_INFO_JB_TEMPERATURE
+MESSAGE_ID_BMS_VMU_INFO_JB_TEMPERATURE = 2566857758
+
+
+def decode_bms_vmu_info_jb_temperature(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"BMS_VMU_INFO_JB_TEMPERATURE is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ JunctionBoxThermTempMax : 48|16@1- (1,0) [-128|300] "°C" Vector__XXX
+        "junction_box_therm_temp_max": ((raw & 0xffff) ^ 0x8000) - 0x8000,
+        # SG_ JunctionBoxThermTempMeas : 32|16@1- (1,0) [-128|300] "°C" Vector__XXX
+        "junction_box_therm_temp_meas": (((raw >> 16) & 0xffff) ^ 0x8000) - 0x8000,
+        # SG_ JunctionBoxShuntTempMax : 16|16@1- (1,0) [-128|300] "°C" Vector__XXX
+        "junction_box_shunt_temp_max": (((raw >> 32) & 0xffff) ^ 0x8000) - 0x8000,
+        # SG_ JunctionBoxShuntTempMeas : 0|16@1- (1,0) [-128|300] "°C" Vector__XXX
+        "junction_box_shunt_temp_meas": (((raw >> 48) & 0xffff) ^ 0x8000) - 0x8000,
+    }
+
+
+def encode_bms_vmu_info_jb_temperature(signals: dict) -> bytes:
+    raw = 0
+    # SG_ JunctionBoxThermTempMax : 48|16@1- (1,0) [-128|300] "°C" Vector__XXX
+    raw |= int(signals.get("junction_box_therm_temp_max", 0)) & 0xffff
+    # SG_ JunctionBoxThermTempMeas : 32|16@1- (1,0) [-128|300] "°C" Vector__XXX
+    raw |= (int(signals.get("junction_box_therm_temp_meas", 0)) & 0xffff) << 16
+    # SG_ JunctionBoxShuntTempMax : 16|16@1- (1,0) [-128|300] "°C" Vector__XXX
+    raw |= (int(signals.get("junction_box_shunt_temp_max", 0)) & 0xffff) << 32
+    # SG_ JunctionBoxShuntTempMeas : 0|16@1- (1,0) [-128|300] "°C" Vector__XXX
+    raw |= (int(signals.get("junction_box_shunt_temp_meas", 0)) & 0xffff) << 48
+    return raw.to_bytes(8, "big")
+
+
+# BMS_VMU_CONF_VERSION
+MESSAGE_ID_BMS_VMU_CONF_VERSION = 2566861598
+
+
+def decode_bms_vmu_conf_version(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"BMS_VMU_CONF_VERSION is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ ApplConfVerChar_3 : 56|8@1+ (1,0) [0|255] "" Vector__XXX
+        "appl_conf_ver_char_3": raw & 0xff,
+        # SG_ ApplConfVerChar_2 : 48|8@1+ (1,0) [0|255] "" Vector__XXX
+        "appl_conf_ver_char_2": (raw >> 8) & 0xff,
+        # SG_ ApplConfVerChar_1 : 40|8@1+ (1,0) [0|255] "" Vector__XXX
+        "appl_conf_ver_char_1": (raw >> 16) & 0xff,
+        # SG_ ApplConfVerChar_0 : 32|8@1+ (1,0) [0|255] "" Vector__XXX
+        "appl_conf_ver_char_0": (raw >> 24) & 0xff,
+        # SG_ SafetyConfVerChar_3 : 24|8@1+ (1,0) [0|255] "" Vector__XXX
+        "safety_conf_ver_char_3": (raw >> 32) & 0xff,
+        # SG_ SafetyConfVerChar_2 : 16|8@1+ (1,0) [0|255] "" Vector__XXX
+        "safety_conf_ver_char_2": (raw >> 40) & 0xff,
+        # SG_ SafetyConfVerChar_1 : 8|8@1+ (1,0) [0|255] "" Vector__XXX
+        "safety_conf_ver_char_1": (raw >> 48) & 0xff,
+        # SG_ SafetyConfVerChar_0 : 0|8@1+ (1,0) [0|255] "" Vector__XXX
+        "safety_conf_ver_char_0": (raw >> 56) & 0xff,
+    }
+
+
+def encode_bms_vmu_conf_version(signals: dict) -> bytes:
+    raw = 0
+    # SG_ ApplConfVerChar_3 : 56|8@1+ (1,0) [0|255] "" Vector__XXX
+    raw |= int(signals.get("appl_conf_ver_char_3", 0)) & 0xff
+    # SG_ ApplConfVerChar_2 : 48|8@1+ (1,0) [0|255] "" Vector__XXX
+    raw |= (int(signals.get("appl_conf_ver_char_2", 0)) & 0xff) << 8
+    # SG_ ApplConfVerChar_1 : 40|8@1+ (1,0) [0|255] "" Vector__XXX
+    raw |= (int(signals.get("appl_conf_ver_char_1", 0)) & 0xff) << 16
+    # SG_ ApplConfVerChar_0 : 32|8@1+ (1,0) [0|255] "" Vector__XXX
+    raw |= (int(signals.get("appl_conf_ver_char_0", 0)) & 0xff) << 24
+    # SG_ SafetyConfVerChar_3 : 24|8@1+ (1,0) [0|255] "" Vector__XXX
+    raw |= (int(signals.get("safety_conf_ver_char_3", 0)) & 0xff) << 32
+    # SG_ SafetyConfVerChar_2 : 16|8@1+ (1,0) [0|255] "" Vector__XXX
+    raw |= (int(signals.get("safety_conf_ver_char_2", 0)) & 0xff) << 40
+    # SG_ SafetyConfVerChar_1 : 8|8@1+ (1,0) [0|255] "" Vector__XXX
+    raw |= (int(signals.get("safety_conf_ver_char_1", 0)) & 0xff) << 48
+    # SG_ SafetyConfVerChar_0 : 0|8@1+ (1,0) [0|255] "" Vector__XXX
+    raw |= (int(signals.get("safety_conf_ver_char_0", 0)) & 0xff) << 56
+    return raw.to_bytes(8, "big")
+
+
+# BMS_VMU_STATS
+MESSAGE_ID_BMS_VMU_STATS = 2566864926
+
+
+def decode_bms_vmu_stats(data: bytes) -> dict:
+    if len(data) != 8:
+        raise ValueError(f"BMS_VMU_STATS is 8 bytes, got {len(data)}")
+    raw = int.from_bytes(data, "big")
+    return {
+        # SG_ CounterDischarge : 32|32@1+ (0.01,0) [0|4.29497e+007] "Ah" Vector__XXX
+        "counter_discharge": (raw & 0xffffffff) * 0.01,
+        # SG_ CounterCharge : 0|32@1+ (0.01,0) [0|4.29497e+007] "Ah" Vector__XXX
+        "counter_charge": ((raw >> 32) & 0xffffffff) * 0.01,
+    }
+
+
+def encode_bms_vmu_stats(signals: dict) -> bytes:
+    raw = 0
+    # SG_ CounterDischarge : 32|32@1+ (0.01,0) [0|4.29497e+007] "Ah" Vector__XXX
+    raw |= round(signals.get("counter_discharge", 0) / 0.01) & 0xffffffff
+    # SG_ CounterCharge : 0|32@1+ (0.01,0) [0|4.29497e+007] "Ah" Vector__XXX
+    raw |= (round(signals.get("counter_charge", 0) / 0.01) & 0xffffffff) << 32
+    return raw.to_bytes(8, "big")
+
+
+DECODERS = {
+    MESSAGE_ID_VMU_BMS_STATUS: decode_vmu_bms_status,
+    MESSAGE_ID_VMU_BMS_FORCE_HEATING: decode_vmu_bms_force_heating,
+    MESSAGE_ID_VMU_BMS_FORCE_COOLING: decode_vmu_bms_force_cooling,
+    MESSAGE_ID_VMU_BMS_FORCE_PUMPING: decode_vmu_bms_force_pumping,
+    MESSAGE_ID_VMU_BMS_GEN_DATA_RECORD_1: decode_vmu_bms_gen_data_record_1,
+    MESSAGE_ID_VMU_BMS_GEN_DATA_RECORD_2: decode_vmu_bms_gen_data_record_2,
+    MESSAGE_ID_VMU_BMS_GEN_DATA_RECORD_3: decode_vmu_bms_gen_data_record_3,
+    MESSAGE_ID_BMS_VMU_STATUS: decode_bms_vmu_status,
+    MESSAGE_ID_BMS_VMU_SP_CHARGE: decode_bms_vmu_sp_charge,
+    MESSAGE_ID_BMS_VMU_SP_DRIVE: decode_bms_vmu_sp_drive,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_2S: decode_bms_vmu_sp_detail_2s,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_5S: decode_bms_vmu_sp_detail_5s,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_10S: decode_bms_vmu_sp_detail_10s,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_30S: decode_bms_vmu_sp_detail_30s,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_60S: decode_bms_vmu_sp_detail_60s,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_1: decode_bms_vmu_sp_detail_rms_1,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_2: decode_bms_vmu_sp_detail_rms_2,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_3: decode_bms_vmu_sp_detail_rms_3,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_4: decode_bms_vmu_sp_detail_rms_4,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_5: decode_bms_vmu_sp_detail_rms_5,
+    MESSAGE_ID_BMS_VMU_FAILURE: decode_bms_vmu_failure,
+    MESSAGE_ID_BMS_VMU_INFO: decode_bms_vmu_info,
+    MESSAGE_ID_BMS_VMU_INFO_CELLS: decode_bms_vmu_info_cells,
+    MESSAGE_ID_BMS_VMU_INFO_TEMPERATURE: decode_bms_vmu_info_temperature,
+    MESSAGE_ID_BMS_VMU_INFO_INSULATION: decode_bms_vmu_info_insulation,
+    MESSAGE_ID_BMS_VMU_INFO_JB_TEMPERATURE: decode_bms_vmu_info_jb_temperature,
+    MESSAGE_ID_BMS_VMU_CONF_VERSION: decode_bms_vmu_conf_version,
+    MESSAGE_ID_BMS_VMU_STATS: decode_bms_vmu_stats,
+}
+
+ENCODERS = {
+    MESSAGE_ID_VMU_BMS_STATUS: encode_vmu_bms_status,
+    MESSAGE_ID_VMU_BMS_FORCE_HEATING: encode_vmu_bms_force_heating,
+    MESSAGE_ID_VMU_BMS_FORCE_COOLING: encode_vmu_bms_force_cooling,
+    MESSAGE_ID_VMU_BMS_FORCE_PUMPING: encode_vmu_bms_force_pumping,
+    MESSAGE_ID_VMU_BMS_GEN_DATA_RECORD_1: encode_vmu_bms_gen_data_record_1,
+    MESSAGE_ID_VMU_BMS_GEN_DATA_RECORD_2: encode_vmu_bms_gen_data_record_2,
+    MESSAGE_ID_VMU_BMS_GEN_DATA_RECORD_3: encode_vmu_bms_gen_data_record_3,
+    MESSAGE_ID_BMS_VMU_STATUS: encode_bms_vmu_status,
+    MESSAGE_ID_BMS_VMU_SP_CHARGE: encode_bms_vmu_sp_charge,
+    MESSAGE_ID_BMS_VMU_SP_DRIVE: encode_bms_vmu_sp_drive,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_2S: encode_bms_vmu_sp_detail_2s,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_5S: encode_bms_vmu_sp_detail_5s,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_10S: encode_bms_vmu_sp_detail_10s,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_30S: encode_bms_vmu_sp_detail_30s,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_60S: encode_bms_vmu_sp_detail_60s,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_1: encode_bms_vmu_sp_detail_rms_1,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_2: encode_bms_vmu_sp_detail_rms_2,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_3: encode_bms_vmu_sp_detail_rms_3,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_4: encode_bms_vmu_sp_detail_rms_4,
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_5: encode_bms_vmu_sp_detail_rms_5,
+    MESSAGE_ID_BMS_VMU_FAILURE: encode_bms_vmu_failure,
+    MESSAGE_ID_BMS_VMU_INFO: encode_bms_vmu_info,
+    MESSAGE_ID_BMS_VMU_INFO_CELLS: encode_bms_vmu_info_cells,
+    MESSAGE_ID_BMS_VMU_INFO_TEMPERATURE: encode_bms_vmu_info_temperature,
+    MESSAGE_ID_BMS_VMU_INFO_INSULATION: encode_bms_vmu_info_insulation,
+    MESSAGE_ID_BMS_VMU_INFO_JB_TEMPERATURE: encode_bms_vmu_info_jb_temperature,
+    MESSAGE_ID_BMS_VMU_CONF_VERSION: encode_bms_vmu_conf_version,
+    MESSAGE_ID_BMS_VMU_STATS: encode_bms_vmu_stats,
+}
+
+# Keyed by the ID as it appears on the bus (DBC IDs carry the extended frame flag)
+DECODERS_BY_ARBITRATION_ID = {
+    0x1ff0000: decode_vmu_bms_status,
+    0x1ff1000: decode_vmu_bms_force_heating,
+    0x1ff1100: decode_vmu_bms_force_cooling,
+    0x1ff1200: decode_vmu_bms_force_pumping,
+    0x1ff2000: decode_vmu_bms_gen_data_record_1,
+    0x1ff2100: decode_vmu_bms_gen_data_record_2,
+    0x1ff2200: decode_vmu_bms_gen_data_record_3,
+    0x18ff011e: decode_bms_vmu_status,
+    0x18ff021e: decode_bms_vmu_sp_charge,
+    0x18ff031e: decode_bms_vmu_sp_drive,
+    0x18ff041e: decode_bms_vmu_sp_detail_2s,
+    0x18ff051e: decode_bms_vmu_sp_detail_5s,
+    0x18ff061e: decode_bms_vmu_sp_detail_10s,
+    0x18ff071e: decode_bms_vmu_sp_detail_30s,
+    0x18ff081e: decode_bms_vmu_sp_detail_60s,
+    0x18ff091e: decode_bms_vmu_sp_detail_rms_1,
+    0x18ff0a1e: decode_bms_vmu_sp_detail_rms_2,
+    0x18ff0b1e: decode_bms_vmu_sp_detail_rms_3,
+    0x18ff0c1e: decode_bms_vmu_sp_detail_rms_4,
+    0x18ff0d1e: decode_bms_vmu_sp_detail_rms_5,
+    0x18ff101e: decode_bms_vmu_failure,
+    0x18ff201e: decode_bms_vmu_info,
+    0x18ff211e: decode_bms_vmu_info_cells,
+    0x18ff221e: decode_bms_vmu_info_temperature,
+    0x18ff231e: decode_bms_vmu_info_insulation,
+    0x18ff241e: decode_bms_vmu_info_jb_temperature,
+    0x18ff331e: decode_bms_vmu_conf_version,
+    0x18ff401e: decode_bms_vmu_stats,
+}
+
+# (name, shift, mask, sign_bit, factor, offset, is_flag) for every signal, with the shift taken
+# on the payload zero-padded to 8 bytes and read as one big-endian 64-bit word. sign_bit is 0
+# for unsigned signals. Used by wattalps.batch to decode whole columns at once.
+SIGNAL_LAYOUTS = {
+    MESSAGE_ID_VMU_BMS_STATUS: (
+        ("bms_dest_addr", 48, 0xff, 0x0, 1.0, 0.0, False),
+        ("insu_res_meas_en", 60, 0x1, 0x0, 1.0, 0.0, True),
+        ("ask_mode", 56, 0x3, 0x0, 1.0, 0.0, False),
+    ),
+    MESSAGE_ID_VMU_BMS_FORCE_HEATING: (
+        ("bms_dest_addr", 48, 0xff, 0x0, 1.0, 0.0, False),
+        ("force_off", 57, 0x1, 0x0, 1.0, 0.0, True),
+        ("force_on", 56, 0x1, 0x0, 1.0, 0.0, True),
+    ),
+    MESSAGE_ID_VMU_BMS_FORCE_COOLING: (
+        ("bms_dest_addr", 48, 0xff, 0x0, 1.0, 0.0, False),
+        ("force_off", 57, 0x1, 0x0, 1.0, 0.0, True),
+        ("force_on", 56, 0x1, 0x0, 1.0, 0.0, True),
+    ),
+    MESSAGE_ID_VMU_BMS_FORCE_PUMPING: (
+        ("bms_dest_addr", 48, 0xff, 0x0, 1.0, 0.0, False),
+        ("force_on", 56, 0x1, 0x0, 1.0, 0.0, True),
+    ),
+    MESSAGE_ID_VMU_BMS_GEN_DATA_RECORD_1: (
+        ("gen_record_value2", 0, 0xffffffff, 0x80000000, 1.0, 0.0, False),
+        ("gen_record_value1", 32, 0xffffffff, 0x80000000, 1.0, 0.0, False),
+    ),
+    MESSAGE_ID_VMU_BMS_GEN_DATA_RECORD_2: (
+        ("gen_record_value4", 0, 0xffffffff, 0x80000000, 1.0, 0.0, False),
+        ("gen_record_value3", 32, 0xffffffff, 0x80000000, 1.0, 0.0, False),
+    ),
+    MESSAGE_ID_VMU_BMS_GEN_DATA_RECORD_3: (
+        ("gen_record_value6", 0, 0xffffffff, 0x80000000, 1.0, 0.0, False),
+        ("gen_record_value5", 32, 0xffffffff, 0x80000000, 1.0, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_STATUS: (
+        ("charge_phase", 36, 0xf, 0x0, 1.0, 0.0, False),
+        ("is_thermal_forcing", 33, 0x1, 0x0, 1.0, 0.0, True),
+        ("is_cooling", 32, 0x1, 0x0, 1.0, 0.0, True),
+        ("is_pumping", 47, 0x1, 0x0, 1.0, 0.0, True),
+        ("is_heating", 46, 0x1, 0x0, 1.0, 0.0, True),
+        ("is_dc_contactor_closed", 45, 0x1, 0x0, 1.0, 0.0, True),
+        ("is_end_of_charge", 44, 0x1, 0x0, 1.0, 0.0, True),
+        ("is_balancing", 43, 0x1, 0x0, 1.0, 0.0, True),
+        ("is_alert", 42, 0x1, 0x0, 1.0, 0.0, True),
+        ("is_warning", 41, 0x1, 0x0, 1.0, 0.0, True),
+        ("is_failure", 40, 0x1, 0x0, 1.0, 0.0, True),
+        ("soc", 48, 0xff, 0x0, 1.0, 0.0, False),
+        ("mode", 56, 0x7, 0x0, 1.0, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_SP_CHARGE: (
+        ("max_charge_current", 32, 0xffff, 0x0, 0.1, 0.0, False),
+        ("max_charge_voltage", 48, 0xffff, 0x0, 0.1, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_SP_DRIVE: (
+        ("max_regen_current", 32, 0xffff, 0x0, 0.1, 0.0, False),
+        ("max_discharge_current", 48, 0xffff, 0x0, 0.1, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_2S: (
+        ("discharge_alert_threshold_2s", 0, 0xffff, 0x0, 0.1, 0.0, False),
+        ("discharge_measured_current_2s", 16, 0xffff, 0x0, 0.1, 0.0, False),
+        ("charge_alert_threshold_2s", 32, 0xffff, 0x0, 0.1, 0.0, False),
+        ("charge_measured_current_2s", 48, 0xffff, 0x0, 0.1, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_5S: (
+        ("discharge_alert_threshold_5s", 0, 0xffff, 0x0, 0.1, 0.0, False),
+        ("discharge_measured_current_5s", 16, 0xffff, 0x0, 0.1, 0.0, False),
+        ("charge_alert_threshold_5s", 32, 0xffff, 0x0, 0.1, 0.0, False),
+        ("charge_measured_current_5s", 48, 0xffff, 0x0, 0.1, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_10S: (
+        ("discharge_alert_threshold_10s", 0, 0xffff, 0x0, 0.1, 0.0, False),
+        ("discharge_measured_current_10s", 16, 0xffff, 0x0, 0.1, 0.0, False),
+        ("charge_alert_threshold_10s", 32, 0xffff, 0x0, 0.1, 0.0, False),
+        ("charge_measured_current_10s", 48, 0xffff, 0x0, 0.1, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_30S: (
+        ("discharge_alert_threshold_30s", 0, 0xffff, 0x0, 0.1, 0.0, False),
+        ("discharge_measured_current_30s", 16, 0xffff, 0x0, 0.1, 0.0, False),
+        ("charge_alert_threshold_30s", 32, 0xffff, 0x0, 0.1, 0.0, False),
+        ("charge_measured_current_30s", 48, 0xffff, 0x0, 0.1, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_60S: (
+        ("discharge_alert_threshold_60s", 0, 0xffff, 0x0, 0.1, 0.0, False),
+        ("discharge_measured_current_60s", 16, 0xffff, 0x0, 0.1, 0.0, False),
+        ("charge_alert_threshold_60s", 32, 0xffff, 0x0, 0.1, 0.0, False),
+        ("charge_measured_current_60s", 48, 0xffff, 0x0, 0.1, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_1: (
+        ("rms_alert_threshold_5s", 0, 0xffff, 0x0, 0.1, 0.0, False),
+        ("rms_measured_current_5s", 16, 0xffff, 0x0, 0.1, 0.0, False),
+        ("rms_alert_threshold_2s", 32, 0xffff, 0x0, 0.1, 0.0, False),
+        ("rms_measured_current_2s", 48, 0xffff, 0x0, 0.1, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_2: (
+        ("rms_alert_threshold_30s", 0, 0xffff, 0x0, 0.1, 0.0, False),
+        ("rms_measured_current_30s", 16, 0xffff, 0x0, 0.1, 0.0, False),
+        ("rms_alert_threshold_10s", 32, 0xffff, 0x0, 0.1, 0.0, False),
+        ("rms_measured_current_10s", 48, 0xffff, 0x0, 0.1, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_3: (
+        ("rms_alert_threshold_120s", 0, 0xffff, 0x0, 0.1, 0.0, False),
+        ("rms_measured_current_120s", 16, 0xffff, 0x0, 0.1, 0.0, False),
+        ("rms_alert_threshold_60s", 32, 0xffff, 0x0, 0.1, 0.0, False),
+        ("rms_measured_current_60s", 48, 0xffff, 0x0, 0.1, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_4: (
+        ("rms_alert_threshold_480s", 0, 0xffff, 0x0, 0.1, 0.0, False),
+        ("rms_measured_current_480s", 16, 0xffff, 0x0, 0.1, 0.0, False),
+        ("rms_alert_threshold_240s", 32, 0xffff, 0x0, 0.1, 0.0, False),
+        ("rms_measured_current_240s", 48, 0xffff, 0x0, 0.1, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_SP_DETAIL_RMS_5: (
+        ("rms_alert_threshold_900s", 32, 0xffff, 0x0, 0.1, 0.0, False),
+        ("rms_measured_current_900s", 48, 0xffff, 0x0, 0.1, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_FAILURE: (
+        ("safety_reserved", 61, 0x7, 0x0, 1.0, 0.0, False),
+        ("safety_appl_comm", 60, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_junction_box_temperature", 59, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_context_alim", 58, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_vpack", 57, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_curr_sensor", 56, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_temp_sensor", 55, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_volt_sensor", 54, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_hvil", 53, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_emergency_stop", 52, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_comm_aux_shunt", 51, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_slave_maxim", 50, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_slave_meas_timeout", 49, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_slave_id", 48, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_slave_number", 47, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_slave_comm", 46, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_slave_spi_comm", 45, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_config", 44, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_contactor", 43, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_oil", 42, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_curmax60s", 41, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_curmax30s", 40, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_curmax10s", 39, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_curmax5s", 38, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_curmax2s", 37, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_volt_imbalance", 36, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_voltmin", 35, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_voltmax", 34, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_temp_imbalance", 33, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_tempmax_mod", 32, 0x1, 0x0, 1.0, 0.0, True),
+        ("reserved", 11, 0x1fffff, 0x0, 1.0, 0.0, False),
+        ("curmax_fuse", 10, 0x1, 0x0, 1.0, 0.0, True),
+        ("charger", 9, 0x1, 0x0, 1.0, 0.0, True),
+        ("internal_temperature", 8, 0x1, 0x0, 1.0, 0.0, True),
+        ("internal_power_alimentation", 7, 0x1, 0x0, 1.0, 0.0, True),
+        ("precharge_contactor", 6, 0x1, 0x0, 1.0, 0.0, True),
+        ("contactor", 5, 0x1, 0x0, 1.0, 0.0, True),
+        ("config", 4, 0x1, 0x0, 1.0, 0.0, True),
+        ("aux_shunt", 3, 0x1, 0x0, 1.0, 0.0, True),
+        ("uc_communication", 2, 0x1, 0x0, 1.0, 0.0, True),
+        ("external_communication", 1, 0x1, 0x0, 1.0, 0.0, True),
+        ("safety_generic", 0, 0x1, 0x0, 1.0, 0.0, True),
+    ),
+    MESSAGE_ID_BMS_VMU_INFO: (
+        ("soh", 8, 0xff, 0x0, 1.0, 0.0, False),
+        ("downstream_voltage", 16, 0xffff, 0x0, 0.1, 0.0, False),
+        ("upstream_voltage", 32, 0xffff, 0x0, 0.1, 0.0, False),
+        ("current", 48, 0xffff, 0x8000, 0.1, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_INFO_CELLS: (
+        ("maximum_cell_voltage", 16, 0xffff, 0x0, 1.0, 0.0, False),
+        ("average_cell_voltage", 32, 0xffff, 0x0, 1.0, 0.0, False),
+        ("minimum_cell_voltage", 48, 0xffff, 0x0, 1.0, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_INFO_TEMPERATURE: (
+        ("maximum_cell_temperature", 40, 0xff, 0x80, 1.0, 0.0, False),
+        ("average_cell_temperature", 48, 0xff, 0x80, 1.0, 0.0, False),
+        ("minimum_cell_temperature", 56, 0xff, 0x80, 1.0, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_INFO_INSULATION: (
+        ("insulation_resistance", 32, 0xffffffff, 0x0, 1.0, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_INFO_JB_TEMPERATURE: (
+        ("junction_box_therm_temp_max", 0, 0xffff, 0x8000, 1.0, 0.0, False),
+        ("junction_box_therm_temp_meas", 16, 0xffff, 0x8000, 1.0, 0.0, False),
+        ("junction_box_shunt_temp_max", 32, 0xffff, 0x8000, 1.0, 0.0, False),
+        ("junction_box_shunt_temp_meas", 48, 0xffff, 0x8000, 1.0, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_CONF_VERSION: (
+        ("appl_conf_ver_char_3", 0, 0xff, 0x0, 1.0, 0.0, False),
+        ("appl_conf_ver_char_2", 8, 0xff, 0x0, 1.0, 0.0, False),
+        ("appl_conf_ver_char_1", 16, 0xff, 0x0, 1.0, 0.0, False),
+        ("appl_conf_ver_char_0", 24, 0xff, 0x0, 1.0, 0.0, False),
+        ("safety_conf_ver_char_3", 32, 0xff, 0x0, 1.0, 0.0, False),
+        ("safety_conf_ver_char_2", 40, 0xff, 0x0, 1.0, 0.0, False),
+        ("safety_conf_ver_char_1", 48, 0xff, 0x0, 1.0, 0.0, False),
+        ("safety_conf_ver_char_0", 56, 0xff, 0x0, 1.0, 0.0, False),
+    ),
+    MESSAGE_ID_BMS_VMU_STATS: (
+        ("counter_discharge", 0, 0xffffffff, 0x0, 0.01, 0.0, False),
+        ("counter_charge", 32, 0xffffffff, 0x0, 0.01, 0.0, False),
+    ),
+}
@@ -12,16 +12,18 @@ class BmsVmuStats:
     """
 
     NUM_BYTES = 8
-    counter_discharge: int  # raw value, multiply by 0.01 for Ah
-    counter_charge: int  # raw value, multiply by 0.01 for Ah
+    counter_discharge: float  # Ah
+    counter_charge: float  # Ah
 
 
 def decode_vmu_stats(data: bytes) -> BmsVmuStats:
     assert len(data) == BmsVmuStats.NUM_BYTES
     # SG_ CounterDischarge : 32|32@1+ (0.01,0) [0|4.29497e+007] "Ah" Vector__XXX
     counter_discharge = (data[4] << 24) | (data[5] << 16) | (data[6] << 8) | data[7]
+    counter_discharge = counter_discharge * 0.01
     # SG_ CounterCharge : 0|32@1+ (0.01,0) [0|4.29497e+007] "Ah" Vector__XXX
     counter_charge = (data[0] << 24) | (data[1] << 16) | (data[2] << 8) | data[3]
+    counter_charge = counter_charge * 0.01
     return BmsVmuStats(
         counter_discharge=counter_discharge,
         counter_charge=counter_charge,
@@ -29,15 +31,17 @@ def decode_vmu_stats(data: bytes) -> BmsVmuStats:
 
 
 def encode_vmu_stats(msg: BmsVmuStats) -> bytes:
-    data = bytearray(BmsVmuStats.NUM_BYTES)
     # SG_ CounterCharge : 0|32@1+ (0.01,0) [0|4.29497e+007] "Ah" Vector__XXX
-    data[0] = (msg.counter_charge >> 24) & 0xFF
-    data[1] = (msg.counter_charge >> 16) & 0xFF
-    data[2] = (msg.counter_charge >> 8) & 0xFF
-    data[3] = msg.counter_charge & 0xFF
+    counter_charge_raw = int(round(msg.counter_charge / 0.01)) & 0xFFFFFFFF
     # SG_ CounterDischarge : 32|32@1+ (0.01,0) [0|4.29497e+007] "Ah" Vector__XXX
-    data[4] = (msg.counter_discharge >> 24) & 0xFF
-    data[5] = (msg.counter_discharge >> 16) & 0xFF
-    data[6] = (msg.counter_discharge >> 8) & 0xFF
-    data[7] = msg.counter_discharge & 0xFF
+    counter_discharge_raw = int(round(msg.counter_discharge / 0.01)) & 0xFFFFFFFF
+    data = bytearray(BmsVmuStats.NUM_BYTES)
+    data[0] = (counter_charge_raw >> 24) & 0xFF
+    data[1] = (counter_charge_raw >> 16) & 0xFF
+    data[2] = (counter_charge_raw >> 8) & 0xFF
+    data[3] = counter_charge_raw & 0xFF
+    data[4] = (counter_discharge_raw >> 24) & 0xFF
+    data[5] = (counter_discharge_raw >> 16) & 0xFF
+    data[6] = (counter_discharge_raw >> 8) & 0xFF
+    data[7] = counter_discharge_raw & 0xFF
     return bytes(data)
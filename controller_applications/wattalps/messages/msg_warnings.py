@@ -1,6 +1,9 @@
 MESSAGE_ID_BMS_VMU_FAILURE = 2566852638
 
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+
+from controller_applications.wattalps.messages.generated import SIGNAL_LAYOUTS
 
 @dataclass
 class BmsVmuFailure:
@@ -267,6 +270,71 @@ def decode_bms_vmu_failure(data: bytes) -> BmsVmuFailure:
         safety_generic=bool(safety_generic),
     )
 
+
+class BmsVmuFailureView(Mapping):
+    """
+    BMS_VMU_FAILURE frame that decodes a signal the first time it is read.
+
+    Holds the payload as one integer and takes the shift and mask of every signal from the generated
+    ``SIGNAL_LAYOUTS``, so a consumer that only checks ``safety_hvil`` does one shift and mask
+    instead of 42. Has the attributes of ``BmsVmuFailure`` (``encode_bms_vmu_failure`` takes
+    either), ``to_dataclass()`` decodes everything. It is also a read-only mapping of the field
+    names, so it can be used wherever a decoder returns a dict: ``view["safety_hvil"]``.
+    """
+
+    NUM_BYTES = BmsVmuFailure.NUM_BYTES
+    KEYS = tuple(field.name for field in fields(BmsVmuFailure))
+    _KEY_SET = frozenset(KEYS)
+    # name -> (shift, mask, sign_bit, factor, offset, is_flag). The frame is 8 bytes, so the shifts
+    # on the zero-padded 64-bit word are the shifts on the payload itself
+    _LAYOUT = {name: layout for name, *layout in SIGNAL_LAYOUTS[MESSAGE_ID_BMS_VMU_FAILURE]}
+
+    def __init__(self, data: bytes):
+        if len(data) != self.NUM_BYTES:
+            raise ValueError(f"BMS_VMU_FAILURE is {self.NUM_BYTES} bytes, got {len(data)}")
+        self.data = bytes(data)
+        self.raw = int.from_bytes(data, 'big')
+
+    def __getattr__(self, name):
+        # Only called for fields not read yet: decode the one signal and keep it in the instance
+        # dict, so the next read is a plain attribute lookup
+        try:
+            shift, mask, sign_bit, factor, offset, is_flag = self._LAYOUT[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        value = (self.raw >> shift) & mask
+        if is_flag:
+            value = bool(value)
+        else:
+            if sign_bit:
+                value = (value ^ sign_bit) - sign_bit
+            if factor != 1 or offset:
+                value = value * factor + offset
+        self.__dict__[name] = value
+        return value
+
+    def to_dataclass(self) -> BmsVmuFailure:
+        return BmsVmuFailure(**{key: getattr(self, key) for key in self.KEYS})
+
+    def __getitem__(self, key):
+        if key not in self._KEY_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __repr__(self):
+        return f"BmsVmuFailureView({self.data.hex()})"
+
+
+def decode_bms_vmu_failure_view(data: bytes) -> BmsVmuFailureView:
+    return BmsVmuFailureView(data)
+
+
 def encode_bms_vmu_failure(msg: BmsVmuFailure) -> bytes:
     value = 0
     # SG_ Safety_Reserved : 61|3@1+ (1,0) [0|0] "" Vector__XXX
@@ -7,7 +7,10 @@ The main point of this is to provide an example of usage and provide a quick lis
 
 import can
 import j1939
+import threading
 import time
+from collections import deque
+from collections.abc import Mapping
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
@@ -20,6 +23,12 @@ from datetime import datetime
 from controller_applications.bender_ISO175_j1939 import ISO175_CA
 from controller_applications.ivt_can_controller import IVTSensor
 from controller_applications.ca_kubota_engine import Kubota_D902k_CA
+from utils.can_dispatch import DispatchTable
+from utils.can_filters import merge_can_filters
+from utils.can_log import CanLogWriter
+from utils.latency_trace import LatencyTracer
+from utils.metrics import MetricsRegistry, MetricsServer, hex_label, ivt_collector
+from utils.socketcan_bulk import BulkCanReceiver
 
 # Initialize Rich console
 console = Console()
@@ -45,38 +54,46 @@ def create_header():
     return header
 
 
-def create_status_panel():
+def create_status_panel(
+    status="Listening for messages...", message_count=0, unknown_count=0, decode_p99_ms=None
+):
     """Create the status panel with spinner"""
     status_table = Table(show_header=False, box=None, padding=(0, 1))
     status_table.add_column("Status", style="cyan")
     status_table.add_column("Value", style="green")
 
     current_time = datetime.now().strftime("%H:%M:%S")
-    status_table.add_row("🔄 Status", "Listening for messages...")
+    status_table.add_row("🔄 Status", status)
     status_table.add_row("⏰ Time", current_time)
     status_table.add_row("📡 Interface", "can0")
-    status_table.add_row("📊 Messages", "0")
+    status_table.add_row("📊 Messages", str(message_count))
+    status_table.add_row("❓ Unknown", str(unknown_count))
+    if decode_p99_ms is not None:
+        status_table.add_row("⏱ Decode p99", f"{decode_p99_ms:.2f} ms")
 
     return Panel(status_table, title="📊 System Status", border_style="cyan")
 
 
-def create_messages_panel():
-    """Create the messages display panel"""
+def create_messages_panel(frames=()):
+    """Create the messages display panel from (timestamp, pgn, source, decoded_msg, ...) tuples"""
     messages_table = Table(show_header=True, box=None)
     messages_table.add_column("Time", style="dim", width=8)
     messages_table.add_column("PGN", style="yellow", width=8)
     messages_table.add_column("Source", style="blue", width=12)
     messages_table.add_column("Data", style="green")
 
+    for timestamp, pgn, source, decoded_msg, *_ in frames:
+        update_messages_table(messages_table, timestamp, pgn, decoded_msg, source)
+
     return Panel(messages_table, title="📨 Recent Messages", border_style="green")
 
 
-def update_messages_table(messages_table, pgn, decoded_msg, source):
+def update_messages_table(messages_table, timestamp, pgn, decoded_msg, source):
     """Update the messages table with new data"""
-    current_time = datetime.now().strftime("%H:%M:%S")
+    current_time = datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
 
     # Format the decoded message for display
-    if isinstance(decoded_msg, dict):
+    if isinstance(decoded_msg, Mapping):
         if "waiting" in decoded_msg:
             data_display = decoded_msg["waiting"]
         else:
@@ -102,15 +119,29 @@ def create_footer():
     return footer
 
 
+# Set to True to drain can0 in batches straight from a raw socket instead of one bus.recv per frame
+BULK_RECEIVE = False
+BULK_MAX_FRAMES = 64
+
 # Initialize CAN bus and controller applications
 console.print("[bold blue]Initializing CAN Bus Interface...[/bold blue]")
 
-try:
-    bus = can.interface.Bus(channel="can0", bustype="socketcan")
-    console.print("[green]✓[/green] CAN Bus interface initialized successfully")
-except Exception as e:
-    console.print(f"[red]✗[/red] Failed to initialize CAN Bus: {e}")
-    exit(1)
+if BULK_RECEIVE:
+    # bulk_receive_loop opens its own raw socket; a python-can bus nobody reads would only queue
+    # up every frame a second time
+    bus = None
+    console.print("[green]✓[/green] Bulk receive, can0 is opened by the receive thread")
+else:
+    try:
+        # python-can subscribes to every error class unless told to ignore them, so error frames
+        # arrive through recv and feed can_bus_error_frames_total
+        bus = can.interface.Bus(
+            channel="can0", bustype="socketcan", ignore_rx_error_frames=False
+        )
+        console.print("[green]✓[/green] CAN Bus interface initialized successfully")
+    except Exception as e:
+        console.print(f"[red]✗[/red] Failed to initialize CAN Bus: {e}")
+        exit(1)
 
 # Initialize controller applications
 console.print("[bold blue]Loading Controller Applications...[/bold blue]")
@@ -130,17 +161,164 @@ except Exception as e:
     iso_175 = None
 
 try:
-    ivt_sensor = IVTSensor("IVT", bus=bus)
+    # Only its decoders are used here, it never sends, so it needs no bus of its own
+    ivt_sensor = IVTSensor("IVT", bus=bus, connect=False)
     console.print("[green]✓[/green] IVT sensor controller loaded")
 except Exception as e:
     console.print(f"[yellow]⚠[/yellow] IVT sensor controller failed to load: {e}")
     ivt_sensor = None
 
+# Build the arbitration ID -> decoder routing table once, so each frame costs a single lookup
+dispatch = DispatchTable()
+if ivt_sensor:
+    for arbitration_id in range(
+        ivt_sensor.BASE_ID, ivt_sensor.BASE_ID + ivt_sensor.MAX_ID + 1
+    ):
+        dispatch.add_id(arbitration_id, ivt_sensor._decode_mux, "IVT Sensor")
+if kubota:
+    dispatch.add_j1939_ca(kubota, "Kubota Engine")
+if iso_175:
+    dispatch.add_j1939_ca(iso_175, "ISO175")
+
+# Only let the kernel pass frames one of the controllers can decode. Set to False to also see
+# (and count) unknown traffic.
+KERNEL_FILTERS = True
+can_filters = merge_can_filters(ivt_sensor, kubota, iso_175) if KERNEL_FILTERS else None
+if bus is not None:
+    bus.set_filters(can_filters)
+
 console.print("\n[bold green]Starting CAN Bus Monitor...[/bold green]\n")
 
-# Initialize counters
-message_count = 0
-decoded_msg = {"waiting": "No messages received yet"}
+# Decoded frames are pushed by the receive thread into a fixed-size ring buffer. The display takes a
+# snapshot of it on its own refresh tick, so rendering costs scale with the refresh rate rather than
+# the bus load and never hold up bus.recv.
+RING_BUFFER_SIZE = 256
+DISPLAYED_MESSAGES = 10
+
+recent_frames = deque(maxlen=RING_BUFFER_SIZE)
+recent_frames_lock = threading.Lock()
+rx_stats = {"messages": 0, "unknown": 0}
+stop_event = threading.Event()
+
+# Set to a path (e.g. "can0.canlog") to record every received frame to a binary log that
+# utils.can_log.CanLogReader can map and seek later
+RECORD_LOG = None
+can_log = CanLogWriter(RECORD_LOG) if RECORD_LOG else None
+
+# Latency of every decoded frame, per PGN: from its receive timestamp to the end of decoding, and
+# from there until the display picked it up. Set LATENCY_DUMP to a path (e.g. "latency.json") to
+# write the histograms when the monitor exits.
+LATENCY_DUMP = None
+tracer = LatencyTracer()
+if LATENCY_DUMP:
+    tracer.dump_at_exit(LATENCY_DUMP)
+rendered_count = 0  # frames handed to the display so far
+
+# Frame and decoder counters, served for Prometheus on http://127.0.0.1:METRICS_PORT/metrics when
+# METRICS_PORT is set (e.g. 9108)
+METRICS_PORT = None
+metrics = MetricsRegistry()
+frames_total = metrics.counter(
+    "can_frames_total", "Frames received per arbitration ID", "arbitration_id", hex_label
+)
+decode_errors_total = metrics.counter(
+    "can_decode_errors_total", "Frames that failed to decode per PGN", "pgn"
+)
+unknown_frames_total = metrics.counter(
+    "can_unknown_frames_total", "Frames no controller decodes per PGN", "pgn"
+)
+bus_error_frames_total = metrics.counter("can_bus_error_frames_total", "CAN error frames received")
+if ivt_sensor:
+    metrics.add_collector(ivt_collector(ivt_sensor))
+metrics_server = MetricsServer(metrics, port=METRICS_PORT) if METRICS_PORT else None
+
+
+def handle_frame(timestamp, arbitration_id, data, is_extended_id=True):
+    """Decode one frame and push it into the ring buffer"""
+    if can_log is not None:
+        can_log.write(timestamp, arbitration_id, data, is_extended_id)
+    frames_total.inc(arbitration_id)
+
+    # Look up the decoder registered for this arbitration ID
+    route = dispatch.lookup(arbitration_id, is_extended_id)
+    if route is not None:
+        pgn = route.key
+        try:
+            decoded_msg = route.decoder(data)
+        except Exception as e:
+            # Any decoder bug only costs this frame, not the receive thread
+            decoded_msg = {"error": f"{type(e).__name__}: {e}"}
+        # Some decoders return False (ISO175) or {} (IVT) instead of raising, only dicts and views
+        # carry an "error" key
+        if not decoded_msg or (isinstance(decoded_msg, Mapping) and "error" in decoded_msg):
+            decode_errors_total.inc(pgn)
+        source = route.source
+        decoded_at = tracer.decoded(pgn, timestamp)
+    else:
+        pgn = (arbitration_id >> 8) & 0xFFFF
+        decoded_msg = {"unknown_pgn": pgn, "raw_data": data.hex()}
+        source = "Unknown"
+        decoded_at = None
+        rx_stats["unknown"] += 1
+        unknown_frames_total.inc(pgn)
+
+    with recent_frames_lock:
+        recent_frames.append((timestamp, pgn, source, decoded_msg, decoded_at))
+        rx_stats["messages"] += 1
+
+
+def receive_loop():
+    """Receive, decode and buffer frames until stop_event is set"""
+    while not stop_event.is_set():
+        msg = bus.recv(timeout=1.0)  # Wait for a CAN message (timeout in seconds)
+        if msg is not None and msg.is_error_frame:
+            bus_error_frames_total.inc()
+        elif msg is not None:
+            handle_frame(
+                msg.timestamp, msg.arbitration_id, msg.data, msg.is_extended_id
+            )
+
+
+def count_error_frame(timestamp, error_class, data):
+    bus_error_frames_total.inc()
+
+
+def bulk_receive_loop():
+    """Same as receive_loop, but drains up to BULK_MAX_FRAMES frames per call"""
+    with BulkCanReceiver(
+        "can0", max_frames=BULK_MAX_FRAMES, can_filters=can_filters, error_frames=True
+    ) as receiver:
+        while not stop_event.is_set():
+            count = receiver.recv_batch(timeout=1.0)
+            for timestamp, arbitration_id, is_extended_id, data in receiver.frames(
+                count, count_error_frame
+            ):
+                handle_frame(timestamp, arbitration_id, data, is_extended_id)
+
+
+def render_layout():
+    """Rebuild the status and message panels from a snapshot of the ring buffer"""
+    global rendered_count
+    with recent_frames_lock:
+        message_count = rx_stats["messages"]
+        # Frames received since the last refresh (those already pushed out of the ring are lost)
+        fresh = min(message_count - rendered_count, len(recent_frames))
+        frames = list(recent_frames)[-max(fresh, DISPLAYED_MESSAGES):]
+    rendered_count = message_count
+
+    for _, pgn, _, _, decoded_at in frames[len(frames) - fresh :]:
+        if decoded_at is not None:
+            tracer.consumed(pgn, decoded_at)
+    frames = frames[-DISPLAYED_MESSAGES:]
+
+    status = "Message received!" if message_count else "Listening for messages..."
+    decode_p99_ms = tracer.total().percentile(99) * 1000 if message_count else None
+    layout["status"].update(
+        create_status_panel(status, message_count, rx_stats["unknown"], decode_p99_ms)
+    )
+    layout["messages"].update(create_messages_panel(frames))
+    return layout
+
 
 # Create initial layout
 layout["header"].update(create_header())
@@ -148,89 +326,30 @@ layout["status"].update(create_status_panel())
 layout["messages"].update(create_messages_panel())
 layout["footer"].update(create_footer())
 
-try:
-    with Live(layout, refresh_per_second=4, screen=True) as live:
-        console.print("[bold green]🎯 Listening for CAN messages...[/bold green]")
-
-        while True:
-            msg = bus.recv(timeout=1.0)  # Wait for a CAN message (timeout in seconds)
-
-            if msg is None:
-                # No message received, just update the display
-                layout["status"].update(create_status_panel())
-                continue
-
-            message_count += 1
-
-            # Try to extract PGN (Parameter Group Number) from the CAN message
-            arbitration_id = msg.arbitration_id
-            pgn = (arbitration_id >> 8) & 0xFFFF
-            data = msg.data
-
-            # Try to decode with each controller application
-            source = "Unknown"
-            if (
-                ivt_sensor
-                and hasattr(ivt_sensor, "MESSAGE_IDS")
-                and pgn in ivt_sensor.MESSAGE_IDS.keys()
-            ):
-                decoded_msg = ivt_sensor.decode(pgn=pgn, data=data)
-                source = "IVT Sensor"
-            elif (
-                kubota and hasattr(kubota, "decoders") and pgn in kubota.decoders.keys()
-            ):
-                decoded_msg = kubota.decode(pgn=pgn, data=data)
-                source = "Kubota Engine"
-            elif (
-                iso_175
-                and hasattr(iso_175, "decoders")
-                and pgn in iso_175.decoders.keys()
-            ):
-                decoded_msg = iso_175.decode(pgn=pgn, data=data)
-                source = "ISO175"
-            else:
-                console.print(
-                    f"[yellow]⚠[/yellow] No decoder found for PGN: 0x{pgn:04X}"
-                )
-                decoded_msg = {"unknown_pgn": pgn, "raw_data": data.hex()}
-                source = "Unknown"
-
-            # Update the messages table
-            messages_table = Table(show_header=True, box=None)
-            messages_table.add_column("Time", style="dim", width=8)
-            messages_table.add_column("PGN", style="yellow", width=8)
-            messages_table.add_column("Source", style="blue", width=12)
-            messages_table.add_column("Data", style="green")
-
-            # Add the new message
-            update_messages_table(messages_table, pgn, decoded_msg, source)
-
-            # Update status panel with new message count
-            status_table = Table(show_header=False, box=None, padding=(0, 1))
-            status_table.add_column("Status", style="cyan")
-            status_table.add_column("Value", style="green")
-
-            current_time = datetime.now().strftime("%H:%M:%S")
-            status_table.add_row("🔄 Status", "Message received!")
-            status_table.add_row("⏰ Time", current_time)
-            status_table.add_row("📡 Interface", "can0")
-            status_table.add_row("📊 Messages", str(message_count))
-
-            # Update layout
-            layout["status"].update(
-                Panel(status_table, title="📊 System Status", border_style="cyan")
-            )
-            layout["messages"].update(
-                Panel(messages_table, title="📨 Recent Messages", border_style="green")
-            )
+receive_thread = threading.Thread(
+    target=bulk_receive_loop if BULK_RECEIVE else receive_loop, name="can-rx", daemon=True
+)
 
-            # Log the decoded message to console as well
-            console.print(
-                f"[bold blue]📨[/bold blue] PGN: [yellow]0x{pgn:04X}[/yellow] | Source: [blue]{source}[/blue] | Data: [green]{decoded_msg}[/green]"
-            )
+if metrics_server is not None:
+    metrics_server.start()
+
+try:
+    with Live(get_renderable=render_layout, refresh_per_second=4, screen=True):
+        receive_thread.start()
+        while receive_thread.is_alive():
+            receive_thread.join(timeout=0.5)
 
 except KeyboardInterrupt:
     console.print("\n[bold red]🛑 Stopped by user.[/bold red]")
-    console.print("[yellow]Shutting down CAN Bus interface...[/yellow]")
-    bus.shutdown()
+finally:
+    stop_event.set()
+    if receive_thread.is_alive():
+        receive_thread.join(timeout=2.0)
+    if can_log is not None:
+        can_log.close()
+    if metrics_server is not None:
+        metrics_server.stop()
+    if bus is not None:
+        console.print("[yellow]Shutting down CAN Bus interface...[/yellow]")
+        bus.shutdown()
     console.print("[green]✓[/green] Cleanup completed. Goodbye!")
@@ -0,0 +1,176 @@
+import pytest
+import asyncio
+import sys
+import os
+import time
+
+import can
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_applications.bender_ISO175_j1939 import ISO175_CA
+from controller_applications.ca_kubota_engine import Kubota_D902k_CA
+from controller_applications.ivt_can_controller import IVTSensor
+from utils.async_can import AsyncCanStack
+from unittest.mock import patch
+
+
+async def fake_ivt(bus, results=()):
+    """Answer every command on CMD_ID like the sensor does (command byte | 0x80)."""
+    reader = can.AsyncBufferedReader()
+    notifier = can.Notifier(bus, [reader], loop=asyncio.get_running_loop())
+    try:
+        async for msg in reader:
+            if msg.arbitration_id == IVTSensor.CMD_ID:
+                for frame in results:
+                    bus.send(frame)
+                response = bytes([msg.data[0] | 0x80]) + bytes(msg.data[1:])
+                bus.send(
+                    can.Message(
+                        arbitration_id=IVTSensor.RESP_ID, data=response, is_extended_id=False
+                    )
+                )
+    finally:
+        notifier.stop()
+
+
+@pytest.fixture
+def buses():
+    host = can.interface.Bus(channel="async_stack", interface="virtual")
+    device = can.interface.Bus(channel="async_stack", interface="virtual")
+    yield host, device
+    host.shutdown()
+    device.shutdown()
+
+
+def test_commands_resolve_on_response(buses):
+    host, device = buses
+    received = []
+
+    async def scenario():
+        stack = AsyncCanStack(host, listener=lambda *args: received.append(args))
+        ivt = stack.add_ivt(IVTSensor("IVT", bus=host))
+        result_frame = can.Message(
+            arbitration_id=IVTSensor.BASE_ID,
+            data=bytes([0x00, 0x11, 0x00, 0x00, 0x03, 0xE8]),
+            is_extended_id=False,
+        )
+        device_task = asyncio.create_task(fake_ivt(device, [result_frame]))
+        stack_task = asyncio.create_task(stack.run())
+        start = await ivt.start_sensor()
+        reset = await ivt.reset_errors()
+        stack.stop()
+        await stack_task
+        device_task.cancel()
+        return start, reset, stack
+
+    start, reset, stack = asyncio.run(scenario())
+    assert start[0] == 0xB4
+    assert reset[0] == 0xB0
+    assert stack.latest[("IVT Sensor", IVTSensor.BASE_ID)]["value"] == 1000
+    assert received[0][0] == "IVT Sensor"
+
+
+def test_command_timeout(buses):
+    host, _ = buses
+
+    async def scenario():
+        stack = AsyncCanStack(host)
+        ivt = stack.add_ivt(IVTSensor("IVT", bus=host), timeout=0.05)
+        stack_task = asyncio.create_task(stack.run())
+        result = await ivt.trigger_measurement()
+        stack.stop()
+        await stack_task
+        return result, ivt
+
+    result, ivt = asyncio.run(scenario())
+    assert result is None
+    assert not ivt.pending
+
+
+def test_zero_timeout_is_not_the_default(buses):
+    host, _ = buses
+
+    async def scenario():
+        stack = AsyncCanStack(host)
+        ivt = stack.add_ivt(IVTSensor("IVT", bus=host), timeout=5.0)
+        start = time.monotonic()
+        result = await ivt.command(IVTSensor.trigger_command(), timeout=0)
+        return result, time.monotonic() - start, ivt
+
+    result, elapsed, ivt = asyncio.run(scenario())
+    assert result is None
+    assert elapsed < 1.0
+    assert not ivt.pending
+
+
+def test_pipelined_commands(buses):
+    host, device = buses
+
+    async def scenario():
+        stack = AsyncCanStack(host)
+        ivt = stack.add_ivt(IVTSensor("IVT", bus=host))
+        device_task = asyncio.create_task(fake_ivt(device))
+        stack_task = asyncio.create_task(stack.run())
+        responses = await ivt.configure(
+            [IVTSensor.RESET_ERRORS_COMMAND, IVTSensor.trigger_command(), IVTSensor.START_COMMAND]
+        )
+        stack.stop()
+        await stack_task
+        device_task.cancel()
+        return responses
+
+    assert [data[0] for data in asyncio.run(scenario())] == [0xB0, 0xB1, 0xB4]
+
+
+def test_j1939_frames_on_the_same_loop(buses):
+    host, device = buses
+    with patch("j1939.ControllerApplication.__init__", return_value=None):
+        iso175 = ISO175_CA("ISO175")
+
+    async def scenario():
+        stack = AsyncCanStack(host)
+        stack.add_j1939_ca(iso175, "ISO175")
+        stack_task = asyncio.create_task(stack.run())
+        await asyncio.sleep(0.05)
+        device.send(
+            can.Message(
+                arbitration_id=0x18FF01F4, data=bytes([0xE8, 3, 0xFE, 1, 0, 0, 1, 0])
+            )
+        )
+        for _ in range(100):
+            if stack.latest:
+                break
+            await asyncio.sleep(0.01)
+        stack.stop()
+        await stack_task
+        return stack.latest
+
+    latest = asyncio.run(scenario())
+    assert latest[("ISO175", 65281)]["r_iso_corrected"] == 1000
+
+
+def test_malformed_frame_is_counted_and_the_stack_keeps_running(buses):
+    host, device = buses
+    with patch("j1939.ControllerApplication.__init__", return_value=None):
+        kubota = Kubota_D902k_CA("KubotaD902K")
+
+    async def scenario():
+        stack = AsyncCanStack(host)
+        stack.add_j1939_ca(kubota, "Kubota Engine")
+        stack_task = asyncio.create_task(stack.run())
+        await asyncio.sleep(0.05)
+        # EEC1 is 8 bytes, a 2 byte frame makes its decoder raise struct.error
+        device.send(can.Message(arbitration_id=0x0CF00400, data=bytes(2)))
+        device.send(can.Message(arbitration_id=0x0CF00400, data=bytes(8)))
+        for _ in range(100):
+            if stack.latest:
+                break
+            await asyncio.sleep(0.01)
+        stack.stop()
+        await stack_task
+        return stack
+
+    stack = asyncio.run(scenario())
+    assert stack.decode_errors == 1
+    assert ("Kubota Engine", 61444) in stack.latest
@@ -0,0 +1,73 @@
+import json
+import sys
+import os
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import benchmark
+from utils.benchmark import Case, collect_cases, compare, measure
+
+
+def test_collect_cases():
+    cases, skipped = collect_cases()
+    names = {case.name for case in cases}
+
+    assert "kubota.decode_61444" in names
+    assert "kubota.encode_65363" in names
+    assert "iso175.decode_pgn_65281" in names
+    assert "ivt._store" in names
+    assert "wattalps.generated.decode_vmu_bms_status" in names
+    assert "wattalps.generated.encode_vmu_bms_status" in names
+    assert any(name.startswith("wattalps.msg_") for name in names)
+    # Not implemented yet
+    assert "kubota.decode_65360" in skipped
+
+    for case in cases:
+        case.func(*case.args)
+
+
+def test_measure():
+    result = measure(Case("bytes", bytes, (64,)), number=100, repeat=2)
+
+    assert result["ns_per_frame"] > 0
+    assert result["alloc_bytes_per_frame"] >= 64
+
+
+def test_measure_counts_temporaries():
+    def copy_and_drop(data):
+        bytes(bytearray(data))
+        return None
+
+    result = measure(Case("temporary", copy_and_drop, (bytes(256),)), number=100, repeat=2)
+
+    assert result["alloc_bytes_per_frame"] >= 256
+
+
+def test_probe_rejects_false():
+    assert benchmark._probe(lambda data: False, [8]) is None
+    assert benchmark._probe(lambda data: len(data) == 8 and {}, [8]) == (benchmark.PATTERN,)
+
+
+def test_compare_flags_regressions():
+    baseline = {"a": {"ns_per_frame": 100.0}, "b": {"ns_per_frame": 100.0}}
+    results = {
+        "a": {"ns_per_frame": 105.0},
+        "b": {"ns_per_frame": 130.0},
+        "new": {"ns_per_frame": 1000.0},
+    }
+
+    assert compare(results, baseline, threshold=0.10) == [("b", 100.0, 130.0)]
+    assert compare(results, baseline, threshold=0.50) == []
+
+
+def test_main_save_and_compare(tmp_path, capsys):
+    path = tmp_path / "baseline.json"
+
+    assert benchmark.main(["-k", "kubota.payload", "--number", "10", "--save", str(path)]) == 0
+    saved = json.loads(path.read_text())
+    assert list(saved["results"]) == ["kubota.payload_65363_cached"]
+
+    saved["results"]["kubota.payload_65363_cached"]["ns_per_frame"] = 1e-3
+    path.write_text(json.dumps(saved))
+    assert benchmark.main(["-k", "kubota.payload", "--number", "10", "--compare", str(path)]) == 1
+    assert "REGRESSION kubota.payload_65363_cached" in capsys.readouterr().out
@@ -7,7 +7,7 @@ import os
 
 # Append the root dir of the library suite... There has to be a better way to do this.
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from controller_applications.bender_ISO175_j1939 import ISO175_CA
+from controller_applications.bender_ISO175_j1939 import GeneralInfoView, ISO175_CA
 
 
 @pytest.fixture
@@ -140,6 +140,7 @@ def test_decode_invalid_pgn(iso175):
 
 def test_on_message(iso175):
     """Test the on_message handler."""
+    iso175.sink = Mock()
     # Test with valid PGN
     with patch("builtins.print") as mock_print:
         data = struct.pack(
@@ -151,12 +152,26 @@ def test_on_message(iso175):
             1,  # device state (Normal)
         )
         iso175.on_message(65281, data)
-        mock_print.assert_called()
+        iso175.sink.assert_called_once_with("ISO175", 65281, iso175.general_info)
+        # Decoded frames go to the sink, never to the console
+        mock_print.assert_not_called()
 
     # Test with invalid PGN
+    iso175.on_message(99999, b"\x00" * 8)
+    iso175.sink.assert_called_once()
+
+    # Decoding errors are reported to the sink too
+    iso175.on_message(65281, b"\x00")
+    source, pgn, decoded = iso175.sink.call_args.args
+    assert pgn == 65281
+    assert decoded["error"].startswith("Error decoding PGN 65281")
+
+
+def test_on_message_without_sink(iso175):
     with patch("builtins.print") as mock_print:
-        iso175.on_message(99999, b"\x00" * 8)
-        mock_print.assert_called_with("PGN 99999 length 8")
+        iso175.on_message(65281, b"\xe8\x03\xfe\x2a\x00\x00\x01\x00")
+        mock_print.assert_not_called()
+    assert iso175.general_info["r_iso_corrected"] == 1000
 
 
 def test_start_stop(iso175):
@@ -167,3 +182,55 @@ def test_start_stop(iso175):
 
     # Verify that the parent class methods were called
     assert hasattr(iso175, "_ecu")
+
+
+def test_on_message_timestamps_and_tracer(iso175):
+    """Decoded frames keep their receive timestamp and are reported to the tracer."""
+    iso175.tracer = Mock()
+    data = struct.pack("<HBBHB", 1000, 0xFE, 1, 0, 1) + b"\x00"
+
+    assert iso175.age(65281) is None
+    iso175.on_message(65281, data, timestamp=100.0)
+
+    assert iso175.timestamps[65281] == 100.0
+    assert iso175.age(65281, now=100.25) == pytest.approx(0.25)
+    iso175.tracer.decoded.assert_called_once_with(65281, 100.0)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        struct.pack("<HBBHB", 1000, 0xFE, 42, 0x0011, 1) + b"\x00",
+        struct.pack("<HBBHB", 0xFFFF, 0xFF, 0, 0, 7) + b"\x00",
+        struct.pack("<HBBHB", 250, 0x10, 3, 0, 2),
+    ],
+)
+def test_decode_pgn_65281_view_matches_dict(iso175, data):
+    """The lazy view has the keys and values of the eager decoder."""
+    view = iso175.decode_pgn_65281_view(data)
+
+    assert view == iso175.decode_pgn_65281(data)
+    assert dict(view) == iso175.general_info
+    assert "error" not in view
+
+
+def test_decode_pgn_65281_view_is_lazy(iso175):
+    view = iso175.decode_pgn_65281_view(b"\xe8\x03\xfe\x2a\x01\x00\x01\x00")
+
+    assert view["alarms"] == view.alarms == 1
+    assert "alarms" in vars(view)
+    assert "r_iso_status_meaning" not in vars(view)
+
+    iso175.sink = Mock()
+    assert iso175.decode_pgn_65281_view(b"\x00\x00") is False
+    assert iso175.sink.call_args.args[2]["error"].startswith("Error decoding PGN 65281")
+
+
+def test_on_message_decodes_65281_lazily(iso175):
+    iso175.sink = Mock()
+    iso175.on_message(65281, b"\xe8\x03\xfe\x2a\x01\x00\x01\x00")
+
+    decoded = iso175.sink.call_args.args[2]
+    assert isinstance(decoded, GeneralInfoView)
+    assert decoded is iso175.general_info
+    assert decoded["alarms"] == 1
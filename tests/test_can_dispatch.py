@@ -0,0 +1,87 @@
+import pytest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_applications.bender_ISO175_j1939 import ISO175_CA
+from utils.can_dispatch import DispatchTable
+
+
+@pytest.fixture
+def dispatch():
+    """DispatchTable with an ISO175 CA and a fake IVT result ID registered."""
+    with patch("j1939.ControllerApplication.__init__", return_value=None):
+        iso175 = ISO175_CA("ISO175")
+    table = DispatchTable()
+    table.add_j1939_ca(iso175, "ISO175")
+    table.add_id(0x521, Mock(name="ivt_decoder"), "IVT Sensor")
+    return table
+
+
+def test_lookup_exact_id(dispatch):
+    """Exact (11-bit) registrations are returned as-is."""
+    route = dispatch.lookup(0x521)
+    assert route.source == "IVT Sensor"
+    assert route.key == 0x521
+
+
+def test_lookup_pgn_any_source_address(dispatch):
+    """29-bit IDs resolve to the PGN decoder regardless of priority and source address."""
+    route = dispatch.lookup(0x18FF01F4)
+    assert route.source == "ISO175"
+    assert route.key == 65281
+    assert route.decoder.__name__ == "decode_pgn_65281_view"
+
+    other = dispatch.lookup(0x0CFF0142)
+    assert other.key == 65281
+
+
+def test_lookup_caches_resolution(dispatch):
+    """The first lookup of an ID resolves its PGN, later lookups hit the cache."""
+    with patch("utils.can_dispatch.can_id_to_pgn", return_value=65282) as mock_pgn:
+        first = dispatch.lookup(0x18FF02F4)
+        second = dispatch.lookup(0x18FF02F4)
+        assert first is second
+        mock_pgn.assert_called_once()
+
+
+def test_lookup_unknown(dispatch):
+    """Unknown standard IDs, unknown PGNs and data page 1 IDs return None."""
+    assert dispatch.lookup(0x123) is None
+    assert dispatch.lookup(0x18FEEE00) is None
+    assert dispatch.lookup(0x19FF01F4) is None
+
+
+def test_add_pgn_after_miss(dispatch):
+    """Registering a PGN after its ID was cached as unknown makes it resolvable."""
+    assert dispatch.lookup(0x18FEEE00) is None
+    dispatch.add_pgn(65262, Mock(), "Kubota Engine")
+    assert dispatch.lookup(0x18FEEE00).source == "Kubota Engine"
+    assert dispatch.lookup(0x521).source == "IVT Sensor"
+
+
+def test_standard_and_extended_ids_do_not_share_routes(dispatch):
+    """An 11-bit and a 29-bit frame with the same ID value are routed separately."""
+    assert dispatch.lookup(0x521, is_extended_id=False).source == "IVT Sensor"
+    assert dispatch.lookup(0x521, is_extended_id=True) is None
+
+    dispatch.add_id(0x7FF, Mock(), "Extended", is_extended_id=True)
+    assert dispatch.lookup(0x7FF, is_extended_id=True).source == "Extended"
+    assert dispatch.lookup(0x7FF, is_extended_id=False) is None
+    assert dispatch.lookup(0x7FF) is None  # inferred 11-bit
+
+
+def test_miss_cache_is_bounded():
+    """Unknown 11-bit IDs are never cached, 29-bit ones only up to max_routes."""
+    table = DispatchTable(max_routes=8)
+    table.add_id(0x521, Mock(), "IVT Sensor")
+    for arbitration_id in range(0x7FF):
+        table.lookup(arbitration_id, is_extended_id=False)
+    assert len(table._routes) == 1
+
+    for source_address in range(256):
+        assert table.lookup(0x18FEEE00 | source_address) is None
+    assert len(table._routes) == 8
+    assert table.lookup(0x521).source == "IVT Sensor"
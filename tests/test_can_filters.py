@@ -0,0 +1,81 @@
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+import can
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_applications.bender_ISO175_j1939 import ISO175_CA
+from controller_applications.ca_kubota_engine import Kubota_D902k_CA
+from controller_applications.ivt_can_controller import IVTSensor
+from utils.can_filters import j1939_pgn_filters, merge_can_filters, open_filtered_bus
+
+
+@pytest.fixture
+def controllers():
+    with patch("j1939.ControllerApplication.__init__", return_value=None):
+        return Kubota_D902k_CA("Kubota"), ISO175_CA("ISO175")
+
+
+def _matches(filters, arbitration_id, is_extended_id):
+    bus = can.interface.Bus(channel="filters", interface="virtual")
+    try:
+        bus.set_filters(filters)
+        return bus._matches_filters(
+            can.Message(arbitration_id=arbitration_id, is_extended_id=is_extended_id)
+        )
+    finally:
+        bus.shutdown()
+
+
+def test_ivt_filters():
+    """IVT publishes the eight result IDs and the response ID as 11-bit exact matches."""
+    filters = IVTSensor.can_filters()
+    assert [f["can_id"] for f in filters] == list(range(0x521, 0x529)) + [0x511]
+    assert all(f["can_mask"] == 0x7FF and f["extended"] is False for f in filters)
+    assert _matches(filters, 0x528, False)
+    assert not _matches(filters, 0x529, False)
+    assert not _matches(filters, 0x521, True)
+
+
+def test_j1939_filters_match_any_source_address(controllers):
+    """J1939 filters match the PGN regardless of priority and source address."""
+    kubota, iso175 = controllers
+    filters = iso175.can_filters()
+    assert len(filters) == 4
+    assert _matches(filters, 0x18FF01F4, True)
+    assert _matches(filters, 0x0CFF0400, True)
+    assert not _matches(filters, 0x18FF05F4, True)
+    assert not _matches(filters, 0x18FF01F4 & 0x7FF, False)
+
+    filters = kubota.can_filters()
+    assert _matches(filters, 0x0CF00400, True)  # EEC1 from the engine
+    assert not _matches(filters, 0x18FF01F4, True)
+
+
+def test_j1939_pgn_filters_pdu1_ignores_destination():
+    """PDU1 PGNs (PF < 0xF0) match whatever the destination address in PS is."""
+    filters = j1939_pgn_filters([0xEF00, 65281])
+    assert _matches(filters, 0x18EF21F4, True)  # proprietary A to address 0x21
+    assert _matches(filters, 0x18FF01F4, True)
+    assert not _matches(filters, 0x18FF02F4, True)
+
+
+def test_merge_can_filters(controllers):
+    """Merging skips missing controllers and drops duplicate filters."""
+    kubota, iso175 = controllers
+    merged = merge_can_filters(None, kubota, iso175, kubota, IVTSensor)
+    assert len(merged) == len(kubota.decoders) + len(iso175.decoders) + 9
+
+
+def test_open_filtered_bus(controllers):
+    """The merged filters are handed to python-can when opening the bus."""
+    kubota, iso175 = controllers
+    with patch("utils.can_filters.can.interface.Bus") as mock_bus:
+        open_filtered_bus(kubota, iso175, channel="vcan0")
+        kwargs = mock_bus.call_args.kwargs
+        assert kwargs["channel"] == "vcan0"
+        assert kwargs["bustype"] == "socketcan"
+        assert kwargs["can_filters"] == merge_can_filters(kubota, iso175)
@@ -0,0 +1,86 @@
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+import can
+import numpy as np
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_applications.ca_kubota_engine import Kubota_D902k_CA
+from utils.can_log import CanLogReader, CanLogWriter, FLAG_EXTENDED, index_path
+from utils.j1939_can_utils import can_id_to_pgn
+
+COOLANT_ID = 0x18FEEE00  # PGN 65262 from SA 0x00
+SPEED_ID = 0x0CF00400  # PGN 61444 from SA 0x00
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    """A log of 1000 frames, 10 ms apart, alternating coolant temp and EEC1."""
+    path = str(tmp_path / "drive.canlog")
+    with CanLogWriter(path, index_interval=64, buffer_records=100) as log:
+        for i in range(1000):
+            if i % 2:
+                log.write(i * 0.01, SPEED_ID, bytes([0, 125, 125, 0x40, 0x1F, 0, 0, 0]))
+            else:
+                log.write(i * 0.01, COOLANT_ID, bytes([40 + i % 100]) + bytes(7))
+        log.write(10.0, 0x521, b"\x01\x02\x03", is_extended_id=False)
+    return path
+
+
+def test_round_trip(log_path):
+    reader = CanLogReader(log_path)
+    assert len(reader) == 1001
+    assert reader.timestamps[3] == pytest.approx(0.03)
+    assert reader.arbitration_ids[0] == COOLANT_ID
+    assert reader.records["flags"][0] & FLAG_EXTENDED
+    assert not reader.records["flags"][-1] & FLAG_EXTENDED
+    assert list(reader.iter_frames(reader.records[-1:])) == [(10.0, 0x521, b"\x01\x02\x03")]
+    assert reader.payloads.shape == (1001, 8)
+
+
+def test_time_range_is_a_view(log_path):
+    reader = CanLogReader(log_path)
+    records = reader.time_range(1.0, 2.0)
+    assert np.shares_memory(records, reader.records)
+    timestamps = reader.timestamps
+    expected = np.flatnonzero((timestamps >= 1.0) & (timestamps < 2.0))
+    assert len(records) == len(expected)
+    assert records["timestamp"][0] == timestamps[expected[0]]
+    assert records["timestamp"][-1] == timestamps[expected[-1]]
+
+
+def test_time_range_without_index(log_path):
+    """Deleting the sidecar index only costs a wider binary search."""
+    with_index = CanLogReader(log_path).time_range(3.333, 7.777)
+    os.remove(index_path(log_path))
+    without_index = CanLogReader(log_path).time_range(3.333, 7.777)
+    np.testing.assert_array_equal(with_index, without_index)
+    assert len(CanLogReader(log_path).time_range(20.0, 30.0)) == 0
+
+
+def test_by_id_feeds_decoders(log_path):
+    """Frames from the log go straight into the Kubota decoders."""
+    with patch("j1939.ControllerApplication.__init__", return_value=None):
+        kubota = Kubota_D902k_CA("Kubota")
+    reader = CanLogReader(log_path)
+    coolant = reader.by_id(COOLANT_ID, reader.time_range(0.0, 0.5))
+    temps = [
+        kubota.decode(can_id_to_pgn(arbitration_id), data)["Engine Coolant Temp (°C)"]
+        for _, arbitration_id, data in reader.iter_frames(coolant)
+    ]
+    assert temps == list(range(0, 50, 2))
+
+
+def test_append_and_partial_record(log_path):
+    """A truncated last record is ignored by the reader and dropped by the next writer."""
+    with open(log_path, "ab") as f:
+        f.write(b"\x00" * 10)
+    assert len(CanLogReader(log_path)) == 1001
+    with CanLogWriter(log_path) as log:
+        log.write_message(can.Message(timestamp=11.0, arbitration_id=0x123, data=b"\xAA"))
+    reader = CanLogReader(log_path)
+    assert len(reader) == 1002
+    assert list(reader.iter_frames(reader.records[-1:])) == [(11.0, 0x123, b"\xAA")]
@@ -0,0 +1,82 @@
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+import numpy as np
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_applications.ca_kubota_engine import Kubota_D902k_CA
+from utils.can_log import CanLogReader, CanLogWriter
+from utils.can_log_index import PgnIndex, index_cache_path
+
+
+@pytest.fixture
+def reader(tmp_path):
+    """Coolant temps from two source addresses, EEC1, an IVT frame and a data page 1 frame."""
+    path = str(tmp_path / "drive.canlog")
+    with CanLogWriter(path) as log:
+        for i in range(600):
+            timestamp = i * 0.01
+            kind = i % 6
+            if kind == 0:
+                log.write(timestamp, 0x18FEEE00, bytes([40 + i // 6]) + bytes(7))
+            elif kind == 1:
+                log.write(timestamp, 0x18FEEE27, bytes([140]) + bytes(7))
+            elif kind == 2:
+                log.write(timestamp, 0x0CF00400, bytes(8))
+            elif kind == 3:
+                log.write(timestamp, 0x521, bytes(6), is_extended_id=False)
+            elif kind == 4:
+                log.write(timestamp, 0x19FF01F4, bytes(8))
+            else:
+                log.write(timestamp, 0x18FEEE00 | 0x04000000, bytes([41]) + bytes(7))
+    return CanLogReader(path)
+
+
+@pytest.fixture
+def kubota():
+    with patch("j1939.ControllerApplication.__init__", return_value=None):
+        return Kubota_D902k_CA("Kubota")
+
+
+def test_query_matches_linear_scan(reader):
+    """Per-PGN queries return the same records as a full scan, in time order."""
+    index = PgnIndex.build(reader)
+    assert sorted(index.pgns()) == [61444, 65262]
+
+    found = index.query(65262, 1.0, 3.0)
+    ids = reader.arbitration_ids
+    timestamps = reader.timestamps
+    scan = np.flatnonzero(
+        ((ids & 0x03FFFF00) == 0x00FEEE00) & (timestamps >= 1.0) & (timestamps < 3.0)
+    )
+    np.testing.assert_array_equal(found, scan)
+
+
+def test_query_id(reader):
+    index = PgnIndex.build(reader)
+    found = index.query_id(0x18FEEE27)
+    assert len(found) == 100
+    assert (reader.arbitration_ids[found] == 0x18FEEE27).all()
+    assert len(index.query_id(0x521)) == 100
+    assert len(index.query_id(0x19FF01F4)) == 100  # data page 1 is indexed by ID
+    assert len(index.query(12345)) == 0
+
+
+def test_decode_feeds_kubota(reader, kubota):
+    index = PgnIndex.build(reader)
+    timestamps, decoded = index.decode(65262, kubota.decode_65262, 0.0, 0.12)
+    temps = [d["Engine Coolant Temp (°C)"] for d in decoded]
+    assert temps == [0, 100, 1, 1, 100, 1]
+    assert timestamps.tolist() == pytest.approx([0.0, 0.01, 0.05, 0.06, 0.07, 0.11])
+
+
+def test_open_caches_index(reader):
+    built = PgnIndex.open(reader)
+    assert os.path.exists(index_cache_path(reader.path))
+    with patch.object(PgnIndex, "build") as mock_build:
+        loaded = PgnIndex.open(reader)
+        mock_build.assert_not_called()
+    np.testing.assert_array_equal(built.query(65262), loaded.query(65262))
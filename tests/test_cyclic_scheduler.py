@@ -0,0 +1,90 @@
+import pytest
+import sys
+import os
+import time
+from unittest.mock import Mock, patch
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_applications.ca_kubota_engine import Kubota_D902k_CA
+from utils.cyclic_scheduler import CyclicScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_groups_run_on_absolute_deadlines():
+    clock = FakeClock()
+    scheduler = CyclicScheduler(clock=clock)
+    fast = Mock(return_value=True)
+    slow = Mock(return_value=True)
+    scheduler.add(0.01, fast, "fast")
+    scheduler.add(0.1, slow)
+
+    assert scheduler.run_pending(0.005) == pytest.approx(0.01)
+    fast.assert_not_called()
+
+    # 2 ms late: the next deadline stays on the 10 ms grid instead of moving to 22 ms
+    assert scheduler.run_pending(0.012) == pytest.approx(0.02)
+    fast.assert_called_once_with("fast")
+
+    # 35 ms late: the 30, 40 and 50 ms cycles are skipped and counted, the grid is kept
+    assert scheduler.run_pending(0.055) == pytest.approx(0.06)
+    stats = scheduler.stats()[0.01]
+    assert stats["cycles"] == 2
+    assert stats["missed"] == 3
+    assert stats["max_late_ms"] == pytest.approx(35)
+    slow.assert_not_called()
+
+
+def test_callback_returning_false_is_removed():
+    scheduler = CyclicScheduler(clock=FakeClock())
+    once = Mock(return_value=False)
+    scheduler.add(0.01, once)
+    assert scheduler.run_pending(0.01) is None
+    assert scheduler.run_pending(0.02) is None
+    once.assert_called_once()
+
+
+def test_thread_drives_callbacks():
+    scheduler = CyclicScheduler()
+    calls = []
+    scheduler.add(0.005, lambda cookie: calls.append(time.monotonic()) or True)
+    scheduler.start()
+    time.sleep(0.1)
+    scheduler.stop()
+    assert len(calls) >= 5
+    assert scheduler.stats()[0.005]["cycles"] == len(calls)
+
+
+def test_kubota_cyclic_messages_use_the_scheduler():
+    scheduler = Mock()
+    with patch("j1939.ControllerApplication.__init__", return_value=None), patch(
+        "j1939.ControllerApplication.start"
+    ):
+        kubota = Kubota_D902k_CA("KubotaD902K", scheduler=scheduler)
+        kubota._ecu = Mock()
+        kubota.start()
+    scheduler.add.assert_any_call(0.1, kubota.timer_callback_65265)
+    scheduler.add.assert_any_call(0.01, kubota.timer_callback_6563)
+    kubota._ecu.add_timer.assert_not_called()
+
+    kubota.stop()
+    scheduler.remove.assert_any_call(kubota.timer_callback_6563)
+
+
+def test_kubota_cyclic_messages_fall_back_to_ecu_timers():
+    with patch("j1939.ControllerApplication.__init__", return_value=None), patch(
+        "j1939.ControllerApplication.start"
+    ):
+        kubota = Kubota_D902k_CA("KubotaD902K")
+        kubota._ecu = Mock()
+        kubota.start()
+    kubota._ecu.add_timer.assert_any_call(0.01, kubota.timer_callback_6563)
+    kubota.stop()
+    kubota._ecu.remove_timer.assert_any_call(kubota.timer_callback_65265)
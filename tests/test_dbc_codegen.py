@@ -0,0 +1,227 @@
+import pytest
+import dataclasses
+import importlib
+import inspect
+import pkgutil
+import random
+import re
+import sys
+import os
+from pathlib import Path
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_applications.wattalps import messages as wattalps_messages
+from controller_applications.wattalps.messages import generated
+from controller_applications.wattalps.messages import (
+    msg_charge,
+    msg_gen_data_record,
+    msg_info,
+    msg_status,
+    msg_vmu_stats,
+    msg_warnings,
+)
+from utils.dbc_codegen import generate, parse_dbc, parse_names, signal_shift
+
+WATTALPS_DIR = Path(__file__).resolve().parent.parent / "controller_applications" / "wattalps"
+DBC_PATH = WATTALPS_DIR / "wattalps.dbc"
+NAMES_PATH = WATTALPS_DIR / "signal_names.txt"
+# Messages whose hand-written decoder numbers the bits over the whole frame
+FRAME_NUMBERED = ("BMS_VMU_FAILURE",)
+
+
+@pytest.fixture(scope="module")
+def messages():
+    return parse_dbc(DBC_PATH.read_text(encoding="utf-8"))
+
+
+def test_generated_module_is_up_to_date(messages):
+    """generated.py must be what the generator produces from wattalps.dbc."""
+    names = parse_names(NAMES_PATH.read_text(encoding="utf-8"))
+    expected = generate(messages, DBC_PATH.name, FRAME_NUMBERED, names)
+    assert (WATTALPS_DIR / "messages" / "generated.py").read_text(encoding="utf-8") == expected
+
+
+def test_signal_shift_follows_hand_written_layout(messages):
+    """Byte start//8, bit start%8, multi-byte values MSB first."""
+    status = next(m for m in messages if m.name == "BMS_VMU_STATUS")
+    signals = {s.name: s for s in status.signals}
+    assert signal_shift(signals["ChargePhase"], 4) == 4  # (data[3] >> 4) & 0x0F
+    assert signal_shift(signals["Soc"], 4) == 16  # data[1]
+    assert signal_shift(signals["Mode"], 4) == 24  # data[0] & 0x07
+
+
+def test_frame_numbered_failure_matches_hand_written_decoder():
+    data = (1 << 53).to_bytes(8, "big")
+    assert msg_warnings.decode_bms_vmu_failure(data).safety_hvil
+    decoded = generated.decode_bms_vmu_failure(data)
+    assert decoded["safety_hvil"] is True
+    assert not any(value for key, value in decoded.items() if key != "safety_hvil")
+
+
+@pytest.mark.parametrize(
+    "hand_decode, generated_decode, fields",
+    [
+        (
+            msg_charge.decode_charge,
+            generated.decode_bms_vmu_sp_charge,
+            {
+                "max_charge_current": "max_charge_current",
+                "max_charge_voltage": "max_charge_voltage",
+            },
+        ),
+        (
+            msg_info.decode_info,
+            generated.decode_bms_vmu_info,
+            {
+                "soh": "soh",
+                "downstream_voltage": "downstream_voltage",
+                "upstream_voltage": "upstream_voltage",
+                "current": "current",
+            },
+        ),
+        (
+            msg_info.decode_info_temperature,
+            generated.decode_bms_vmu_info_temperature,
+            {
+                "maximum_cell_temperature": "maximum_cell_temperature",
+                "average_cell_temperature": "average_cell_temperature",
+                "minimum_cell_temperature": "minimum_cell_temperature",
+            },
+        ),
+        (
+            msg_status.decode_bms_vmu_status,
+            generated.decode_bms_vmu_status,
+            {
+                "charge_phase": "charge_phase",
+                "is_thermal_forcing": "is_thermal_forcing",
+                "is_pumping": "is_pumping",
+                "is_failure": "is_failure",
+                "soc": "soc",
+                "mode": "mode",
+            },
+        ),
+        (
+            msg_info.decode_info_jb_temperature,
+            generated.decode_bms_vmu_info_jb_temperature,
+            {
+                "junction_box_therm_temp_max": "junction_box_therm_temp_max",
+                "junction_box_shunt_temp_meas": "junction_box_shunt_temp_meas",
+            },
+        ),
+        (
+            msg_gen_data_record.decode_gen_data_record_1,
+            generated.decode_vmu_bms_gen_data_record_1,
+            {
+                "gen_record_value1": "gen_record_value1",
+                "gen_record_value2": "gen_record_value2",
+            },
+        ),
+    ],
+)
+def test_matches_hand_written_decoders(hand_decode, generated_decode, fields):
+    """The generated decoders agree with the hand-written ones on random payloads."""
+    rng = random.Random(0)
+    num_bytes = len(generated.ENCODERS[_message_id(generated_decode)]({}))
+    for _ in range(200):
+        data = bytes(rng.randrange(256) for _ in range(num_bytes))
+        hand = hand_decode(data)
+        decoded = generated_decode(data)
+        for hand_field, generated_field in fields.items():
+            assert getattr(hand, hand_field) == pytest.approx(decoded[generated_field])
+
+
+def test_vmu_stats_in_ah():
+    """Both decoders apply the DBC factor, so the counters come out in Ah."""
+    data = (123456).to_bytes(4, "big") + (654321).to_bytes(4, "big")
+    hand = msg_vmu_stats.decode_vmu_stats(data)
+    decoded = generated.decode_bms_vmu_stats(data)
+    assert hand.counter_charge == pytest.approx(1234.56)
+    assert decoded["counter_charge"] == pytest.approx(hand.counter_charge)
+    assert decoded["counter_discharge"] == pytest.approx(6543.21)
+    assert msg_vmu_stats.encode_vmu_stats(hand) == data
+
+
+def test_names_override_snake_case(messages):
+    names = parse_names("# comment\nBMS_VMU_SP_CHARGE.ChargeVoltage max_charge_voltage\n")
+    assert names == {("BMS_VMU_SP_CHARGE", "ChargeVoltage"): "max_charge_voltage"}
+    code = generate(messages, DBC_PATH.name, FRAME_NUMBERED, names)
+    assert '"max_charge_voltage":' in code
+    assert '"charge_voltage":' not in code
+    with pytest.raises(ValueError):
+        generate(messages, DBC_PATH.name, names={("BMS_VMU_SP_CHARGE", "Voltage"): "voltage"})
+
+
+def test_wrong_length_raises_value_error():
+    """Length checks are not asserts, so they still run under python -O."""
+    with pytest.raises(ValueError):
+        generated.decode_bms_vmu_failure(bytes(7))
+    with pytest.raises(ValueError):
+        generated.decode_bms_vmu_status(bytes(8))
+
+
+def test_encode_decode_round_trip(messages):
+    """encode(decode(data)) gives back the payload for every message (reserved bits cleared)."""
+    rng = random.Random(1)
+    for message in messages:
+        message_id = getattr(generated, f"MESSAGE_ID_{message.name}")
+        used_bits = 0
+        for signal in message.signals:
+            shift = signal_shift(signal, message.length, message.name in FRAME_NUMBERED)
+            used_bits |= ((1 << signal.length) - 1) << shift
+        for _ in range(50):
+            raw = rng.getrandbits(8 * message.length) & used_bits
+            data = raw.to_bytes(message.length, "big")
+            decoded = generated.DECODERS[message_id](data)
+            assert generated.ENCODERS[message_id](decoded) == data
+
+
+def test_arbitration_id_registry():
+    """Decoders are also reachable by the 29-bit ID seen on the bus."""
+    arbitration_id = generated.MESSAGE_ID_BMS_VMU_SP_CHARGE & 0x1FFFFFFF
+    assert (
+        generated.DECODERS_BY_ARBITRATION_ID[arbitration_id]
+        is generated.decode_bms_vmu_sp_charge
+    )
+
+
+def _message_id(decoder):
+    return next(key for key, value in generated.DECODERS.items() if value is decoder)
+
+
+def _hand_written_decoders():
+    """(name, decoder, message ID) of every decode_* function in the wattalps msg_* modules."""
+    decoders = []
+    for module_info in pkgutil.iter_modules(wattalps_messages.__path__):
+        if not module_info.name.startswith("msg_"):
+            continue
+        module = importlib.import_module(f"{wattalps_messages.__name__}.{module_info.name}")
+        for name, decoder in sorted(vars(module).items()):
+            if not name.startswith("decode_") or name.endswith("_view"):
+                continue
+            result_class = inspect.signature(decoder).return_annotation
+            # The BO_ line is in the class docstring, or the module's for one-message modules
+            match = re.search(r"BO_ (\d+)", result_class.__doc__ or "") or re.search(
+                r"BO_ (\d+)", module.__doc__ or ""
+            )
+            decoders.append((f"{module_info.name}.{name}", decoder, int(match.group(1))))
+    return decoders
+
+
+@pytest.mark.parametrize(
+    "name, hand_decode, message_id",
+    _hand_written_decoders(),
+    ids=lambda value: value if isinstance(value, str) else "",
+)
+def test_every_shared_message_matches_hand_written_decoder(name, hand_decode, message_id):
+    """Every hand-written decoder and its generated counterpart return the same fields and values."""
+    generated_decode = generated.DECODERS[message_id]
+    num_bytes = len(generated.ENCODERS[message_id]({}))
+    rng = random.Random(message_id)
+    for _ in range(200):
+        data = bytes(rng.randrange(256) for _ in range(num_bytes))
+        hand = hand_decode(data)
+        decoded = generated_decode(data)
+        assert set(decoded) == {field.name for field in dataclasses.fields(hand)}, name
+        for key, value in decoded.items():
+            assert value == pytest.approx(getattr(hand, key)), (name, key, data.hex())
@@ -1,13 +1,23 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 import struct
+import numpy as np
+import can
 import j1939
 import sys
 import os
+import threading
+from concurrent.futures import Future
 
 # Append the root dir of the library suite... There has to be a better way to do this.
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from controller_applications.ivt_can_controller import IVTSensor, Mode
+from controller_applications.ivt_can_controller import (
+    IVTSensor,
+    Mode,
+    ResponseCorrelator,
+    SampleRing,
+    SequenceTracker,
+)
 
 
 @pytest.fixture
@@ -57,14 +67,14 @@ def test_stop_method(ivt_sensor):
         ivt_sensor.logger.info.assert_called_with("IVTSensor stopped.")
 
 
-# def test_on_can_message_with_result_id(ivt_sensor):
-#     # Simulate a CAN message with a valid result arbitration_id
-#     msg = MagicMock()
-#     msg.arbitration_id = ivt_sensor.BASE_ID
-#     msg.data = bytes([0x00, 0, 0, 0, 0, 0])
-#     with patch.object(ivt_sensor, "on_message") as mock_on_message:
-#         ivt_sensor._on_can_message(msg)
-#         mock_on_message.assert_called_once_with(0x00, msg.data)
+def test_on_can_message_with_result_id(ivt_sensor):
+    # Simulate a CAN message with a valid result arbitration_id
+    msg = MagicMock()
+    msg.arbitration_id = ivt_sensor.BASE_ID
+    msg.data = bytes([0x00, 0, 0, 0, 0, 0])
+    with patch.object(ivt_sensor, "on_message") as mock_on_message:
+        ivt_sensor._on_can_message(msg)
+        mock_on_message.assert_called_once_with(0x00, msg.data)
 
 
 def test_on_can_message_with_resp_id(ivt_sensor):
@@ -162,6 +172,10 @@ def test__decode_mux_invalid_length(ivt_sensor):
     result = ivt_sensor._decode_mux(data)
     assert result == {}
     ivt_sensor.logger.warning.assert_called_with("Unexpected data length")
+    ivt_sensor.logger.warning.reset_mock()
+    assert ivt_sensor._decode_mux(bytes(8)) == {}  # too long
+    ivt_sensor.logger.warning.assert_called_with("Unexpected data length")
+    assert ivt_sensor.raw_values[0] is None
 
 
 def test_send_command(ivt_sensor):
@@ -206,53 +220,141 @@ def test_read_response_timeout(ivt_sensor):
     ivt_sensor.logger.warning.assert_called_with("No response received.")
 
 
+def response(data):
+    return can.Message(arbitration_id=IVTSensor.RESP_ID, data=data, is_extended_id=False)
+
+
+def test_read_response_keeps_other_frames(ivt_sensor):
+    """
+    Result frames and responses to other commands that arrive while waiting are decoded/correlated,
+    not dropped.
+    """
+    pending = ivt_sensor.submit_command(ivt_sensor.RESET_ERRORS_COMMAND)
+    result = can.Message(
+        arbitration_id=ivt_sensor.BASE_ID,
+        data=bytes([0x00, 0x00, 0x00, 0x00, 0x00, 0x64]),
+        is_extended_id=False,
+    )
+    ivt_sensor.bus.recv = Mock(
+        side_effect=[result, response(b"\xb0\x03"), response(b"\xb4\x01\x01")]
+    )
+    msg = ivt_sensor.read_response(timeout=0.1, command=0x34)
+    assert msg.data[0] == 0xB4
+    assert ivt_sensor.results["current"] == 100
+    assert pending.result(0) == b"\xb0\x03"
+    assert not ivt_sensor.pending
+
+
+def test_configure_pipelines_commands(ivt_sensor):
+    """
+    --- IVT CAN Controller Info ---
+    - Responses echo the command byte with bit 7 set, so they are matched even out of order.
+    """
+    ivt_sensor.bus.recv = Mock(
+        side_effect=[response(b"\xb4\x01\x01"), response(b"\xb0\x03"), None]
+    )
+    responses = ivt_sensor.configure(
+        [ivt_sensor.RESET_ERRORS_COMMAND, ivt_sensor.START_COMMAND], timeout=0.1
+    )
+    assert responses == [b"\xb0\x03", b"\xb4\x01\x01"]
+    assert ivt_sensor.bus.send.call_count == 2
+
+
+def test_configure_timeout(ivt_sensor):
+    ivt_sensor.bus.recv = Mock(return_value=None)
+    assert ivt_sensor.configure([ivt_sensor.STOP_COMMAND], timeout=0.01) == [None]
+    assert not ivt_sensor.pending
+    ivt_sensor.logger.warning.assert_called_with("No response received.")
+
+
 def test__start_sensor(ivt_sensor):
     """
     --- IVT CAN Controller Info ---
-    - _start_sensor sends a command (0x34, 0x01, 0x01, 0x00, 0x0000) and reads response.
+    - _start_sensor sends a command (0x34, 0x01, 0x01, 0x00, 0x0000) and waits for the response.
     """
     with patch.object(ivt_sensor, "send_command") as mock_send, patch.object(
-        ivt_sensor, "read_response"
-    ) as mock_read:
+        ivt_sensor, "wait_responses"
+    ) as mock_wait:
         ivt_sensor._start_sensor()
         mock_send.assert_called_once()
-        mock_read.assert_called_once()
+        mock_wait.assert_called_once()
 
 
 def test__stop_sensor(ivt_sensor):
     """
-    - _stop_sensor sends a command (0x34, 0x00, 0x00, 0x00, 0x0000) and reads response.
+    - _stop_sensor sends a command (0x34, 0x00, 0x00, 0x00, 0x0000) and waits for the response.
     """
     with patch.object(ivt_sensor, "send_command") as mock_send, patch.object(
-        ivt_sensor, "read_response"
-    ) as mock_read:
+        ivt_sensor, "wait_responses"
+    ) as mock_wait:
         ivt_sensor._stop_sensor()
         mock_send.assert_called_once()
-        mock_read.assert_called_once()
+        mock_wait.assert_called_once()
 
 
 def test_reset_errors(ivt_sensor):
     """
-    - reset_errors sends a command (0x30, 0x03, 0x00, 0x00, 0x00000000) and reads response.
+    - reset_errors sends a command (0x30, 0x03, 0x00, 0x00, 0x00000000) and waits for the response.
     """
     with patch.object(ivt_sensor, "send_command") as mock_send, patch.object(
-        ivt_sensor, "read_response"
-    ) as mock_read:
+        ivt_sensor, "wait_responses"
+    ) as mock_wait:
         ivt_sensor.reset_errors()
         mock_send.assert_called_once()
-        mock_read.assert_called_once()
+        mock_wait.assert_called_once()
 
 
 def test_trigger_measurement(ivt_sensor):
     """
-    - trigger_measurement sends a command (0x31, channels) and reads response.
+    - trigger_measurement sends a command (0x31, channels) and waits for the response.
     """
     with patch.object(ivt_sensor, "send_command") as mock_send, patch.object(
-        ivt_sensor, "read_response"
-    ) as mock_read:
+        ivt_sensor, "wait_responses"
+    ) as mock_wait:
         ivt_sensor.trigger_measurement(channels=0xAA)
         mock_send.assert_called_once()
-        mock_read.assert_called_once()
+        mock_wait.assert_called_once()
+
+
+def test_start_waits_for_the_notifier_not_the_bus(ivt_sensor):
+    """Once started, command responses come through the notifier and resolve the correlator."""
+    ivt_sensor.bus.recv = Mock(side_effect=AssertionError("bus read while the notifier owns it"))
+
+    def echo(msg):
+        # The sensor answers, and the notifier hands the response to the sensor
+        ivt_sensor._on_can_message(response(bytes([msg.data[0] | 0x80]) + bytes(msg.data[1:])))
+
+    ivt_sensor.bus.send = Mock(side_effect=echo)
+    ivt_sensor.start()
+    assert ivt_sensor.trigger_measurement()[0] == 0xB1
+    ivt_sensor.bus.recv.assert_not_called()
+    assert not ivt_sensor.pending
+
+    with pytest.raises(RuntimeError):
+        ivt_sensor.read_response(timeout=0.01)
+
+
+def test_correlator_add_and_resolve_from_two_threads():
+    """Commands added while the notifier thread resolves responses are never orphaned."""
+    correlator = ResponseCorrelator()
+    done = threading.Event()
+
+    def notifier():
+        while not done.is_set() or correlator:
+            if correlator:
+                correlator.resolve(b"\xb1")
+
+    thread = threading.Thread(target=notifier)
+    thread.start()
+    futures = []
+    for _ in range(5000):
+        future = Future()
+        correlator.add(0x31, future)
+        futures.append(future)
+    done.set()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert all(future.done() for future in futures)
 
 
 def test_get_latest_results(ivt_sensor):
@@ -266,3 +368,73 @@ def test_get_latest_results(ivt_sensor):
     # Should be a copy, not a reference
     results["current"] = 0
     assert ivt_sensor.results["current"] == 123
+
+
+def test_sample_ring_last_is_contiguous_view():
+    ring = SampleRing(capacity=4)
+    for i in range(6):
+        ring.append(float(i), i * 10, i & 0x0F, 0)
+    window = ring.last(3)
+    assert window["timestamp"].tolist() == [3.0, 4.0, 5.0]
+    assert np.shares_memory(window, ring.buffer)
+    assert ring.last()["value"].tolist() == [20, 30, 40, 50]
+    assert len(ring.last(10)) == 4
+
+
+def test_streaming_mode(ivt_sensor):
+    """
+    In streaming mode result frames are appended per channel instead of going through on_message.
+    """
+    ivt_sensor.enable_streaming(capacity=8)
+    for count, value in enumerate((100, 200, -300)):
+        msg = can.Message(
+            timestamp=1.0 + count / 1000,
+            arbitration_id=ivt_sensor.BASE_ID,
+            data=bytes([0x00, 0x10 | count]) + value.to_bytes(4, "big", signed=True),
+            is_extended_id=False,
+        )
+        with patch.object(ivt_sensor, "on_message") as mock_on_message:
+            ivt_sensor._on_can_message(msg)
+            mock_on_message.assert_not_called()
+
+    window = ivt_sensor.window("current", 2)
+    assert window["value"].tolist() == [200, -300]
+    assert window["msg_count"].tolist() == [1, 2]
+    assert window["state_bits"].tolist() == [1, 1]
+    assert ivt_sensor.get_latest_results()["current"] == -300
+    assert len(ivt_sensor.window("temperature")) == 0
+
+
+def test_sequence_tracker():
+    tracker = SequenceTracker()
+    for msg_count in (14, 15, 0, 0, 3, 4, 12, 1):
+        tracker.update(msg_count)
+    # 0 repeated, 1-2 lost, 5-11 lost, 13-15 and 0 lost across the second wrap
+    assert tracker.counters() == {"frames": 8, "dropped": 13, "duplicates": 1, "wraps": 2}
+
+
+def test_decode_mux_tracks_msg_count(ivt_sensor):
+    for msg_count in (1, 2, 4):
+        ivt_sensor._decode_mux(bytes([0x01, msg_count, 0, 0, 0, 1]))
+    counters = ivt_sensor.sequence_counters()
+    assert counters["voltage_u1"]["frames"] == 3
+    assert counters["voltage_u1"]["dropped"] == 1
+    assert counters["current"]["frames"] == 0
+
+
+def test_latest_values_without_dicts(ivt_sensor):
+    """
+    Result frames are unpacked into the latest-value arrays; dicts are only built on request.
+    """
+    assert ivt_sensor._store(bytes([0x04, 0x13, 0xFF, 0xFF, 0xFF, 0x9C])) == 0x04
+    assert ivt_sensor._store(bytes([0x09, 0x00, 0x00, 0x00, 0x00, 0x01])) is None
+    assert ivt_sensor.raw_values[0x04] == -100
+    assert ivt_sensor.value(0x04) == -10.0
+    assert ivt_sensor.results == {"temperature": -10.0}
+    assert ivt_sensor.result(0x04) == {
+        "label": "temperature",
+        "value": -10.0,
+        "unit": "0.1C",
+        "state_bits": 0x1,
+        "msg_count": 0x3,
+    }
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import Mock, patch
 import struct
+import threading
 import j1939
 import sys
 import os
@@ -34,7 +35,8 @@ def test_initialization(kubota):
     assert 65257 in kubota.decoders
     assert 65252 in kubota.decoders
     assert kubota.cyclic_message_functions == {
-        65265: (kubota.timer_callback_65265, 100)
+        65265: (kubota.timer_callback_65265, 100),
+        65363: (kubota.timer_callback_6563, 10),
     }
 
 
@@ -265,8 +267,14 @@ def test_decode_65262_et1(kubota):
 def test_set_vehicle_speed_65265(kubota):
     """Test setting vehicle speed."""
     kubota.set_vehicle_speed_65265(100.0)  # 100 km/h
-    expected = int(100.0 / 250.996)
-    assert kubota.vehicle_speed == expected
+    assert kubota.vehicle_speed == 100.0
+
+
+def test_set_vehicle_speed_65265_round_trip(kubota):
+    """The speed set in km/h reaches bytes 2-3 of CCVS at 1/256 km/h per bit."""
+    kubota.set_vehicle_speed_65265(50)
+    payload = kubota.encode_65265()
+    assert int.from_bytes(payload[1:3], "little") / 256 == 50
 
 
 def test_timer_callback_65265(kubota):
@@ -385,6 +393,31 @@ def test_decode_invalid_pgn(kubota):
     assert result["error"] == "No decoder for PGN 99999"
 
 
+def test_decode_record_reuses_instance(kubota):
+    """decode_record overwrites the same record in place for every frame of a PGN."""
+    first = kubota.decode_record(
+        61444, struct.pack("<BBBHBBBB", 0, 150, 140, 8000, 0x27, 0b0100, 0, 0)
+    )
+    assert first.engine_speed_rpm == 1000
+    assert first.demand_torque_percent == 25
+    assert first.tsc1_source_address == 0x27
+
+    second = kubota.decode_record(
+        61444, struct.pack("<BBBHBBBB", 0, 125, 125, 16000, 0x00, 0, 0, 0)
+    )
+    assert second is first
+    assert first.engine_speed_rpm == 2000
+    assert first.demand_torque_percent == 0
+
+
+def test_decode_record_matches_dict_view(kubota):
+    """The legacy decode_<pgn> dicts are a view over the records."""
+    data = bytes([0x50, 0x01, 0x02, 0x01, 0x02, 0x40, 0x60, 0x80])
+    for pgn in kubota.decoders:
+        assert kubota.decode_record(pgn, data).as_dict() == kubota.decode(pgn, data)
+    assert kubota.decode_record(99999, data) is None
+
+
 def test_kubota_on_message(kubota):
     """Test the on_message handler."""
     # Test with valid PGN
@@ -397,3 +430,49 @@ def test_kubota_on_message(kubota):
     # with patch("builtins.print") as mock_print:
     kubota.on_message(99999, b"\x00" * 8)
     # mock_print.assert_called()
+
+
+def test_encode_65265_ccvs(kubota):
+    """CCVS: vehicle speed in bytes 2-3 at 1/256 km/h per bit, park brake in byte 1 bits 3-4."""
+    kubota.vehicle_speed = 12.5
+    kubota.park_brake = 1
+    assert kubota.encode_65265() == bytearray(
+        [0xF7, 0x80, 0x0C, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF]
+    )
+
+
+def test_payloads_are_cached_until_an_input_changes(kubota):
+    """The cyclic payloads are encoded once and only rebuilt after a setter changed an input."""
+    encode = kubota.payload_encoders[65363] = Mock(wraps=kubota.encode_65363)
+    payload = kubota.payload(65363)
+    for _ in range(10):
+        assert kubota.payload(65363) is payload
+    assert encode.call_count == 1
+
+    kubota.set_throttle_percent(40)
+    assert kubota.payload(65363)[4:6] == (400).to_bytes(2, "little")
+    assert encode.call_count == 2
+
+    speed_payload = kubota.payload(65265)
+    kubota.icr_target_engine_speed = 1500
+    assert kubota.payload(65265) is speed_payload
+    kubota.vehicle_speed = 20.0
+    assert kubota.payload(65265) is not speed_payload
+
+
+def test_payload_cache_does_not_keep_a_payload_encoded_before_a_setter(kubota):
+    """A setter running while the timer thread encodes must not leave the old payload cached."""
+    encode_65265 = kubota.encode_65265
+    setter = threading.Thread(target=setattr, args=(kubota, "park_brake", 1))
+
+    def encode_while_setter_runs():
+        payload = encode_65265()  # from the old speed
+        setter.start()
+        setter.join(timeout=0.1)
+        return payload
+
+    kubota.payload_encoders[65265] = encode_while_setter_runs
+    kubota.payload(65265)
+    setter.join()
+    kubota.payload_encoders[65265] = encode_65265
+    assert kubota.payload(65265) == encode_65265()
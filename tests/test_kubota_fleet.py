@@ -0,0 +1,115 @@
+import pytest
+import struct
+import sys
+import os
+from unittest.mock import Mock, patch
+
+import can
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_applications.kubota_fleet import KubotaFleet
+
+
+def eec1(rpm):
+    # demand torque 50 %, actual torque 25 %, engine speed at 0.125 rpm/bit
+    return struct.pack("<BBBHBBB", 0xFF, 175, 150, int(rpm / 0.125), 0x00, 0x00, 0xFF)
+
+
+@pytest.fixture
+def fleet():
+    with patch("j1939.ControllerApplication.__init__", return_value=None):
+        return KubotaFleet(capacity=2)
+
+
+def test_routes_on_pgn_and_source_address(fleet):
+    assert fleet.handle(0x0CF00401, eec1(1500)) == 0
+    assert fleet.source_addresses == [0x01]
+    # Data page 1 and the extended data page are not J1939 page 0: not routed
+    assert fleet.handle(0x0DF00401, eec1(1500)) is None
+    assert fleet.handle(0x0EF00401, eec1(1500)) is None
+    # PDU1 (PF < 0xF0) PGN the engine doesn't send
+    assert fleet.handle(0x18EA0003, bytes(3)) is None
+    assert len(fleet) == 1
+
+
+def test_start_without_scheduler(fleet):
+    fleet.add_engine(0x00, controller=Mock(cyclic_message_functions={}))
+    with pytest.raises(ValueError):
+        fleet.start()
+
+
+def test_engines_get_one_row_each(fleet):
+    fleet.add_engine(0x00)
+    fleet.add_engine(0x01)
+    assert fleet.handle(0x0CF00400, eec1(1500), timestamp=1.0) == 0
+    assert fleet.handle(0x0CF00401, eec1(2000), timestamp=2.0) == 1
+    # Same engine, different priority: still row 1
+    assert fleet.handle(0x18F00401, eec1(2100)) == 1
+
+    assert fleet.columns["engine_speed_rpm"].tolist() == [1500.0, 2100.0]
+    assert fleet.columns["actual_torque_percent"].tolist() == [25, 25]
+    assert fleet.last_seen.tolist() == [1.0, 2.0]
+    assert fleet.engine(0x01)["demand_torque_percent"] == 50
+
+
+def test_unknown_engines_are_added_and_columns_grow(fleet):
+    for source_address in range(5):
+        coolant = bytes([40 + 60 + source_address]) + bytes(7)
+        fleet.handle(0x18FEEE00 | source_address, coolant)
+    assert len(fleet) == 5
+    assert fleet.capacity >= 5
+    assert fleet.columns["coolant_temp_c"][:5].tolist() == [60, 61, 62, 63, 64]
+
+    assert fleet.handle(0x0CF00405, bytes(2)) is None
+    assert fleet.decode_errors == 1
+    assert fleet.handle(0x18FFFF00, bytes(8)) is None
+
+
+def test_listener_ignores_standard_frames(fleet):
+    fleet.on_message_received(
+        can.Message(arbitration_id=0x521, data=bytes(6), is_extended_id=False)
+    )
+    fleet.on_message_received(can.Message(arbitration_id=0x0CF00407, data=eec1(800)))
+    assert fleet.engine(0x07)["engine_speed_rpm"] == 800.0
+
+
+def test_cyclic_messages_share_one_callback_per_period(fleet):
+    fleet.scheduler = Mock()
+    controllers = []
+    for source_address in (0x10, 0x11, 0x12):
+        controller = Mock()
+        controller.cyclic_message_functions = {
+            65265: (controller.timer_callback_65265, 100),
+            65363: (controller.timer_callback_6563, 10),
+        }
+        fleet.add_engine(source_address, controller)
+        controllers.append(controller)
+
+    fleet.start()
+    assert fleet.scheduler.add.call_count == 2
+    ticks = {call.args[0]: call.args[1] for call in fleet.scheduler.add.call_args_list}
+    assert ticks[0.01](None) is True
+    for controller in controllers:
+        controller.timer_callback_6563.assert_called_once_with(None)
+        controller.timer_callback_65265.assert_not_called()
+
+    fleet.stop()
+    assert fleet.scheduler.remove.call_count == 2
+
+
+def test_tick_isolates_failing_and_finished_callbacks(fleet, caplog):
+    failing = Mock(side_effect=RuntimeError("bus down"))
+    finished = Mock(return_value=False)
+    healthy = Mock(return_value=True)
+    callbacks = [failing, finished, healthy]
+
+    assert fleet._tick(callbacks, None) is True
+    healthy.assert_called_once_with(None)
+    assert callbacks == [failing, healthy]
+    assert "bus down" in caplog.text
+
+    fleet._tick(callbacks, None)
+    finished.assert_called_once()
+    assert healthy.call_count == 2
+    assert fleet._tick([finished], None) is False
@@ -0,0 +1,91 @@
+import json
+import random
+import sys
+import os
+
+import pytest
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.latency_trace import (
+    DECODE_TO_CONSUMER,
+    RECEIVE_TO_DECODE,
+    HdrHistogram,
+    LatencyTracer,
+)
+
+
+def test_histogram_exact_below_sub_bucket_count():
+    histogram = HdrHistogram()
+    for value_us in range(1, 101):
+        histogram.record(value_us / 1e6)
+
+    assert histogram.count == 100
+    assert histogram.percentile(50) == pytest.approx(50e-6)
+    assert histogram.percentile(99) == pytest.approx(99e-6)
+    assert histogram.percentile(100) == pytest.approx(100e-6)
+    assert histogram.as_dict()["mean_ms"] == pytest.approx(0.0505)
+
+
+def test_histogram_precision():
+    rng = random.Random(1)
+    values = sorted(rng.expovariate(1 / 0.002) for _ in range(20000))
+    histogram = HdrHistogram(significant_figures=2)
+    for value in values:
+        histogram.record(value)
+
+    for percentile in (50, 90, 99, 99.9):
+        exact = values[int(percentile / 100 * len(values)) - 1]
+        # Never below the exact value, and within the bucket precision above it
+        assert exact - 1e-6 <= histogram.percentile(percentile) <= exact * 1.01 + 1e-6
+
+
+def test_histogram_clamps_and_counts_above():
+    histogram = HdrHistogram(highest=1.0)
+    histogram.record(-0.001)
+    histogram.record(0.005)
+    histogram.record(0.012)
+    histogram.record(5.0)
+
+    assert histogram.min_us == 0
+    assert histogram.max_us == 1_000_000
+    assert histogram.count_above(0.010) == 2
+    assert histogram.count_above(2.0) == 0
+
+
+def test_histogram_merge():
+    a = HdrHistogram()
+    b = HdrHistogram()
+    a.record(0.001)
+    b.record(0.003)
+
+    a.merge(b)
+
+    assert a.count == 2
+    assert a.max_us == 3000
+    assert a.percentile(100) == pytest.approx(0.003, rel=0.01)
+
+
+def test_tracer_stages_per_key(tmp_path):
+    now = [100.0]
+    tracer = LatencyTracer(clock=lambda: now[0])
+
+    now[0] = 100.002
+    decoded_at = tracer.decoded(65281, received_at=100.0)
+    now[0] = 100.010
+    tracer.consumed(65281, decoded_at)
+    tracer.decoded(61444, received_at=100.009)
+    tracer.decoded(61444, received_at=None)
+
+    assert decoded_at == 100.002
+    assert tracer.histogram(65281, RECEIVE_TO_DECODE).percentile(50) == pytest.approx(0.002)
+    assert tracer.histogram(65281, DECODE_TO_CONSUMER).percentile(50) == pytest.approx(0.008)
+    assert tracer.histogram(61444, RECEIVE_TO_DECODE).count == 1
+    assert tracer.histogram(61444, DECODE_TO_CONSUMER) is None
+    assert tracer.total().count == 2
+
+    path = tmp_path / "latency.json"
+    tracer.dump(path)
+    dumped = json.loads(path.read_text())
+    assert set(dumped) == {"65281", "61444"}
+    assert dumped["65281"][DECODE_TO_CONSUMER]["count"] == 1
@@ -0,0 +1,80 @@
+import pytest
+import multiprocessing
+import sys
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_applications.wattalps.messages import generated
+from utils import log_pipeline
+from utils.can_log import CanLogReader, CanLogWriter
+
+BMS_INFO_ID = generated.MESSAGE_ID_BMS_VMU_INFO & 0x1FFFFFFF
+
+
+@pytest.fixture(scope="module")
+def log_path(tmp_path_factory):
+    """Kubota, ISO175, IVT and wattalps traffic plus an unknown ID, 1 ms apart."""
+    path = str(tmp_path_factory.mktemp("pipeline") / "drive.canlog")
+    with CanLogWriter(path) as log:
+        for i in range(3000):
+            kind = i % 6
+            if kind == 0:
+                log.write(i * 0.001, 0x18FEEE00, bytes([i % 200]) + bytes(7))
+            elif kind == 1:
+                log.write(i * 0.001, 0x0CF00400, bytes([0, 150, 140, 0x40, 0x1F, 0, 4, 0]))
+            elif kind == 2:
+                log.write(i * 0.001, 0x18FF01F4, bytes([0xE8, 3, 0xFE, 1, 0, 0, 1, 0]))
+            elif kind == 3:
+                log.write(i * 0.001, 0x521, bytes([0, 0x12, 0, 0, 1, 0]), is_extended_id=False)
+            elif kind == 4:
+                log.write(i * 0.001, BMS_INFO_ID, bytes([0, 10, 0, 100, 0, 200, 99]))
+            else:
+                log.write(i * 0.001, 0x18FE00AA, bytes(8))  # nobody decodes PGN 65024
+    return path
+
+
+def _worker_state():
+    ivt_sensor = log_pipeline._dispatch.lookup(0x521).decoder.__self__
+    return "rich" in sys.modules, ivt_sensor.bus
+
+
+def test_chunk_bounds_cover_log(log_path):
+    reader = CanLogReader(log_path)
+    bounds = log_pipeline.chunk_bounds(reader, 7)
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(reader)
+    assert all(last == next_first for (_, last), (next_first, _) in zip(bounds, bounds[1:]))
+
+
+def test_serial_decode(log_path):
+    columns = log_pipeline.decode_log(log_path, workers=1, chunks=5)
+    coolant = columns[("Kubota Engine", 65262)]
+    assert len(coolant["timestamp"]) == 500
+    assert coolant["Engine Coolant Temp (°C)"][:3].tolist() == [-40, -34, -28]
+    assert np.all(np.diff(coolant["timestamp"]) > 0)
+    assert columns[("IVT Sensor", 0x521)]["value"][0] == 256
+    assert columns[("Wattalps BMS", BMS_INFO_ID)]["soh"][0] == 99
+    assert columns[("ISO175", 65281)]["r_iso_corrected"][0] == 1000
+
+
+def test_process_pool_matches_serial(log_path):
+    serial = log_pipeline.decode_log(log_path, workers=1, chunks=5)
+    parallel = log_pipeline.decode_log(log_path, workers=2, chunks=5)
+    assert serial.keys() == parallel.keys()
+    for key, group in serial.items():
+        for name, values in group.items():
+            np.testing.assert_array_equal(values, parallel[key][name])
+
+
+def test_workers_do_not_load_rich_or_open_a_bus():
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=log_pipeline._init_worker,
+    ) as executor:
+        rich_loaded, bus = executor.submit(_worker_state).result()
+    assert not rich_loaded
+    assert bus is None
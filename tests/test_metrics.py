@@ -0,0 +1,120 @@
+import time
+import urllib.error
+import urllib.request
+import sys
+import os
+
+import pytest
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_applications.ivt_can_controller import IVTSensor
+from utils.cyclic_scheduler import CyclicScheduler
+from utils.metrics import (
+    MetricsRegistry,
+    MetricsServer,
+    hex_label,
+    ivt_collector,
+    scheduler_collector,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_exposition_format():
+    registry = MetricsRegistry()
+    frames = registry.counter("can_frames_total", "Frames", "arbitration_id", hex_label)
+    errors = registry.counter("can_bus_error_frames_total", "Error frames")
+    gauge = registry.gauge("bus_load", "Bus load")
+
+    frames.inc(0x18FEF100)
+    frames.inc(0x18FEF100)
+    frames.inc(0x521)
+    errors.inc()
+    gauge.set(0.25)
+
+    text = registry.exposition()
+    assert "# TYPE can_frames_total counter" in text
+    assert 'can_frames_total{arbitration_id="0x521"} 1' in text
+    assert 'can_frames_total{arbitration_id="0x18FEF100"} 2' in text
+    assert "can_bus_error_frames_total 1" in text
+    assert "# TYPE bus_load gauge\nbus_load 0.25" in text
+    assert frames.value(0x18FEF100) == 2
+
+
+def test_duplicate_metric():
+    registry = MetricsRegistry()
+    registry.counter("frames_total", "Frames")
+
+    with pytest.raises(ValueError):
+        registry.counter("frames_total", "Frames")
+
+
+def test_scheduler_collector():
+    clock = FakeClock()
+    scheduler = CyclicScheduler(clock=clock)
+    scheduler.add(0.01, lambda cookie: True)
+    clock.now = 0.012
+    scheduler.run_pending()
+    registry = MetricsRegistry()
+    registry.add_collector(scheduler_collector(scheduler))
+
+    text = registry.exposition()
+
+    assert 'cyclic_cycles_total{period="0.01"} 1' in text
+    assert 'cyclic_missed_total{period="0.01"} 0' in text
+    max_late = next(line for line in text.splitlines() if line.startswith("cyclic_max_late"))
+    assert float(max_late.split()[-1]) == pytest.approx(0.002)
+
+
+def test_ivt_collector():
+    ivt = IVTSensor("IVT", connect=False)
+    for counter in (1, 2, 4):
+        ivt._store(IVTSensor.RESULT_FORMAT.pack(0, counter, 1000))
+    registry = MetricsRegistry()
+    registry.add_collector(ivt_collector(ivt))
+
+    text = registry.exposition()
+
+    assert 'ivt_frames_total{result="current"} 3' in text
+    assert 'ivt_dropped_total{result="current"} 1' in text
+
+
+def test_server():
+    registry = MetricsRegistry()
+    registry.counter("can_frames_total", "Frames").inc()
+    server = MetricsServer(registry, port=0)
+    server.start()
+    try:
+        url = f"http://127.0.0.1:{server.port}"
+        with urllib.request.urlopen(url + "/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert "can_frames_total 1" in response.read().decode()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(url + "/other", timeout=5)
+    finally:
+        server.stop()
+
+
+def test_hot_path_overhead():
+    """Two increments per frame at 5k frames/s stay far below 1% of a core."""
+    registry = MetricsRegistry()
+    frames = registry.counter("can_frames_total", "Frames", "arbitration_id", hex_label)
+    errors = registry.counter("can_decode_errors_total", "Errors", "pgn")
+    ids = [0x18FEF100 + i for i in range(32)]
+
+    count = 50_000
+    start = time.perf_counter()
+    for i in range(count):
+        frames.inc(ids[i & 31])
+        errors.inc(61444)
+    per_frame = (time.perf_counter() - start) / count
+
+    # 1% of one core at 5k frames/s is 2 µs per frame
+    assert per_frame * 5000 < 0.01
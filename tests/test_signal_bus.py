@@ -0,0 +1,101 @@
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_applications.bender_ISO175_j1939 import ISO175_CA
+from controller_applications.ca_kubota_engine import Kubota_D902k_CA
+from controller_applications.wattalps.messages.msg_warnings import decode_bms_vmu_failure_view
+from utils.signal_bus import SignalBus, snake_case
+
+
+def test_publish_and_read_latest():
+    bus = SignalBus(clock=lambda: 5.0)
+    bus.publish("ivt.current", 1000)
+    assert bus.value("ivt.current") == 1000.0
+    assert isinstance(bus.value("ivt.current"), float)
+    assert bus["ivt.current"].timestamp == 5.0
+    assert bus.value("ivt.voltage_u1", default=0) == 0
+
+    # Typed slot: values that don't convert are stored as not valid
+    bus.publish("ivt.current", "SNV", timestamp=6.0)
+    assert bus["ivt.current"].value is None
+    assert bus.value("ivt.current", default=-1) == -1
+
+
+def test_subscribers_on_change_and_throttled():
+    bus = SignalBus()
+    every = Mock()
+    changes = Mock()
+    throttled = Mock()
+    bus.subscribe("engine.speed_rpm", every, on_change=False)
+    bus.subscribe("engine.speed_rpm", changes)
+    bus.subscribe("engine.speed_rpm", throttled, on_change=False, min_interval=0.1)
+
+    for timestamp, rpm in [(0.00, 800), (0.05, 800), (0.10, 900), (0.12, 1000), (0.30, 1000)]:
+        bus.publish("engine.speed_rpm", rpm, timestamp)
+
+    assert every.call_count == 5
+    assert changes.call_count == 3
+    assert throttled.call_count == 3  # 0.00, 0.10 and 0.30
+    assert throttled.call_args.args[0].value == 1000.0
+
+
+def test_throttled_change_is_not_lost():
+    bus = SignalBus()
+    seen = []
+    bus.subscribe("iso175.alarms", lambda signal: seen.append(signal.value), min_interval=1.0)
+    bus.publish("iso175.alarms", 0, 0.0)
+    bus.publish("iso175.alarms", 16, 0.5)  # held back by the throttle
+    bus.publish("iso175.alarms", 16, 1.5)
+    assert seen == [0.0, 16.0]
+
+
+def test_sink_publishes_decoded_frames():
+    bus = SignalBus()
+    for name in (
+        "iso175.r_iso_corrected",
+        "iso175.device_state_meaning",
+        "engine.engine_coolant_temp_c",
+        "ivt.current",
+        "engine.pgn",
+    ):
+        bus.signal(name)
+    with patch("j1939.ControllerApplication.__init__", return_value=None):
+        iso175 = ISO175_CA("ISO175", sink=bus.sink())
+        kubota = Kubota_D902k_CA("KubotaD902K", sink=bus.sink({"KubotaD902K": "engine"}))
+
+    iso175.on_message(65281, b"\xe8\x03\xfe\x2a\x00\x00\x01\x00")
+    kubota.on_message(65262, bytes([120]) + bytes(7))
+    bus.sink({"IVT Sensor": "ivt"})(
+        "IVT Sensor", 0x521, {"label": "current", "value": -250, "unit": "mA"}
+    )
+
+    assert bus.value("iso175.r_iso_corrected") == 1000
+    assert bus.value("iso175.device_state_meaning") == "Normal"
+    assert bus.value("engine.engine_coolant_temp_c") == 80
+    assert bus.value("ivt.current") == -250
+    assert bus["engine.pgn"].updates == 0
+    # Fields nobody registered are not published
+    assert "iso175.alarms" not in bus
+    assert "engine.engine_speed_rpm" not in bus
+
+
+def test_sink_reads_only_registered_fields_of_a_view():
+    bus = SignalBus()
+    seen = []
+    bus.subscribe("bms.safety_hvil", lambda signal: seen.append(signal.value))
+    view = decode_bms_vmu_failure_view((1 << 53).to_bytes(8, "big"))
+
+    bus.sink({"BMS": "bms"})("BMS", 0x18FF1E1E, view)
+
+    assert seen == [True]
+    assert set(vars(view)) == {"data", "raw", "safety_hvil"}
+
+
+def test_snake_case():
+    assert snake_case("Engine Speed (RPM)") == "engine_speed_rpm"
+    assert snake_case("Engine Coolant Temp (°C)") == "engine_coolant_temp_c"
+    assert snake_case("IVT Sensor") == "ivt_sensor"
@@ -0,0 +1,117 @@
+import pytest
+import io
+import logging
+import sys
+import os
+import threading
+from unittest.mock import Mock, patch
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_applications.ca_kubota_engine import Kubota_D902k_CA
+from utils.sinks import BatchingSink, ConsoleSink, LogSink, MemorySink, NullSink
+
+
+def test_memory_sink_keeps_latest_and_history():
+    sink = MemorySink(history=2)
+    sink("Kubota Engine", 65262, {"Engine Coolant Temp (°C)": 80})
+    sink("Kubota Engine", 65262, {"Engine Coolant Temp (°C)": 81})
+    sink("ISO175", 65281, {"r_iso_corrected": 1000})
+    assert sink.latest[("Kubota Engine", 65262)] == {"Engine Coolant Temp (°C)": 81}
+    assert [frame[1] for frame in sink.frames] == [65262, 65281]
+    NullSink()("ISO175", 65281, {})
+
+
+def test_log_sink_structured_record(caplog):
+    with caplog.at_level(logging.INFO, logger="can.decoded"):
+        LogSink()("ISO175", 65281, {"r_iso_corrected": 1000})
+    record = caplog.records[0]
+    assert record.source == "ISO175"
+    assert record.key == 65281
+    assert record.decoded == {"r_iso_corrected": 1000}
+
+
+def test_console_sink_format():
+    stream = io.StringIO()
+    ConsoleSink(stream)("ISO175", 65283, {"hv_system_voltage": 400.0})
+    assert stream.getvalue() == "\nDecoded PGN 65283 (ISO175):\n  hv_system_voltage: 400.0\n"
+
+
+def test_batching_sink_defers_delivery():
+    delivered = []
+    sink = BatchingSink(lambda source, key, decoded: delivered.append(key), interval=10.0)
+    for key in range(10):
+        sink("Kubota Engine", key, {})
+    # Nothing is handed over on the caller's thread
+    assert delivered == []
+    sink.close()
+    assert delivered == list(range(10))
+
+
+def test_batching_sink_flushes_full_batches():
+    flushed = threading.Event()
+    delivered = []
+
+    def target(source, key, decoded):
+        delivered.append(key)
+        if len(delivered) == 4:
+            flushed.set()
+
+    sink = BatchingSink(target, interval=10.0, max_batch=4)
+    for key in range(4):
+        sink("Kubota Engine", key, {})
+    assert flushed.wait(2.0)
+    sink.close()
+
+
+def test_batching_sink_survives_a_failing_target(caplog):
+    delivered = []
+
+    def target(source, key, decoded):
+        if key == 1:
+            raise RuntimeError("disk full")
+        delivered.append(key)
+
+    sink = BatchingSink(target, interval=0.01)
+    with caplog.at_level(logging.ERROR, logger="utils.sinks"):
+        for key in range(3):
+            sink("Kubota Engine", key, {})
+        for _ in range(200):
+            if len(delivered) == 2:
+                break
+            threading.Event().wait(0.01)
+        assert sink._thread.is_alive()
+        sink("Kubota Engine", 3, {})
+        sink.close()
+    assert delivered == [0, 2, 3]
+    assert sink.errors == 1
+    assert "disk full" in caplog.text
+
+
+def test_batching_sink_bounds_its_queue():
+    delivered = []
+    sink = BatchingSink(
+        lambda source, key, decoded: delivered.append(key), interval=10.0, max_queue=4
+    )
+    sink._running = False  # keep the background thread from draining while the queue fills
+    sink._wakeup.set()
+    sink._thread.join()
+    for key in range(10):
+        sink("Kubota Engine", key, {})
+    sink.close()
+    assert delivered == [6, 7, 8, 9]
+    assert sink.dropped == 6
+
+
+def test_kubota_on_message_uses_the_sink():
+    sink = MemorySink()
+    with patch("j1939.ControllerApplication.__init__", return_value=None):
+        kubota = Kubota_D902k_CA("KubotaD902K", sink=sink)
+    with patch("builtins.print") as mock_print:
+        kubota.on_message(65262, bytes([120]) + bytes(7))
+        kubota.on_message(61444, bytes(2))
+        kubota.on_message(12345, bytes(8))
+        mock_print.assert_not_called()
+    assert sink.latest[("KubotaD902K", 65262)]["Engine Coolant Temp (°C)"] == 80
+    assert "error" in sink.latest[("KubotaD902K", 61444)]
+    assert len(sink.latest) == 2
@@ -0,0 +1,134 @@
+import pytest
+from unittest.mock import patch
+import socket
+import time
+import sys
+import os
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import socketcan_bulk
+from utils.metrics import MetricsRegistry
+from utils.socketcan_bulk import (
+    BulkCanReceiver,
+    CAN_EFF_FLAG,
+    CAN_ERR_FLAG,
+    CAN_ERR_MASK,
+    CAN_FRAME,
+    CAN_RAW_ERR_FILTER,
+    SOL_CAN_RAW,
+    enable_error_frames,
+)
+
+
+def _vcan0_available():
+    try:
+        with socket.socket(socket.AF_CAN, socket.SOCK_RAW, socket.CAN_RAW) as sock:
+            sock.bind(("vcan0",))
+        return True
+    except (AttributeError, OSError):
+        return False
+
+
+@pytest.fixture
+def udp_pair():
+    """Loopback UDP sockets standing in for a raw CAN socket.
+
+    Both are datagram sockets that support SO_TIMESTAMP, which is all the receiver relies on.
+    """
+    rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    rx.bind(("127.0.0.1", 0))
+    tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    tx.connect(rx.getsockname())
+    yield rx, tx
+    tx.close()
+    rx.close()
+
+
+def _send_frames(tx, count):
+    for i in range(count):
+        tx.send(CAN_FRAME.pack(0x18FF01F4 | CAN_EFF_FLAG, 8, bytes([i] * 8)))
+    tx.send(CAN_FRAME.pack(0x521, 6, bytes([0, 0x12, 0, 0, 3, 0xE8, 0, 0])))
+
+
+@pytest.mark.parametrize("use_recvmmsg", [True, False])
+def test_recv_batch_drains_up_to_max_frames(udp_pair, use_recvmmsg):
+    """One recv_batch call drains at most max_frames frames, the next call gets the rest."""
+    rx, tx = udp_pair
+    recvmmsg = socketcan_bulk._recvmmsg if use_recvmmsg else None
+    if use_recvmmsg and recvmmsg is None:
+        pytest.skip("libc has no recvmmsg")
+    with patch.object(socketcan_bulk, "_recvmmsg", recvmmsg):
+        receiver = BulkCanReceiver(max_frames=4, sock=rx)
+        before = time.time()
+        _send_frames(tx, 5)
+
+        assert receiver.recv_batch(timeout=1.0) == 4
+        frames = list(receiver.frames(4))
+        assert [bytes(data) for _, _, _, data in frames] == [bytes([i] * 8) for i in range(4)]
+        for timestamp, arbitration_id, is_extended_id, _ in frames:
+            assert arbitration_id == 0x18FF01F4
+            assert is_extended_id
+            assert before - 1.0 <= timestamp <= time.time() + 1.0
+
+        assert receiver.recv_batch(timeout=1.0) == 2
+        timestamp, arbitration_id, is_extended_id, data = receiver.frame(1)
+        assert arbitration_id == 0x521
+        assert not is_extended_id
+        assert bytes(data) == bytes([0, 0x12, 0, 0, 3, 0xE8])
+
+
+def test_recv_batch_timeout(udp_pair):
+    """No traffic within the timeout returns 0 frames."""
+    rx, _ = udp_pair
+    receiver = BulkCanReceiver(max_frames=4, sock=rx)
+    assert receiver.recv_batch(timeout=0.01) == 0
+
+
+def test_error_frames_are_counted_not_yielded(udp_pair):
+    """Error frames go to on_error_frame (here the bus error counter) instead of the decoders."""
+    rx, tx = udp_pair
+    errors = MetricsRegistry().counter("can_bus_error_frames_total", "CAN error frames received")
+    receiver = BulkCanReceiver(max_frames=4, sock=rx)
+    tx.send(CAN_FRAME.pack(CAN_ERR_FLAG | 0x40, 8, bytes(8)))  # CAN_ERR_BUSOFF
+    tx.send(CAN_FRAME.pack(0x18FF01F4 | CAN_EFF_FLAG, 8, bytes(8)))
+
+    count = receiver.recv_batch(timeout=1.0)
+    classes = []
+
+    def on_error_frame(timestamp, error_class, data):
+        classes.append(error_class)
+        errors.inc()
+
+    frames = list(receiver.frames(count, on_error_frame))
+    assert [arbitration_id for _, arbitration_id, _, _ in frames] == [0x18FF01F4]
+    assert classes == [0x40]
+    assert errors.value() == 1
+
+
+def test_enable_error_frames_sets_error_filter():
+    class Socket:
+        def setsockopt(self, *args):
+            self.args = args
+
+    sock = Socket()
+    enable_error_frames(sock)
+    assert sock.args == (SOL_CAN_RAW, CAN_RAW_ERR_FILTER, CAN_ERR_MASK.to_bytes(4, sys.byteorder))
+
+
+@pytest.mark.skipif(not _vcan0_available(), reason="vcan0 is not available")
+def test_recv_batch_vcan0():
+    """End to end on a real vcan0 interface."""
+    import can
+
+    with BulkCanReceiver("vcan0", max_frames=16) as receiver, can.Bus(
+        channel="vcan0", interface="socketcan"
+    ) as bus:
+        for i in range(10):
+            bus.send(can.Message(arbitration_id=0x18FF01F4, data=bytes([i] * 8)))
+        received = 0
+        while received < 10:
+            count = receiver.recv_batch(timeout=1.0)
+            assert count
+            received += count
+        assert receiver.frame(0)[1] == 0x18FF01F4
@@ -0,0 +1,138 @@
+import time
+import sys
+import os
+
+import can
+import pytest
+from unittest.mock import Mock
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_applications.ivt_can_controller import IVTSensor
+from utils.can_dispatch import DispatchTable
+from utils.traffic_generator import (
+    LatencyProbe,
+    Stream,
+    TrafficGenerator,
+    default_mix,
+    latency_percentiles,
+    run,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def buses():
+    tx = can.interface.Bus(channel="traffic_test", interface="virtual")
+    rx = can.interface.Bus(channel="traffic_test", interface="virtual")
+    yield tx, rx
+    tx.shutdown()
+    rx.shutdown()
+
+
+def test_default_mix_frames_decode():
+    probe = LatencyProbe()
+
+    for stream in default_mix():
+        data = stream.encode()
+        assert 1 <= len(data) <= 8
+        route = probe.dispatch.lookup(stream.arbitration_id)
+        if stream.name.startswith(("ivt.", "bms.")):
+            assert route is not None, stream.name
+            route.decoder(data)
+
+
+def test_ivt_counter_runs():
+    stream = next(stream for stream in default_mix() if stream.name == "ivt.current")
+
+    counters = [IVTSensor.RESULT_FORMAT.unpack(stream.encode())[1] & 0x0F for _ in range(17)]
+
+    assert counters[:3] == [1, 2, 3]
+    assert counters[15:] == [0, 1]
+
+
+def test_bursts():
+    class Recorder:
+        def __init__(self):
+            self.frames = []
+
+        def send(self, msg):
+            self.frames.append(bytes(msg.data))
+
+    bus = Recorder()
+    stream = Stream("test", 0x123, 0.01, lambda: b"\x01", burst=3, burst_every=2)
+    generator = TrafficGenerator(bus, [stream], scheduler=object())
+    send_cycle = generator._stream_callback(stream)
+
+    for _ in range(4):
+        send_cycle(None)
+
+    assert len(bus.frames) == 3 + 1 + 3 + 1
+    assert generator.sent == 8
+    assert generator.frames_per_second() == pytest.approx(200)
+
+
+def test_probe_matches_send_times_per_id():
+    clock = FakeClock()
+    probe = LatencyProbe(clock=clock)
+    frame = can.Message(
+        arbitration_id=IVTSensor.BASE_ID,
+        data=IVTSensor.RESULT_FORMAT.pack(0, 1, 1000),
+        is_extended_id=False,
+    )
+
+    probe.sent(frame.arbitration_id)
+    clock.now = 0.001
+    probe.sent(frame.arbitration_id)
+    clock.now = 0.003
+    probe.on_message_received(frame)
+    probe.on_message_received(frame)
+    probe.on_message_received(frame)
+
+    assert list(probe.receive_latency) == pytest.approx([0.003, 0.002])
+    assert probe.decoded == 2
+    assert probe.unmatched == 1
+    assert probe.outstanding == 0
+
+
+def test_probe_counts_any_decoder_exception():
+    dispatch = DispatchTable()
+    dispatch.add_id(0x123, Mock(side_effect=RuntimeError("decoder bug")), "Test")
+    probe = LatencyProbe(dispatch, clock=FakeClock())
+    frame = can.Message(arbitration_id=0x123, data=bytes(8), is_extended_id=False)
+
+    probe.sent(frame.arbitration_id)
+    probe.on_message_received(frame)
+
+    assert probe.decode_errors == 1
+    assert probe.decoded == 0
+
+
+def test_latency_percentiles():
+    report = latency_percentiles([i / 1e6 for i in range(1, 101)])
+
+    assert report["count"] == 100
+    assert report["p50"] == pytest.approx(50.5)
+    assert report["max"] == pytest.approx(100)
+    assert latency_percentiles([]) == {"count": 0}
+
+
+def test_run_on_virtual_bus(buses):
+    tx, rx = buses
+    streams = [stream for stream in default_mix() if stream.name.startswith("ivt.")]
+
+    report = run(tx, rx, streams, duration=0.2, speedup=4)
+
+    assert report["sent"] > 0
+    assert report["received"] == report["sent"]
+    assert report["decoded"] == report["sent"]
+    assert report["outstanding"] == 0
+    assert report["decode_latency_us"]["count"] == report["decoded"]
+    assert set(report["scheduler"]) == {0.005, 0.015}
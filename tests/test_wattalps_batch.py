@@ -0,0 +1,84 @@
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_applications.wattalps.batch import decode_batch
+from controller_applications.wattalps.messages import generated, msg_info, msg_sp_detail
+
+
+@pytest.fixture
+def recording():
+    """Random INFO (7 bytes), INFO_CELLS (6 bytes) and SP_DETAIL_2S (8 bytes) frames, interleaved."""
+    rng = np.random.default_rng(0)
+    message_ids = np.array(
+        [
+            generated.MESSAGE_ID_BMS_VMU_INFO,
+            generated.MESSAGE_ID_BMS_VMU_INFO_CELLS,
+            generated.MESSAGE_ID_BMS_VMU_SP_DETAIL_2S,
+        ],
+        dtype=np.uint64,
+    )
+    lengths = np.array([7, 6, 8])
+    choice = rng.integers(0, 3, 500)
+    payloads = rng.integers(0, 256, (500, 8), dtype=np.uint8)
+    # Zero the padding of short frames, as a logger would
+    payloads[np.arange(8) >= lengths[choice][:, None]] = 0
+    return message_ids[choice], payloads, lengths[choice]
+
+
+def test_matches_scalar_decoders(recording):
+    """Columns agree with decode_info/decode_info_cells/decode_sp_detail_2s frame by frame."""
+    ids, payloads, lengths = recording
+    columns = decode_batch(ids, payloads)
+    assert set(columns) == {
+        generated.MESSAGE_ID_BMS_VMU_INFO,
+        generated.MESSAGE_ID_BMS_VMU_INFO_CELLS,
+        generated.MESSAGE_ID_BMS_VMU_SP_DETAIL_2S,
+    }
+
+    info = columns[generated.MESSAGE_ID_BMS_VMU_INFO]
+    for i, row in enumerate(info["index"]):
+        expected = msg_info.decode_info(bytes(payloads[row, : lengths[row]]))
+        assert info["current"][i] == pytest.approx(expected.current)
+        assert info["upstream_voltage"][i] == pytest.approx(expected.upstream_voltage)
+        assert info["downstream_voltage"][i] == pytest.approx(expected.downstream_voltage)
+        assert info["soh"][i] == expected.soh
+
+    cells = columns[generated.MESSAGE_ID_BMS_VMU_INFO_CELLS]
+    for i, row in enumerate(cells["index"]):
+        expected = msg_info.decode_info_cells(bytes(payloads[row, : lengths[row]]))
+        assert cells["minimum_cell_voltage"][i] == expected.minimum_cell_voltage
+        assert cells["maximum_cell_voltage"][i] == expected.maximum_cell_voltage
+
+    detail = columns[generated.MESSAGE_ID_BMS_VMU_SP_DETAIL_2S]
+    for i, row in enumerate(detail["index"]):
+        expected = msg_sp_detail.decode_sp_detail_2s(bytes(payloads[row]))
+        assert detail["charge_measured_current_2s"][i] == pytest.approx(
+            expected.charge_measured_current_2s
+        )
+        assert detail["discharge_alert_threshold_2s"][i] == pytest.approx(
+            expected.discharge_alert_threshold_2s
+        )
+
+
+def test_ids_without_extended_flag(recording):
+    """IDs straight off the bus (no CAN_EFF_FLAG) select the same rows."""
+    ids, payloads, _ = recording
+    with_flag = decode_batch(ids, payloads)
+    without_flag = decode_batch(ids & np.uint64(0x1FFFFFFF), payloads)
+    for message_id, columns in with_flag.items():
+        np.testing.assert_array_equal(columns["index"], without_flag[message_id]["index"])
+
+
+def test_selected_messages_and_shape_check(recording):
+    ids, payloads, _ = recording
+    columns = decode_batch(ids, payloads, [generated.MESSAGE_ID_BMS_VMU_INFO])
+    assert list(columns) == [generated.MESSAGE_ID_BMS_VMU_INFO]
+    assert columns[generated.MESSAGE_ID_BMS_VMU_INFO]["current"].dtype == np.float64
+
+    with pytest.raises(ValueError):
+        decode_batch(ids, payloads[:, :7])
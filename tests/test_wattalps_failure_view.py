@@ -0,0 +1,55 @@
+import dataclasses
+import random
+import sys
+import os
+from collections.abc import Mapping
+
+import pytest
+
+# Append the root dir of the library suite... There has to be a better way to do this.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_applications.wattalps.messages.msg_warnings import (
+    BmsVmuFailureView,
+    decode_bms_vmu_failure,
+    decode_bms_vmu_failure_view,
+    encode_bms_vmu_failure,
+)
+
+
+def test_view_matches_eager_decoder():
+    rng = random.Random(7)
+    for _ in range(50):
+        data = bytes(rng.randrange(256) for _ in range(8))
+
+        view = decode_bms_vmu_failure_view(data)
+
+        assert view.to_dataclass() == decode_bms_vmu_failure(data)
+        assert encode_bms_vmu_failure(view) == data
+
+
+def test_fields_decoded_on_first_access():
+    data = (1 << 53).to_bytes(8, "big")  # Safety_Hvil
+
+    view = BmsVmuFailureView(data)
+    assert "safety_hvil" not in vars(view)
+
+    assert view.safety_hvil is True
+    assert view.safety_generic is False
+    assert {"safety_hvil", "safety_generic"} <= set(vars(view))
+    assert "charger" not in vars(view)
+
+
+def test_wrong_length():
+    with pytest.raises(ValueError):
+        BmsVmuFailureView(bytes(7))
+
+
+def test_view_is_a_mapping_of_the_fields():
+    data = (1 << 53).to_bytes(8, "big")  # Safety_Hvil
+
+    view = decode_bms_vmu_failure_view(data)
+
+    assert isinstance(view, Mapping)
+    assert view["safety_hvil"] is True
+    assert "error" not in view
+    assert dict(view) == dataclasses.asdict(view.to_dataclass())
@@ -0,0 +1,89 @@
+"""
+asyncio receive stack: one task per bus decodes every frame and feeds the async controllers.
+
+python-can's ``Notifier(loop=...)`` hands frames to an ``AsyncBufferedReader`` on the event loop, and
+``run()`` routes them through the same ``DispatchTable`` as ``main.py``. IVT command responses resolve
+the awaiting ``AsyncIVTSensor.command`` futures; everything else is decoded and passed to
+``listener(source, key, decoded)``. Several stacks (one per bus, e.g. two IVT sensors on can0/can1)
+run side by side on one loop with ``asyncio.gather``.
+
+Usage:
+    async def main():
+        stack = AsyncCanStack(can.interface.Bus(channel="can0", bustype="socketcan"))
+        ivt = stack.add_ivt(IVTSensor("IVT", bus=stack.bus))
+        stack.add_j1939_ca(Kubota_D902k_CA("KubotaD902K"), "Kubota Engine")
+        task = asyncio.create_task(stack.run())
+        await ivt.start_sensor()
+        ...
+        stack.stop()
+        await task
+"""
+
+import asyncio
+from collections.abc import Mapping
+
+import can
+
+from controller_applications.ivt_can_controller import AsyncIVTSensor
+from utils.can_dispatch import DispatchTable
+
+
+class AsyncCanStack:
+    def __init__(self, bus, listener=None, loop=None):
+        """
+        :param bus: python-can bus to read from (and that the controllers send on)
+        :param listener: optional ``listener(source, key, decoded)`` called for every decoded frame
+        :param loop: event loop to deliver frames to (default: the running loop)
+        """
+        self.bus = bus
+        self.listener = listener
+        self.loop = loop
+        self.dispatch = DispatchTable()
+        self.latest = {}
+        self.decode_errors = 0  # frames whose decoder raised
+        self._reader = can.AsyncBufferedReader()
+
+    def add_ivt(self, sensor, source="IVT Sensor", timeout=1.0):
+        """Route an IVTSensor's result and response IDs and return its async front end."""
+        async_sensor = AsyncIVTSensor(sensor, timeout=timeout)
+        for arbitration_id in sensor.RESULT_IDS:
+            self.dispatch.add_id(arbitration_id, sensor._decode_mux, source)
+        self.dispatch.add_id(sensor.RESP_ID, async_sensor.on_response, source)
+        return async_sensor
+
+    def add_j1939_ca(self, ca, source):
+        self.dispatch.add_j1939_ca(ca, source)
+
+    async def run(self):
+        """Decode frames until ``stop()`` is called."""
+        notifier = can.Notifier(
+            self.bus, [self._reader], loop=self.loop or asyncio.get_running_loop()
+        )
+        try:
+            while True:
+                msg = await self._reader.get_message()
+                if msg is None:
+                    break
+                self.handle(msg)
+        finally:
+            notifier.stop()
+
+    def handle(self, msg):
+        route = self.dispatch.lookup(msg.arbitration_id, msg.is_extended_id)
+        if route is None:
+            return
+        try:
+            decoded = route.decoder(msg.data)
+        except Exception:
+            # A malformed frame (e.g. too short) must not end run() for the whole bus
+            self.decode_errors += 1
+            return
+        if isinstance(decoded, Mapping):
+            self.latest[(route.source, route.key)] = decoded
+            if self.listener is not None:
+                self.listener(route.source, route.key, decoded)
+
+    def stop(self):
+        """Make ``run()`` return once the frames already received are handled."""
+        # AsyncBufferedReader has no close, a None in its queue ends the loop in run()
+        self._reader.buffer.put_nowait(None)
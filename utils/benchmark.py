@@ -0,0 +1,265 @@
+"""
+Micro-benchmarks for every decoder and encoder in the project.
+
+Covers the ``decode_*``/``encode_*`` methods of ``Kubota_D902k_CA`` and ``ISO175_CA``, the IVT result
+decoders, every ``decode_*``/``encode_*`` pair of the hand-written wattalps ``msg_*.py`` modules and
+the generated wattalps codecs. Each case is timed with ``timeit`` (best of ``repeat`` runs, so the
+number is the cost without scheduler noise) and reported as ns/frame. Allocations are measured in a
+separate, untimed pass under ``tracemalloc``: ``alloc_bytes_per_frame`` is the peak memory a call
+allocates above what was in use before it, so the temporaries it frees again (per-frame dicts,
+copies of the payload) are counted as well as the result it returns. Objects taken from CPython's
+free lists (small tuples, floats) cost no allocation and don't show up.
+
+Sample payloads are found by probing: a fixed byte pattern, then zeros, at the length the message
+class declares (``NUM_BYTES``) or else 8 down to 1 bytes. Cases whose function raises (or returns
+False) for every probe (e.g. decoders that are not implemented yet) are skipped and listed.
+
+Usage:
+    python -m utils.benchmark --save baseline.json            # on the Pi, before a change
+    python -m utils.benchmark --compare baseline.json         # after it, exits 1 on regressions
+    python -m utils.benchmark -k wattalps --threshold 0.2
+"""
+
+import argparse
+import importlib
+import inspect
+import json
+import pkgutil
+import platform
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, NamedTuple
+
+from controller_applications.bender_ISO175_j1939 import ISO175_CA
+from controller_applications.ca_kubota_engine import Kubota_D902k_CA
+from controller_applications.ivt_can_controller import IVTSensor
+from controller_applications.wattalps import messages as wattalps_messages
+from controller_applications.wattalps.messages import generated, msg_warnings
+
+PATTERN = bytes([0x10, 0x20, 0x30, 0x40, 0x50, 0x60, 0x70, 0x80])
+
+
+class Case(NamedTuple):
+    name: str
+    func: Callable
+    args: tuple
+
+
+def _probe(func, lengths):
+    """First payload ``func`` accepts, as the call arguments (None if it rejects them all).
+
+    Besides raising, a decoder rejects a payload by returning False (the ISO175 decoders).
+    """
+    for length in lengths:
+        for payload in (PATTERN[:length], bytes(length)):
+            try:
+                if func(payload) is False:
+                    continue
+            except Exception:
+                continue
+            return (payload,)
+    return None
+
+
+def _lengths(func):
+    declared = getattr(inspect.signature(func).return_annotation, "NUM_BYTES", None)
+    return [declared] if declared else list(range(8, 0, -1))
+
+
+def _read_attribute(decoder, name):
+    def decode_and_read(data):
+        return getattr(decoder(data), name)
+
+    return decode_and_read
+
+
+def _read_key(decoder, key):
+    def decode_and_read(data):
+        return decoder(data)[key]
+
+    return decode_and_read
+
+
+def collect_cases():
+    """All benchmark cases, and the names of the ones skipped because no payload decodes."""
+    cases = []
+    skipped = []
+
+    def add(name, func, args):
+        if args is None:
+            skipped.append(name)
+        else:
+            cases.append(Case(name, func, args))
+
+    kubota = Kubota_D902k_CA("Benchmark")
+    for pgn in sorted(kubota.decoders):
+        decoder = kubota.decoders[pgn]
+        add(f"kubota.decode_{pgn}", decoder, _probe(decoder, [8]))
+        record_decoder = kubota.record_decoders[pgn]
+        add(f"kubota.decode_{pgn}_record", record_decoder, _probe(record_decoder, [8]))
+    for pgn in (65360, 65361):
+        decoder = getattr(kubota, f"decode_{pgn}")
+        add(f"kubota.decode_{pgn}", decoder, _probe(decoder, [8]))
+    add("kubota.encode_65363", kubota.encode_65363, ())
+    add("kubota.encode_65265", kubota.encode_65265, ())
+    add("kubota.payload_65363_cached", kubota.payload, (65363,))
+
+    iso175 = ISO175_CA("Benchmark")
+    for pgn in sorted(iso175.decoders):
+        decoder = iso175.decoders[pgn]
+        add(f"iso175.decode_pgn_{pgn}", decoder, _probe(decoder, [8]))
+    # The eager decoder the lazy view replaced in decoders, and the view reading the one value a
+    # check needs
+    eager = iso175.decode_pgn_65281
+    add("iso175.decode_pgn_65281_eager", eager, _probe(eager, [8]))
+    general_info = bytes([0xE8, 0x03, 0xFE, 0x2A, 0x00, 0x00, 0x01, 0x00])
+    read_alarms = _read_key(iso175.decode_pgn_65281_view, "alarms")
+    add("iso175.decode_pgn_65281_view.alarms", read_alarms, (general_info,))
+
+    ivt = IVTSensor("Benchmark", connect=False)
+    result_frame = bytes([0x00, 0x12, 0x00, 0x00, 0x03, 0xE8])
+    add("ivt._decode_mux", ivt._decode_mux, (result_frame,))
+    add("ivt._store", ivt._store, (result_frame,))
+    streaming = IVTSensor("Benchmark", connect=False)
+    streaming.enable_streaming()
+    add("ivt.stream_frame", streaming.stream_frame, (0.0, result_frame))
+
+    for module_info in pkgutil.iter_modules(wattalps_messages.__path__):
+        if not module_info.name.startswith("msg_"):
+            continue
+        module = importlib.import_module(f"{wattalps_messages.__name__}.{module_info.name}")
+        prefix = f"wattalps.{module_info.name}"
+        for name, decoder in sorted(vars(module).items()):
+            if not name.startswith("decode_") or not callable(decoder):
+                continue
+            args = _probe(decoder, _lengths(decoder))
+            add(f"{prefix}.{name}", decoder, args)
+            encoder = getattr(module, "encode_" + name[len("decode_") :], None)
+            if encoder is not None:
+                encoded_name = f"{prefix}.encode_{name[len('decode_'):]}"
+                add(encoded_name, encoder, args and (decoder(*args),))
+
+    failure = bytes(msg_warnings.BmsVmuFailure.NUM_BYTES)
+    read_hvil = _read_attribute(msg_warnings.decode_bms_vmu_failure_view, "safety_hvil")
+    add("wattalps.msg_warnings.decode_bms_vmu_failure_view.safety_hvil", read_hvil, (failure,))
+
+    for message_id, decoder in generated.DECODERS.items():
+        name = decoder.__name__[len("decode_") :]
+        args = _probe(decoder, _lengths(decoder))
+        add(f"wattalps.generated.decode_{name}", decoder, args)
+        encoder = generated.ENCODERS[message_id]
+        add(f"wattalps.generated.encode_{name}", encoder, args and (decoder(*args),))
+    return cases, skipped
+
+
+def allocated_bytes(func, args, calls=1000):
+    """Mean peak bytes one call allocates, temporaries included (traced, so not for timing)."""
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(calls):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - before
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return total / calls
+
+
+def measure(case, number=None, repeat=5):
+    """{"ns_per_frame", "alloc_bytes_per_frame"} for one case."""
+    timer = timeit.Timer("func(*args)", globals={"func": case.func, "args": case.args})
+    if number is None:
+        number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+
+    return {
+        "ns_per_frame": best / number * 1e9,
+        "alloc_bytes_per_frame": allocated_bytes(case.func, case.args, min(number, 1000)),
+    }
+
+
+def run(cases, number=None, repeat=5, pattern=None):
+    results = {}
+    for case in cases:
+        if pattern and pattern not in case.name:
+            continue
+        results[case.name] = measure(case, number, repeat)
+    return results
+
+
+def compare(results, baseline, threshold=0.10):
+    """Cases at least ``threshold`` (fraction) slower than in ``baseline``, as (name, old, new)."""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        if result["ns_per_frame"] > old["ns_per_frame"] * (1 + threshold):
+            regressions.append((name, old["ns_per_frame"], result["ns_per_frame"]))
+    return regressions
+
+
+def save(path, results):
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": results,
+            },
+            f,
+            indent=2,
+            sort_keys=True,
+        )
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the CAN decoders and encoders")
+    parser.add_argument("-k", dest="pattern", help="only run cases whose name contains this")
+    parser.add_argument("--number", type=int, default=None, help="calls per timing run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="baseline to flag regressions against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown that counts")
+    args = parser.parse_args(argv)
+
+    cases, skipped = collect_cases()
+    results = run(cases, args.number, args.repeat, args.pattern)
+    baseline = load(args.compare) if args.compare else {}
+
+    for name, result in results.items():
+        line = (
+            f"{name:<60} {result['ns_per_frame']:>10.0f} ns"
+            f" {result['alloc_bytes_per_frame']:>8.1f} B alloc"
+        )
+        if name in baseline:
+            change = result["ns_per_frame"] / baseline[name]["ns_per_frame"] - 1
+            line += f"  {change:+.0%}"
+        print(line)
+    for name in skipped:
+        print(f"{name:<60}    skipped (no payload decodes)")
+
+    if args.save:
+        save(args.save, results)
+    if args.compare:
+        regressions = compare(results, baseline, args.threshold)
+        for name, old, new in regressions:
+            print(f"REGRESSION {name}: {old:.0f} ns -> {new:.0f} ns")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
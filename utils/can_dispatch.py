@@ -0,0 +1,106 @@
+"""
+Arbitration-ID routing table for the listener loops.
+
+Every controller application registers the IDs (IVT) or PGNs (J1939 CAs) it can decode once at
+startup. Resolving a frame is then a single dict lookup on the raw arbitration ID instead of a chain
+of ``hasattr``/``in .keys()`` checks per frame.
+
+J1939 PGNs cannot be expanded into raw IDs up front because the priority and source address are only
+known once a frame turns up, so the first frame of every new 29-bit arbitration ID resolves its PGN
+and the result (hit or miss) is cached, up to ``max_routes`` cached IDs. 11-bit IDs only ever match an
+exact ``add_id`` route, so unknown ones are not cached at all.
+
+An 11-bit and a 29-bit frame with the same ID value are different frames. Routes are keyed like
+socketcan does it, with ``CAN_EFF_FLAG`` set on 29-bit IDs, so they never share a route. Callers
+that don't know the frame type pass ``is_extended_id=None``: IDs above 0x7FF are taken as 29-bit.
+"""
+
+from typing import Callable, NamedTuple, Optional
+
+from utils.j1939_can_utils import can_id_to_pgn
+
+# Largest 11-bit identifier. Without an explicit frame type, anything above this is a 29-bit ID.
+MAX_STANDARD_ID = 0x7FF
+CAN_EFF_FLAG = 0x80000000
+
+
+def route_key(arbitration_id: int, is_extended_id: Optional[bool] = None) -> int:
+    """Routing table key: the ID, with ``CAN_EFF_FLAG`` set for 29-bit frames."""
+    if is_extended_id is None:
+        is_extended_id = arbitration_id > MAX_STANDARD_ID
+    return arbitration_id | CAN_EFF_FLAG if is_extended_id else arbitration_id
+
+
+class Route(NamedTuple):
+    """Where a frame goes: the CA that owns it, the PGN/ID it was matched on and the decoder."""
+
+    source: str
+    key: int
+    decoder: Callable
+
+
+class DispatchTable:
+    def __init__(self, max_routes=4096):
+        """
+        :param max_routes: cached IDs (exact registrations included) after which new 29-bit IDs are
+            resolved on every frame instead of cached, so a bus full of unknown IDs can't grow the
+            cache without bound
+        """
+        self.max_routes = max_routes
+        self._id_routes: dict[int, Route] = {}
+        self._pgn_routes: dict[int, Route] = {}
+        # route_key() -> route (or None for IDs nobody decodes). This is the only dict touched per
+        # frame.
+        self._routes: dict[int, Optional[Route]] = {}
+
+    def add_id(
+        self,
+        arbitration_id: int,
+        decoder: Callable,
+        source: str,
+        is_extended_id: Optional[bool] = None,
+    ):
+        """Route an exact arbitration ID (11- or 29-bit, see ``route_key``) to ``decoder``."""
+        route = Route(source, arbitration_id, decoder)
+        key = route_key(arbitration_id, is_extended_id)
+        self._id_routes[key] = route
+        self._routes[key] = route
+
+    def add_pgn(self, pgn: int, decoder: Callable, source: str):
+        """Route every 29-bit frame carrying ``pgn`` to ``decoder``, whatever its priority/SA."""
+        self._pgn_routes[pgn] = Route(source, pgn, decoder)
+        # Drop cached PGN resolutions so IDs seen before this registration are re-resolved.
+        self._routes = dict(self._id_routes)
+
+    def add_j1939_ca(self, ca, source: str):
+        """Register every entry of a J1939 CA's ``decoders`` dict."""
+        for pgn, decoder in ca.decoders.items():
+            self.add_pgn(pgn, decoder, source)
+
+    def lookup(
+        self, arbitration_id: int, is_extended_id: Optional[bool] = None
+    ) -> Optional[Route]:
+        """Return the route for ``arbitration_id`` or None if nothing decodes it."""
+        if is_extended_id or (is_extended_id is None and arbitration_id > MAX_STANDARD_ID):
+            key = arbitration_id | CAN_EFF_FLAG
+        else:
+            key = arbitration_id
+        try:
+            return self._routes[key]
+        except KeyError:
+            if key == arbitration_id:
+                return None  # 11-bit and not registered
+            route = self._resolve(arbitration_id)
+            if len(self._routes) < self.max_routes:
+                self._routes[key] = route
+            return route
+
+    def _resolve(self, arbitration_id: int) -> Optional[Route]:
+        try:
+            pgn = can_id_to_pgn(arbitration_id)
+        except ValueError:
+            return None
+        return self._pgn_routes.get(pgn)
+
+    def __len__(self):
+        return len(self._routes)
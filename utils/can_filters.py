@@ -0,0 +1,54 @@
+"""
+Kernel-side CAN ID filtering built from the controllers that are actually in use.
+
+Each controller application publishes the IDs it decodes through ``can_filters()`` (python-can
+filter dicts). The helpers here merge those lists so they can be installed on a socketcan bus (or
+passed to ``BulkCanReceiver(can_filters=...)``), and frames nobody decodes are dropped by the kernel
+without costing any user space CPU.
+
+Note that an empty filter list means "receive everything" to both python-can and the kernel.
+"""
+
+import can
+
+
+def j1939_pgn_filters(pgns):
+    """python-can filters matching 29-bit frames carrying any of ``pgns``, from any source address."""
+    filters = []
+    for pgn in pgns:
+        # PDU1 PGNs carry the destination address in PS, so leave those bits out of the mask
+        mask = 0x3FFFF00 if (pgn >> 8) & 0xFF >= 0xF0 else 0x3FF0000
+        filters.append({"can_id": pgn << 8, "can_mask": mask, "extended": True})
+    return filters
+
+
+def merge_can_filters(*controllers):
+    """Merge the ``can_filters()`` of several controllers, dropping duplicates.
+
+    Controllers that are None (failed to load) are skipped.
+    """
+    merged = []
+    seen = set()
+    for controller in controllers:
+        if controller is None:
+            continue
+        for can_filter in controller.can_filters():
+            key = (
+                can_filter["can_id"] & can_filter["can_mask"],
+                can_filter["can_mask"],
+                can_filter.get("extended"),
+            )
+            if key not in seen:
+                seen.add(key)
+                merged.append(can_filter)
+    return merged
+
+
+def open_filtered_bus(*controllers, channel="can0", bustype="socketcan", **kwargs):
+    """Open a python-can bus that only receives what ``controllers`` can decode."""
+    return can.interface.Bus(
+        channel=channel,
+        bustype=bustype,
+        can_filters=merge_can_filters(*controllers),
+        **kwargs,
+    )
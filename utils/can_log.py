@@ -0,0 +1,218 @@
+"""
+Append-only binary CAN log with memory-mapped random access.
+
+File layout (little-endian):
+    header   16 bytes   magic b"CANLOG01", version (u16), record size (u16), 4 bytes padding
+    records  24 bytes   timestamp (f64), arbitration ID (u32), DLC (u8), flags (u8), 2 bytes padding,
+                        data (8 bytes, zero-padded)
+
+Every ``index_interval`` records the writer also appends ``(record number, timestamp)`` to a sidecar
+``<log>.idx`` file. The reader maps the log with ``np.memmap``, so opening a multi-GB drive log costs
+nothing up front: ``time_range`` finds its bounds through the index (or a binary search over the
+timestamp column if there is no index) and returns a zero-copy slice of the mapped records.
+
+Records are expected in the order they were received, i.e. with non-decreasing timestamps.
+
+Usage:
+    with CanLogWriter("drive.canlog") as log:
+        log.write(msg.timestamp, msg.arbitration_id, msg.data, msg.is_extended_id)
+
+    reader = CanLogReader("drive.canlog")
+    for timestamp, arbitration_id, data in reader.iter_frames(reader.time_range(t0, t1)):
+        kubota.decode(can_id_to_pgn(arbitration_id), data)
+"""
+
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b"CANLOG01"
+VERSION = 1
+HEADER = struct.Struct("<8sHH4x")
+RECORD = struct.Struct("<dIBB2x8s")
+INDEX_ENTRY = struct.Struct("<Qd")
+
+FLAG_EXTENDED = 0x01
+FLAG_REMOTE = 0x02
+FLAG_ERROR = 0x04
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("timestamp", "<f8"),
+        ("arbitration_id", "<u4"),
+        ("dlc", "u1"),
+        ("flags", "u1"),
+        ("padding", "V2"),
+        ("data", "u1", (8,)),
+    ]
+)
+INDEX_DTYPE = np.dtype([("record", "<u8"), ("timestamp", "<f8")])
+
+assert RECORD_DTYPE.itemsize == RECORD.size
+
+
+def index_path(path):
+    return f"{path}.idx"
+
+
+class CanLogWriter:
+    """Append frames to a log, buffering ``buffer_records`` records between writes."""
+
+    def __init__(self, path, index_interval=4096, buffer_records=1024):
+        self.path = path
+        self.index_interval = index_interval
+        self._file = open(path, "ab")
+        self._index = open(index_path(path), "ab")
+        if self._file.tell() == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            self.record_count = 0
+        else:
+            self.record_count = (self._file.tell() - HEADER.size) // RECORD.size
+            # Drop a partial record left behind by a writer that was killed mid-write
+            self._file.truncate(HEADER.size + self.record_count * RECORD.size)
+
+        self._buffer = bytearray(buffer_records * RECORD.size)
+        self._buffer_records = buffer_records
+        self._buffered = 0
+
+    def write(
+        self,
+        timestamp,
+        arbitration_id,
+        data,
+        is_extended_id=True,
+        is_remote_frame=False,
+        is_error_frame=False,
+    ):
+        flags = (
+            (FLAG_EXTENDED if is_extended_id else 0)
+            | (FLAG_REMOTE if is_remote_frame else 0)
+            | (FLAG_ERROR if is_error_frame else 0)
+        )
+        RECORD.pack_into(
+            self._buffer,
+            self._buffered * RECORD.size,
+            timestamp,
+            arbitration_id,
+            len(data),
+            flags,
+            bytes(data),
+        )
+        if self.record_count % self.index_interval == 0:
+            self._index.write(INDEX_ENTRY.pack(self.record_count, timestamp))
+        self.record_count += 1
+        self._buffered += 1
+        if self._buffered == self._buffer_records:
+            self.flush()
+
+    def write_message(self, msg):
+        """Append a ``can.Message``."""
+        self.write(
+            msg.timestamp,
+            msg.arbitration_id,
+            msg.data,
+            msg.is_extended_id,
+            msg.is_remote_frame,
+            msg.is_error_frame,
+        )
+
+    def flush(self):
+        if self._buffered:
+            self._file.write(memoryview(self._buffer)[: self._buffered * RECORD.size])
+            self._buffered = 0
+        self._file.flush()
+        self._index.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CanLogReader:
+    """Memory-mapped view of a log written by ``CanLogWriter``."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, version, record_size = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or record_size != RECORD.size:
+            raise ValueError(f"{path} is not a CAN log (version {VERSION})")
+
+        # A partial record at the end (writer killed mid-write) is ignored
+        count = (os.path.getsize(path) - HEADER.size) // RECORD.size
+        if count:
+            self.records = np.memmap(
+                path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size, shape=(count,)
+            )
+        else:
+            self.records = np.empty(0, dtype=RECORD_DTYPE)
+
+        if os.path.exists(index_path(path)):
+            self.index = np.fromfile(index_path(path), dtype=INDEX_DTYPE)
+            self.index = self.index[self.index["record"] < count]
+        else:
+            self.index = np.empty(0, dtype=INDEX_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def timestamps(self):
+        return self.records["timestamp"]
+
+    @property
+    def arbitration_ids(self):
+        return self.records["arbitration_id"]
+
+    @property
+    def payloads(self):
+        """(N, 8) uint8 view of the data bytes, e.g. for ``wattalps.batch.decode_batch``."""
+        return self.records["data"]
+
+    def first_record_at(self, timestamp):
+        """Record number of the first record with a timestamp >= ``timestamp``."""
+        lo, hi = 0, len(self.records)
+        if len(self.index):
+            # Narrow the binary search down to the index block holding the timestamp, so only a
+            # few pages of the mapped file are touched
+            block = np.searchsorted(self.index["timestamp"], timestamp)
+            if block > 0:
+                lo = int(self.index["record"][block - 1])
+            if block < len(self.index):
+                hi = int(self.index["record"][block]) + 1
+        return lo + int(np.searchsorted(self.records["timestamp"][lo:hi], timestamp))
+
+    def time_range(self, start=None, end=None):
+        """Zero-copy slice of the records with ``start <= timestamp < end``."""
+        first = 0 if start is None else self.first_record_at(start)
+        last = len(self.records) if end is None else self.first_record_at(end)
+        return self.records[first : max(first, last)]
+
+    def by_id(self, arbitration_id, records=None):
+        """Records (a copy) carrying ``arbitration_id``, optionally within a ``time_range`` slice."""
+        records = self.records if records is None else records
+        return records[records["arbitration_id"] == arbitration_id]
+
+    @staticmethod
+    def iter_frames(records, block_size=65536):
+        """Yield (timestamp, arbitration_id, data) with ``data`` as bytes, ready for the decoders."""
+        # Convert a block of columns at a time; indexing the memmap row by row is far slower
+        for block_start in range(0, len(records), block_size):
+            block = np.asarray(records[block_start : block_start + block_size])
+            payloads = np.ascontiguousarray(block["data"]).tobytes()
+            offset = 0
+            for timestamp, arbitration_id, dlc in zip(
+                block["timestamp"].tolist(),
+                block["arbitration_id"].tolist(),
+                block["dlc"].tolist(),
+            ):
+                yield timestamp, arbitration_id, payloads[offset : offset + dlc]
+                offset += 8
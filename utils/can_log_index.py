@@ -0,0 +1,153 @@
+"""
+Per-PGN index over a recorded CAN log (see ``utils.can_log``).
+
+Finding "all PGN 65262 coolant temps between t0 and t1" in the raw log means scanning every record.
+``PgnIndex`` groups the record numbers of each PGN once, in time order, so a query is two binary
+searches inside that PGN's group plus a gather of the matching records: the cost follows the size of
+the result, not the size of the log.
+
+29-bit frames on J1939 data page 0 are keyed by their PGN (``can_id_to_pgn``), whatever their
+priority and source address. Everything else (11-bit IVT frames, other data pages) is keyed by its
+arbitration ID.
+
+Usage:
+    reader = CanLogReader("drive.canlog")
+    index = PgnIndex.open(reader)  # built once, then cached next to the log
+    timestamps, temps = index.decode(65262, kubota.decode_65262, t0, t1)
+"""
+
+import os
+
+import numpy as np
+
+from utils.can_dispatch import MAX_STANDARD_ID
+from utils.can_log import FLAG_EXTENDED
+from utils.j1939_can_utils import can_id_to_pgn
+
+# Keys at or above this are raw arbitration IDs rather than PGNs
+ID_KEY = 1 << 32
+
+
+def index_cache_path(path):
+    return f"{path}.pgn.npz"
+
+
+class PgnIndex:
+    def __init__(self, reader, keys, starts, records, timestamps):
+        """Use ``build`` or ``open`` rather than calling this directly."""
+        self.reader = reader
+        self.keys = keys  # sorted unique keys
+        self.starts = starts  # group i is records[starts[i]:starts[i + 1]]
+        self.records = records  # record numbers, grouped by key, time ordered within a group
+        self.timestamps = timestamps  # timestamps of ``records``
+
+    @classmethod
+    def build(cls, reader):
+        """Index every record of ``reader``. One pass over the ID and flag columns."""
+        ids = np.asarray(reader.arbitration_ids)
+        extended = (np.asarray(reader.records["flags"]) & FLAG_EXTENDED) != 0
+        unique_ids, unique_extended, inverse = _unique_ids(ids, extended)
+
+        # can_id_to_pgn only runs once per distinct ID, not once per frame
+        unique_keys = np.array(
+            [_key(int(i), bool(e)) for i, e in zip(unique_ids, unique_extended)],
+            dtype=np.int64,
+        )
+        keys = unique_keys[inverse]
+
+        # A stable sort keeps each group in record (= time) order
+        records = np.argsort(keys, kind="stable")
+        sorted_keys = keys[records]
+        group_keys, starts = np.unique(sorted_keys, return_index=True)
+        starts = np.append(starts, len(records))
+        return cls(reader, group_keys, starts, records, np.asarray(reader.timestamps)[records])
+
+    @classmethod
+    def open(cls, reader, cache=True):
+        """Load the cached index next to the log, or build (and cache) it if missing or stale."""
+        path = index_cache_path(reader.path)
+        if cache and os.path.exists(path):
+            with np.load(path) as saved:
+                if int(saved["record_count"]) == len(reader):
+                    return cls(
+                        reader,
+                        saved["keys"],
+                        saved["starts"],
+                        saved["records"],
+                        saved["timestamps"],
+                    )
+        index = cls.build(reader)
+        if cache:
+            index.save(path)
+        return index
+
+    def save(self, path):
+        # Write through a file object so np.savez doesn't append its own extension
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                record_count=len(self.reader),
+                keys=self.keys,
+                starts=self.starts,
+                records=self.records,
+                timestamps=self.timestamps,
+            )
+
+    def pgns(self):
+        """PGNs present in the log."""
+        return self.keys[self.keys < ID_KEY].tolist()
+
+    def _group(self, key):
+        position = np.searchsorted(self.keys, key)
+        if position == len(self.keys) or self.keys[position] != key:
+            return 0, 0
+        return int(self.starts[position]), int(self.starts[position + 1])
+
+    def query(self, pgn, start=None, end=None):
+        """Record numbers of ``pgn`` frames with ``start <= timestamp < end``, in time order."""
+        return self._query(pgn, start, end)
+
+    def query_id(self, arbitration_id, start=None, end=None):
+        """Record numbers of frames with exactly ``arbitration_id`` (11- or 29-bit)."""
+        key = _key(arbitration_id, arbitration_id > MAX_STANDARD_ID)
+        found = self._query(key, start, end)
+        if key < ID_KEY:
+            # PGN groups mix source addresses and priorities, keep the ones asked for
+            found = found[self.reader.arbitration_ids[found] == arbitration_id]
+        return found
+
+    def _query(self, key, start, end):
+        group_start, group_end = self._group(key)
+        timestamps = self.timestamps[group_start:group_end]
+        first = 0 if start is None else int(np.searchsorted(timestamps, start))
+        last = len(timestamps) if end is None else int(np.searchsorted(timestamps, end))
+        return self.records[group_start + first : group_start + max(first, last)]
+
+    def frames(self, pgn, start=None, end=None):
+        """The records (gathered, so a copy) of ``pgn`` frames between ``start`` and ``end``."""
+        return self.reader.records[self.query(pgn, start, end)]
+
+    def decode(self, pgn, decoder, start=None, end=None):
+        """Run ``decoder(data)`` over the ``pgn`` frames between ``start`` and ``end``.
+
+        Returns (timestamps, decoded values).
+        """
+        records = self.frames(pgn, start, end)
+        decoded = [decoder(data) for _, _, data in self.reader.iter_frames(records)]
+        return records["timestamp"], decoded
+
+
+def _unique_ids(ids, extended):
+    # The same numeric ID can show up as both an 11- and a 29-bit frame, so unique on both
+    combined = ids.astype(np.int64) | (extended.astype(np.int64) << 32)
+    unique, inverse = np.unique(combined, return_inverse=True)
+    return unique & 0xFFFFFFFF, (unique >> 32) != 0, inverse
+
+
+def _key(arbitration_id, is_extended_id):
+    if is_extended_id:
+        try:
+            return can_id_to_pgn(arbitration_id)
+        except ValueError:
+            pass
+    return ID_KEY | arbitration_id
@@ -0,0 +1,155 @@
+"""
+One thread, one deadline loop for all cyclic transmissions.
+
+The J1939 ECU job thread schedules every ``add_timer`` callback on its own wall-clock deadline and
+only wakes up when the slowest of them says so, so a 10 ms command ends up late by whatever the other
+events and ``time.time()`` adjustments cost. ``CyclicScheduler`` groups callbacks by period and runs
+each group against absolute ``time.monotonic()`` deadlines: the next deadline is the previous one
+plus the period, never "now plus the period", so lateness in one cycle doesn't push back the next
+ones. How late every group fires is recorded in ``JitterStats``.
+
+Callbacks use the ECU timer signature, ``callback(cookie)``, and are removed when they return a
+false value, so a CA can use either mechanism.
+
+Usage:
+    scheduler = CyclicScheduler()
+    kubota = Kubota_D902k_CA("KubotaD902K", scheduler=scheduler)
+    scheduler.start()
+    ...
+    scheduler.stats()  # {0.01: {"cycles": ..., "mean_late_ms": ..., "max_late_ms": ...}, ...}
+"""
+
+import logging
+import math
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class JitterStats:
+    """Running statistics of how late a group fired, in seconds after its deadline."""
+
+    __slots__ = ("cycles", "missed", "total", "total_squared", "max")
+
+    def __init__(self):
+        self.cycles = 0
+        self.missed = 0  # deadlines skipped because a whole period had already passed
+        self.total = 0.0
+        self.total_squared = 0.0
+        self.max = 0.0
+
+    def record(self, late):
+        self.cycles += 1
+        self.total += late
+        self.total_squared += late * late
+        if late > self.max:
+            self.max = late
+
+    def as_dict(self):
+        mean = self.total / self.cycles if self.cycles else 0.0
+        variance = self.total_squared / self.cycles - mean * mean if self.cycles else 0.0
+        return {
+            "cycles": self.cycles,
+            "missed": self.missed,
+            "mean_late_ms": mean * 1000,
+            "stdev_late_ms": math.sqrt(max(variance, 0.0)) * 1000,
+            "max_late_ms": self.max * 1000,
+        }
+
+
+class _Group:
+    __slots__ = ("period", "deadline", "callbacks", "stats")
+
+    def __init__(self, period, deadline):
+        self.period = period
+        self.deadline = deadline
+        self.callbacks = []  # (callback, cookie)
+        self.stats = JitterStats()
+
+
+class CyclicScheduler:
+    def __init__(self, clock=time.monotonic, spin=0.0):
+        """
+        :param clock: monotonic time source in seconds
+        :param spin: sleep until this long before a deadline and busy-wait the rest, for periods
+            where the OS sleep granularity matters (costs CPU)
+        """
+        self.clock = clock
+        self.spin = spin
+        self._groups = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread = None
+
+    def add(self, period, callback, cookie=None):
+        """Call ``callback(cookie)`` every ``period`` seconds, in step with its period group."""
+        with self._lock:
+            group = self._groups.get(period)
+            if group is None:
+                group = self._groups[period] = _Group(period, self.clock() + period)
+            group.callbacks.append((callback, cookie))
+        self._wakeup.set()
+
+    def remove(self, callback):
+        """Remove every registration of ``callback``."""
+        with self._lock:
+            for period, group in list(self._groups.items()):
+                group.callbacks = [entry for entry in group.callbacks if entry[0] != callback]
+                if not group.callbacks:
+                    del self._groups[period]
+
+    def run_pending(self, now=None):
+        """Run the groups whose deadline has passed. Returns the next deadline (None if idle)."""
+        now = self.clock() if now is None else now
+        with self._lock:
+            due = [group for group in self._groups.values() if group.deadline <= now]
+        for group in due:
+            group.stats.record(now - group.deadline)
+            for callback, cookie in list(group.callbacks):
+                try:
+                    keep = callback(cookie)
+                except Exception:
+                    logger.exception("Cyclic callback %r failed", callback)
+                    keep = True
+                if not keep:
+                    self.remove(callback)
+            group.deadline += group.period
+            if group.deadline <= now:
+                # Overran by a whole period or more: skip the missed cycles, stay on the grid
+                missed = math.floor((now - group.deadline) / group.period) + 1
+                group.stats.missed += missed
+                group.deadline += missed * group.period
+        with self._lock:
+            return min((group.deadline for group in self._groups.values()), default=None)
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="cyclic scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self):
+        while self._running:
+            self._wakeup.clear()
+            deadline = self.run_pending()
+            if deadline is None:
+                self._wakeup.wait()
+                continue
+            remaining = deadline - self.clock()
+            if remaining - self.spin > 0 and self._wakeup.wait(remaining - self.spin):
+                continue  # a callback was added, recompute the next deadline
+            while self.clock() < deadline:
+                pass
+
+    def stats(self):
+        """{period: jitter statistics} for every period group."""
+        with self._lock:
+            return {period: group.stats.as_dict() for period, group in self._groups.items()}
@@ -0,0 +1,319 @@
+"""
+Generate decode/encode functions for a DBC file.
+
+The wattalps message modules were typed out by hand from the ``BO_``/``SG_`` lines in their
+docstrings, each with its own shift-and-or per byte. This reads the same lines from a DBC file and
+emits one module where every message decodes with a single ``int.from_bytes`` and a precomputed
+shift/mask per signal, and encodes by or-ing the shifted raw values back into one integer.
+
+Usage:
+    python utils/dbc_codegen.py controller_applications/wattalps/wattalps.dbc \\
+        --frame-numbered BMS_VMU_FAILURE \\
+        --names controller_applications/wattalps/signal_names.txt \\
+        -o controller_applications/wattalps/messages/generated.py
+
+Byte layout follows the hand-written wattalps modules: a signal starting at bit ``start`` begins in
+byte ``start // 8`` at bit ``start % 8`` and multi-byte values are MSB first, even though the DBC marks
+them ``@1``. ``msg_warnings`` numbers its bits over the whole frame instead (bit ``start`` of
+``int.from_bytes(data, "big")``); messages passed with ``--frame-numbered`` are generated that way.
+
+Signals are named after their snake_case DBC name. ``--names`` reads a file of
+``MESSAGE.Signal field_name`` lines for the signals the hand-written modules name differently
+(``ChargeVoltage`` is ``max_charge_voltage``), so a generated decoder returns the same fields, with
+the same DBC factor and offset applied, as the hand-written one for its message. A payload of the
+wrong length raises ``ValueError``.
+"""
+
+import argparse
+import re
+from pathlib import Path
+from typing import NamedTuple
+
+CAN_EFF_MASK = 0x1FFFFFFF
+
+_MESSAGE_RE = re.compile(r"^BO_\s+(\d+)\s+(\w+)\s*:\s*(\d+)\s+(\w+)")
+_SIGNAL_RE = re.compile(
+    r"^SG_\s+(\w+)\s*:\s*(\d+)\|(\d+)@([01])([+-])\s*"
+    r"\(([^,]+),([^)]+)\)\s*\[([^|]*)\|([^\]]*)\]\s*\"([^\"]*)\""
+)
+
+
+class Signal(NamedTuple):
+    name: str
+    start: int
+    length: int
+    signed: bool
+    factor: float
+    offset: float
+    unit: str
+    line: str
+
+
+class Message(NamedTuple):
+    frame_id: int
+    name: str
+    length: int
+    signals: list
+
+
+def parse_dbc(text: str) -> list[Message]:
+    """Parse the ``BO_``/``SG_`` lines of a DBC file. Everything else is ignored."""
+    messages = []
+    message = None
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if line.startswith("BO_ "):
+            match = _MESSAGE_RE.match(line)
+            if not match:
+                raise ValueError(f"Cannot parse message: {line}")
+            frame_id, name, length, _ = match.groups()
+            message = Message(int(frame_id), name, int(length), [])
+            messages.append(message)
+        elif line.startswith("SG_ "):
+            if message is None:
+                raise ValueError(f"Signal outside of a message: {line}")
+            match = _SIGNAL_RE.match(line)
+            if not match:
+                raise ValueError(f"Cannot parse signal: {line}")
+            name, start, length, byte_order, sign, factor, offset, _, _, unit = match.groups()
+            if byte_order == "0":
+                raise ValueError(f"Motorola (@0) signals are not supported: {line}")
+            message.signals.append(
+                Signal(
+                    name,
+                    int(start),
+                    int(length),
+                    sign == "-",
+                    float(factor),
+                    float(offset),
+                    unit,
+                    line,
+                )
+            )
+        elif not line:
+            message = None
+    return messages
+
+
+def parse_names(text: str) -> dict:
+    """``{(message, signal): field_name}`` from ``MESSAGE.Signal field_name`` lines."""
+    names = {}
+    for raw_line in text.splitlines():
+        line = raw_line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        try:
+            signal, field = line.split()
+            message, signal = signal.split(".")
+        except ValueError:
+            raise ValueError(f"Cannot parse name: {raw_line}") from None
+        names[(message, signal)] = field
+    return names
+
+
+def snake_case(name: str) -> str:
+    name = re.sub(r"([A-Z]+)([A-Z][a-z])", r"\1_\2", name)
+    name = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", name)
+    return re.sub(r"_+", "_", name).lower()
+
+
+def signal_shift(signal: Signal, num_bytes: int, frame_numbered: bool = False) -> int:
+    """Right shift that brings ``signal`` to bit 0 of ``int.from_bytes(data, "big")``."""
+    if frame_numbered:
+        if signal.start + signal.length > num_bytes * 8:
+            raise ValueError(f"{signal.name} does not fit in {num_bytes} bytes")
+        return signal.start
+    first_byte = signal.start // 8
+    last_byte = first_byte + (signal.start % 8 + signal.length - 1) // 8
+    if last_byte >= num_bytes:
+        raise ValueError(f"{signal.name} does not fit in {num_bytes} bytes")
+    return (num_bytes - 1 - last_byte) * 8 + signal.start % 8
+
+
+def _is_flag(signal: Signal) -> bool:
+    return signal.length == 1 and signal.factor == 1 and signal.offset == 0
+
+
+def _is_integer(signal: Signal) -> bool:
+    return signal.factor == 1 and signal.offset == 0
+
+
+def _decode_expression(signal: Signal, num_bytes: int, frame_numbered: bool) -> str:
+    shift = signal_shift(signal, num_bytes, frame_numbered)
+    mask = (1 << signal.length) - 1
+    value = f"(raw >> {shift})" if shift else "raw"
+    if _is_flag(signal):
+        return f"bool({value} & 0x01)"
+    value = f"{value} & {mask:#x}"
+    if signal.signed:
+        # Sign extend without a branch
+        sign_bit = 1 << (signal.length - 1)
+        value = f"(({value}) ^ {sign_bit:#x}) - {sign_bit:#x}"
+    if _is_integer(signal):
+        return value
+    value = f"({value}) * {signal.factor!r}"
+    if signal.offset:
+        value = f"{value} + {signal.offset!r}"
+    return value
+
+
+def _encode_expression(signal: Signal, field: str, num_bytes: int, frame_numbered: bool) -> str:
+    shift = signal_shift(signal, num_bytes, frame_numbered)
+    mask = (1 << signal.length) - 1
+    value = f'signals.get("{field}", 0)'
+    if _is_integer(signal):
+        value = f"int({value})"
+    elif signal.offset:
+        value = f"round(({value} - {signal.offset!r}) / {signal.factor!r})"
+    else:
+        value = f"round({value} / {signal.factor!r})"
+    value = f"{value} & {mask:#x}"
+    return f"({value}) << {shift}" if shift else value
+
+
+def _message_code(message: Message, fields: dict, frame_numbered: bool) -> str:
+    lower = message.name.lower()
+    lines = [
+        f"# {message.name}",
+        f"MESSAGE_ID_{message.name} = {message.frame_id}",
+        "",
+        "",
+        f"def decode_{lower}(data: bytes) -> dict:",
+        f"    if len(data) != {message.length}:",
+        f'        raise ValueError(f"{message.name} is {message.length} bytes, got {{len(data)}}")',
+        '    raw = int.from_bytes(data, "big")',
+        "    return {",
+    ]
+    for signal in message.signals:
+        lines.append(f"        # {signal.line}")
+        lines.append(
+            f'        "{fields[signal.name]}": {_decode_expression(signal, message.length, frame_numbered)},'
+        )
+    lines += [
+        "    }",
+        "",
+        "",
+        f"def encode_{lower}(signals: dict) -> bytes:",
+        "    raw = 0",
+    ]
+    for signal in message.signals:
+        lines.append(f"    # {signal.line}")
+        field = fields[signal.name]
+        lines.append(f"    raw |= {_encode_expression(signal, field, message.length, frame_numbered)}")
+    lines += [
+        f'    return raw.to_bytes({message.length}, "big")',
+        "",
+        "",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def generate(messages: list[Message], source: str, frame_numbered=(), names=None) -> str:
+    """
+    Return the source of a module with decode/encode functions and registries for ``messages``.
+
+    :param frame_numbered: names of the messages whose start bits count over the whole frame
+    :param names: ``{(message, signal): field_name}`` overriding the snake_case signal names
+    """
+    names = names or {}
+    unknown = set(frame_numbered) - {m.name for m in messages}
+    if unknown:
+        raise ValueError(f"Unknown messages: {', '.join(sorted(unknown))}")
+    unknown = set(names) - {(m.name, s.name) for m in messages for s in m.signals}
+    if unknown:
+        raise ValueError(f"Unknown signals: {', '.join(sorted('.'.join(n) for n in unknown))}")
+    fields = {
+        m.name: {s.name: names.get((m.name, s.name)) or snake_case(s.name) for s in m.signals}
+        for m in messages
+    }
+    parts = [
+        '"""\n'
+        f"Generated by utils/dbc_codegen.py from {source}. Do not edit by hand, re-run the generator.\n"
+        "\n"
+        "Each decode_<message> turns the payload into one integer and pulls every signal out with a\n"
+        "precomputed shift and mask. Signal names are the snake_case DBC names, or the names the\n"
+        "hand-written msg_* modules use where those differ (--names).\n"
+    ]
+    if frame_numbered:
+        parts.append(
+            "\n"
+            f"Start bits of {', '.join(frame_numbered)} count over the whole frame"
+            " (--frame-numbered).\n"
+        )
+    parts.append('"""\n\n\n')
+    parts += [_message_code(m, fields[m.name], m.name in frame_numbered) for m in messages]
+    parts.append("DECODERS = {\n")
+    parts += [f"    MESSAGE_ID_{m.name}: decode_{m.name.lower()},\n" for m in messages]
+    parts.append("}\n\nENCODERS = {\n")
+    parts += [f"    MESSAGE_ID_{m.name}: encode_{m.name.lower()},\n" for m in messages]
+    parts.append(
+        "}\n"
+        "\n"
+        "# Keyed by the ID as it appears on the bus (DBC IDs carry the extended frame flag)\n"
+        "DECODERS_BY_ARBITRATION_ID = {\n"
+    )
+    parts += [
+        f"    {m.frame_id & CAN_EFF_MASK:#x}: decode_{m.name.lower()},\n" for m in messages
+    ]
+    parts.append(
+        "}\n"
+        "\n"
+        "# (name, shift, mask, sign_bit, factor, offset, is_flag) for every signal, with the shift taken\n"
+        "# on the payload zero-padded to 8 bytes and read as one big-endian 64-bit word. sign_bit is 0\n"
+        "# for unsigned signals. Used by wattalps.batch to decode whole columns at once.\n"
+        "SIGNAL_LAYOUTS = {\n"
+    )
+    for message in messages:
+        parts.append(f"    MESSAGE_ID_{message.name}: (\n")
+        numbered = message.name in frame_numbered
+        message_fields = fields[message.name]
+        parts += [
+            f"        {_signal_layout(s, message_fields[s.name], message.length, numbered)},\n"
+            for s in message.signals
+        ]
+        parts.append("    ),\n")
+    parts.append("}\n")
+    return "".join(parts)
+
+
+def _signal_layout(signal: Signal, field: str, num_bytes: int, frame_numbered: bool) -> str:
+    shift = signal_shift(signal, num_bytes, frame_numbered) + (8 - num_bytes) * 8
+    mask = (1 << signal.length) - 1
+    sign_bit = 1 << (signal.length - 1) if signal.signed and not _is_flag(signal) else 0
+    return (
+        f'("{field}", {shift}, {mask:#x}, {sign_bit:#x}, '
+        f"{signal.factor!r}, {signal.offset!r}, {_is_flag(signal)})"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("dbc", type=Path, help="DBC file to read")
+    parser.add_argument("-o", "--output", type=Path, help="module to write (default: stdout)")
+    parser.add_argument(
+        "--frame-numbered",
+        metavar="MESSAGE",
+        action="append",
+        default=[],
+        help="message whose start bits count over the whole frame (repeatable)",
+    )
+    parser.add_argument(
+        "--names",
+        type=Path,
+        help="file of 'MESSAGE.Signal field_name' lines overriding the snake_case signal names",
+    )
+    args = parser.parse_args(argv)
+
+    messages = parse_dbc(args.dbc.read_text(encoding="utf-8"))
+    names = parse_names(args.names.read_text(encoding="utf-8")) if args.names else None
+    code = generate(messages, args.dbc.name, args.frame_numbered, names)
+    if args.output is None:
+        print(code, end="")
+    else:
+        args.output.write_text(code, encoding="utf-8")
+        print(f"Wrote {len(messages)} messages to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Per-PGN latency histograms from the frame's receive timestamp to the decoded value's consumer.
+
+Every frame keeps its socketcan timestamp (``msg.timestamp``, taken by the kernel or the adapter)
+through dispatch and decode. ``LatencyTracer.decoded`` records how long after that timestamp the
+frame was decoded; ``LatencyTracer.consumed`` records how long the decoded value then waited until
+whatever uses it (the display, a control loop) picked it up. Both go into one histogram per key
+(PGN, or arbitration ID for non-J1939 frames) and stage.
+
+``HdrHistogram`` is an HDR-style histogram: buckets are exact below ``2 * 10**significant_figures``
+µs and keep that many significant figures above, so recording is one index computation and a
+counter increment, memory is fixed (a few thousand counters for 1 µs..10 s) and percentiles stay
+within the stated precision however long the run. Percentiles report the highest value of their
+bucket, so they never understate a latency.
+
+Usage:
+    tracer = LatencyTracer()
+    tracer.dump_at_exit("latency.json")
+    decoded_at = tracer.decoded(pgn, msg.timestamp)
+    ...
+    tracer.consumed(pgn, decoded_at)
+    tracer.histogram(61444, "receive_to_decode").percentile(99)  # s
+    tracer.histogram(61444, "receive_to_decode").count_above(0.010)  # frames over a 10 ms deadline
+"""
+
+import atexit
+import json
+import math
+import threading
+import time
+from itertools import accumulate
+
+RECEIVE_TO_DECODE = "receive_to_decode"
+DECODE_TO_CONSUMER = "decode_to_consumer"
+STAGES = (RECEIVE_TO_DECODE, DECODE_TO_CONSUMER)
+SUMMARY_PERCENTILES = (50, 90, 99, 99.9)
+
+
+class HdrHistogram:
+    def __init__(self, highest=10.0, significant_figures=2):
+        """
+        :param highest: largest latency tracked in s, larger ones are counted as this
+        :param significant_figures: precision of the recorded values (1 to 5)
+        """
+        # Sub-buckets per power of two: enough to tell 10**significant_figures values apart
+        self._sub_bucket_bits = math.ceil(math.log2(2 * 10**significant_figures))
+        self._half = 1 << (self._sub_bucket_bits - 1)
+        self.highest_us = int(highest * 1e6)
+        self.significant_figures = significant_figures
+        # A list: incrementing an item is much cheaper than incrementing a NumPy scalar
+        self.counts = [0] * (self._index(self.highest_us) + 1)
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def _index(self, value_us):
+        bucket = max(value_us.bit_length() - self._sub_bucket_bits, 0)
+        return bucket * self._half + (value_us >> bucket)
+
+    def _highest_equivalent(self, index):
+        bucket = max(index // self._half - 1, 0)
+        sub_bucket = index - bucket * self._half
+        return ((sub_bucket + 1) << bucket) - 1
+
+    def record(self, seconds):
+        """Record one latency (negative ones, from clock adjustments, count as 0)."""
+        value_us = min(max(round(seconds * 1e6), 0), self.highest_us)
+        self.counts[self._index(value_us)] += 1
+        self.count += 1
+        self.total_us += value_us
+        if self.min_us is None or value_us < self.min_us:
+            self.min_us = value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def percentile(self, percentile):
+        """Latency in s that ``percentile`` % of the recorded values are at or below."""
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(percentile / 100 * self.count), 1)
+        index = next(i for i, total in enumerate(accumulate(self.counts)) if total >= rank)
+        return min(self._highest_equivalent(index), self.max_us) / 1e6
+
+    def count_above(self, seconds):
+        """Number of recorded latencies above ``seconds`` (to bucket precision)."""
+        value_us = int(seconds * 1e6)
+        if value_us >= self.highest_us:
+            return 0
+        return sum(self.counts[self._index(value_us) + 1 :])
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def as_dict(self):
+        """Summary in ms."""
+        summary = {
+            "count": self.count,
+            "min_ms": (self.min_us or 0) / 1000,
+            "mean_ms": self.total_us / self.count / 1000 if self.count else 0.0,
+            "max_ms": self.max_us / 1000,
+        }
+        for percentile in SUMMARY_PERCENTILES:
+            summary[f"p{percentile:g}_ms"] = self.percentile(percentile) * 1000
+        return summary
+
+
+class LatencyTracer:
+    def __init__(self, clock=time.time, highest=10.0, significant_figures=2):
+        """
+        :param clock: must be the clock of the receive timestamps; socketcan, the virtual bus and
+            ``BulkCanReceiver`` all stamp frames in epoch seconds
+        """
+        self.clock = clock
+        self.highest = highest
+        self.significant_figures = significant_figures
+        self.histograms = {}  # (key, stage) -> HdrHistogram
+        self._lock = threading.Lock()
+
+    def _histogram(self, key, stage):
+        histogram = self.histograms.get((key, stage))
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(
+                    (key, stage), HdrHistogram(self.highest, self.significant_figures)
+                )
+        return histogram
+
+    def decoded(self, key, received_at, decoded_at=None):
+        """Record a frame's receive-to-decode latency. Returns the decode time, for ``consumed``."""
+        if decoded_at is None:
+            decoded_at = self.clock()
+        if received_at is not None:
+            self._histogram(key, RECEIVE_TO_DECODE).record(decoded_at - received_at)
+        return decoded_at
+
+    def consumed(self, key, decoded_at, consumed_at=None):
+        """Record how long a decoded value waited for its consumer. Returns the latency in s."""
+        latency = (self.clock() if consumed_at is None else consumed_at) - decoded_at
+        self._histogram(key, DECODE_TO_CONSUMER).record(latency)
+        return latency
+
+    def histogram(self, key, stage=RECEIVE_TO_DECODE):
+        """The histogram of one key and stage, None if nothing was recorded for it."""
+        return self.histograms.get((key, stage))
+
+    def total(self, stage=RECEIVE_TO_DECODE):
+        """All keys of one stage merged into one histogram."""
+        total = HdrHistogram(self.highest, self.significant_figures)
+        with self._lock:
+            histograms = [h for (_, s), h in self.histograms.items() if s == stage]
+        for histogram in histograms:
+            total.merge(histogram)
+        return total
+
+    def snapshot(self):
+        """{key: {stage: summary}} of every histogram."""
+        with self._lock:
+            items = list(self.histograms.items())
+        snapshot = {}
+        for (key, stage), histogram in sorted(items, key=lambda item: str(item[0])):
+            snapshot.setdefault(key, {})[stage] = histogram.as_dict()
+        return snapshot
+
+    def dump(self, path):
+        """Write the snapshot as JSON (keys as strings, PGNs in decimal)."""
+        snapshot = {str(key): stages for key, stages in self.snapshot().items()}
+        with open(path, "w") as f:
+            json.dump(snapshot, f, indent=2)
+
+    def dump_at_exit(self, path):
+        atexit.register(self.dump, path)
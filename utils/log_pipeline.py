@@ -0,0 +1,177 @@
+"""
+Decode a recorded CAN log (see ``utils.can_log``) on all cores.
+
+The log is cut into time chunks and every chunk is decoded in a ``ProcessPoolExecutor`` worker
+through the same ``DispatchTable`` routing as ``main.py``: Kubota and ISO175 by PGN, IVT results and
+the generated wattalps decoders by arbitration ID. Workers map the log themselves, so only the chunk
+bounds go to them and only the decoded columns come back. Chunks are merged in chunk order, which is
+timestamp order.
+
+Workers are started with the "spawn" method and only import this module's dependencies: no Rich, and
+the controller applications are created without a CAN bus. As with any multiprocessing code, call
+``decode_log`` from under ``if __name__ == "__main__":``.
+
+Usage:
+    python -m utils.log_pipeline drive.canlog --workers 8
+
+    columns = decode_log("drive.canlog", workers=8)
+    coolant = columns[("Kubota Engine", 65262)]
+    coolant["timestamp"], coolant["Engine Coolant Temp (°C)"]
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from controller_applications.bender_ISO175_j1939 import ISO175_CA
+from controller_applications.ca_kubota_engine import Kubota_D902k_CA
+from controller_applications.ivt_can_controller import IVTSensor
+from controller_applications.wattalps.messages.generated import DECODERS_BY_ARBITRATION_ID
+from controller_applications.wattalps.messages.msg_warnings import (
+    MESSAGE_ID_BMS_VMU_FAILURE,
+    decode_bms_vmu_failure_view,
+)
+from utils.can_dispatch import DispatchTable
+from utils.can_log import CanLogReader
+
+# Per-worker state, set up once by _init_worker
+_dispatch = None
+_readers = {}
+
+
+def build_dispatch():
+    """Routing table for every decoder the project has, without opening a CAN bus."""
+    dispatch = DispatchTable()
+    ivt_sensor = IVTSensor("IVT", connect=False)
+    for arbitration_id in ivt_sensor.RESULT_IDS:
+        dispatch.add_id(arbitration_id, ivt_sensor._decode_mux, "IVT Sensor")
+    dispatch.add_j1939_ca(Kubota_D902k_CA("KubotaD902K"), "Kubota Engine")
+    dispatch.add_j1939_ca(ISO175_CA("ISO175"), "ISO175")
+    for arbitration_id, decoder in DECODERS_BY_ARBITRATION_ID.items():
+        dispatch.add_id(arbitration_id, decoder, "Wattalps BMS")
+    # 42 flags of which a check reads one or two: decode them lazily (29-bit ID as on the bus)
+    dispatch.add_id(
+        MESSAGE_ID_BMS_VMU_FAILURE & 0x1FFFFFFF, decode_bms_vmu_failure_view, "Wattalps BMS"
+    )
+    return dispatch
+
+
+def _init_worker():
+    global _dispatch
+    _dispatch = build_dispatch()
+
+
+def chunk_bounds(reader, chunks):
+    """Split ``reader`` into up to ``chunks`` spans of equal duration, as (first, last) records."""
+    if not len(reader):
+        return []
+    start = float(reader.timestamps[0])
+    end = float(reader.timestamps[-1])
+    edges = [0]
+    for boundary in np.linspace(start, end, chunks + 1)[1:-1]:
+        edges.append(reader.first_record_at(boundary))
+    edges.append(len(reader))
+    return [(first, last) for first, last in zip(edges, edges[1:]) if last > first]
+
+
+def decode_chunk(path, first, last, dispatch=None):
+    """Decode records ``first:last`` of the log into {(source, key): {column: [values]}}."""
+    dispatch = dispatch or _dispatch
+    reader = _readers.get(path)
+    if reader is None:
+        reader = _readers[path] = CanLogReader(path)
+
+    columns = {}
+    for timestamp, arbitration_id, data in reader.iter_frames(reader.records[first:last]):
+        route = dispatch.lookup(arbitration_id)
+        if route is None:
+            continue
+        try:
+            decoded = route.decoder(data)
+        except Exception:
+            continue
+        if not isinstance(decoded, Mapping) or not decoded or "error" in decoded:
+            continue
+
+        group = columns.get((route.source, route.key))
+        if group is None:
+            group = columns[(route.source, route.key)] = {"timestamp": []}
+            for name in decoded:
+                group[name] = []
+        group["timestamp"].append(timestamp)
+        for name, values in group.items():
+            if name != "timestamp":
+                values.append(decoded.get(name))
+    return columns
+
+
+def decode_log(path, workers=None, chunks=None):
+    """Decode the whole log at ``path`` into {(source, key): {column: np.ndarray}}.
+
+    :param workers: worker processes (default: one per core). 1 decodes in this process.
+    :param chunks: number of time chunks (default: 4 per worker, to even out busy stretches)
+    """
+    workers = workers or os.cpu_count() or 1
+    reader = CanLogReader(path)
+    bounds = chunk_bounds(reader, chunks or workers * 4)
+
+    if workers == 1:
+        dispatch = build_dispatch()
+        results = [decode_chunk(path, first, last, dispatch) for first, last in bounds]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        ) as executor:
+            futures = [
+                executor.submit(decode_chunk, path, first, last) for first, last in bounds
+            ]
+            results = [future.result() for future in futures]
+    return merge_chunks(results)
+
+
+def merge_chunks(results):
+    """Concatenate per-chunk columns in chunk order and turn them into arrays."""
+    merged = {}
+    for columns in results:
+        for key, group in columns.items():
+            target = merged.setdefault(key, {name: [] for name in group})
+            for name, values in group.items():
+                target.setdefault(name, []).extend(values)
+    return {
+        key: {name: _column(values) for name, values in group.items()}
+        for key, group in merged.items()
+    }
+
+
+def _column(values):
+    # Mixed columns (e.g. ISO175 "SNV" strings between numbers) stay as Python objects
+    if all(isinstance(value, (bool, int, float)) for value in values):
+        return np.asarray(values)
+    return np.asarray(values, dtype=object)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Decode a recorded CAN log on all cores")
+    parser.add_argument("log", help="log written by utils.can_log.CanLogWriter")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunks", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    columns = decode_log(args.log, args.workers, args.chunks)
+    elapsed = time.perf_counter() - started
+    decoded = sum(len(group["timestamp"]) for group in columns.values())
+    for (source, key), group in sorted(columns.items(), key=lambda item: str(item[0])):
+        print(f"{source:<16} {key:>10}  {len(group['timestamp']):>10} frames")
+    print(f"Decoded {decoded} frames in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Bus and decoder statistics in the Prometheus text format, served on a local ``/metrics`` endpoint.
+
+The receive path only ever does ``counter.inc(key)``: one dict update on a plain ``int``, no lock,
+no label formatting. Every counter has one writer thread (the receive thread for the frame counters)
+and CPython dict item updates are atomic for the readers, so the scrape thread copies the dict and
+formats labels at scrape time. At 5k frames/s a couple of increments per frame cost well under 1% of
+a core (see ``tests/test_metrics.py::test_hot_path_overhead``).
+
+Values that already live elsewhere (``CyclicScheduler.stats()``, ``IVTSensor.sequence_counters()``)
+are not copied into counters; collectors read them when ``/metrics`` is scraped.
+
+Usage:
+    registry = MetricsRegistry()
+    frames = registry.counter("can_frames_total", "Frames received", "arbitration_id", hex_label)
+    registry.add_collector(scheduler_collector(scheduler))
+    server = MetricsServer(registry, port=9108)
+    server.start()
+    ...
+    frames.inc(msg.arbitration_id)
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def hex_label(value):
+    """Label value for arbitration IDs: 0x18FEF100."""
+    return f"0x{value:X}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_sample(name, labels, value):
+    if labels:
+        label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+        return f"{name}{{{label_text}}} {value}"
+    return f"{name} {value}"
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name, help, label=None, format_label=str):
+        """
+        :param label: name of the label the keys of ``inc`` are exported under, None for a counter
+            without labels
+        :param format_label: turns a key into the label value, at scrape time
+        """
+        self.name = name
+        self.help = help
+        self.label = label
+        self.format_label = format_label
+        self.values = {}  # key -> count, written by one thread only
+
+    def inc(self, key=None, amount=1):
+        values = self.values
+        try:
+            values[key] += amount
+        except KeyError:
+            values[key] = amount
+
+    def value(self, key=None):
+        return self.values.get(key, 0)
+
+    def samples(self):
+        values = self.values.copy()
+        if self.label is None:
+            return [({}, values.get(None, 0))]
+        return [
+            ({self.label: self.format_label(key)}, value) for key, value in sorted(values.items())
+        ]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, value, key=None):
+        self.values[key] = value
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = {}
+        self.collectors = []
+
+    def _add(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, label=None, format_label=str):
+        return self._add(Counter(name, help, label, format_label))
+
+    def gauge(self, name, help, label=None, format_label=str):
+        return self._add(Gauge(name, help, label, format_label))
+
+    def add_collector(self, collector):
+        """Add a ``collector()`` returning (name, type, help, [(labels, value)...]) families,
+        called on every scrape."""
+        self.collectors.append(collector)
+
+    def collect(self):
+        families = [
+            (metric.name, metric.type, metric.help, metric.samples())
+            for metric in list(self.metrics.values())
+        ]
+        for collector in self.collectors:
+            families.extend(collector())
+        return families
+
+    def exposition(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, metric_type, help, samples in self.collect():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(_format_sample(name, labels, value) for labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+def scheduler_collector(scheduler, prefix="cyclic"):
+    """Collector for the jitter statistics of a ``CyclicScheduler``, one label per period."""
+
+    def collect():
+        stats = sorted(scheduler.stats().items())
+        families = []
+        for field, metric_type, help, scale in (
+            ("cycles", "counter", "Cycles run", 1),
+            ("missed", "counter", "Cycles skipped because a whole period had passed", 1),
+            ("mean_late_ms", "gauge", "Mean lateness after the deadline in s", 0.001),
+            ("stdev_late_ms", "gauge", "Standard deviation of the lateness in s", 0.001),
+            ("max_late_ms", "gauge", "Largest lateness after the deadline in s", 0.001),
+        ):
+            name = f"{prefix}_{field.replace('_ms', '_seconds')}"
+            if metric_type == "counter":
+                name += "_total"
+            samples = [
+                ({"period": f"{period:g}"}, period_stats[field] * scale)
+                for period, period_stats in stats
+            ]
+            families.append((name, metric_type, help, samples))
+        return families
+
+    return collect
+
+
+def ivt_collector(ivt, prefix="ivt"):
+    """Collector for the result frame counters of an ``IVTSensor`` (frames, drops, ...)."""
+
+    def collect():
+        counters = ivt.sequence_counters()
+        families = []
+        for field, help in (
+            ("frames", "Result frames received"),
+            ("dropped", "Result frames missing from the message counter sequence"),
+            ("duplicates", "Result frames received twice"),
+        ):
+            samples = [({"result": label}, values[field]) for label, values in counters.items()]
+            families.append((f"{prefix}_{field}_total", "counter", help, samples))
+        return families
+
+    return collect
+
+
+class MetricsServer:
+    def __init__(self, registry, host="127.0.0.1", port=9108):
+        """
+        :param port: 0 picks a free port, see ``port`` once started
+        """
+        self.registry = registry
+        self.host = host
+        self._port = port
+        self._server = None
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1] if self._server is not None else self._port
+
+    def start(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.exposition().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # one line per scrape on stderr is noise
+
+        self._server = ThreadingHTTPServer((self.host, self._port), Handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics server", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
@@ -0,0 +1,182 @@
+"""
+Central registry of decoded signals with publish/subscribe.
+
+Every signal (``engine.engine_speed_rpm``, ``iso175.r_iso_corrected``, ``ivt.current``...) is one
+``Signal`` slot holding the latest value, its timestamp and its subscribers, so readers get the
+latest value with one dict lookup instead of re-decoding frames or copying result dicts.
+Subscribers are called with the ``Signal`` when it is published, and can ask to be told only when
+the value changed and/or at most once every ``min_interval`` seconds.
+
+``SignalBus.sink()`` returns a sink (see ``utils.sinks``, or the ``AsyncCanStack`` listener) that
+publishes decoded frames: one signal per field, named ``<prefix>.<field>`` with the field name in
+snake case ("Engine Speed (RPM)" -> "engine_speed_rpm"). IVT result dicts publish their value
+under their label. Only fields whose signal is registered (``subscribe`` or ``signal``) are
+published, and only those are read from the decoded frame, so the lazy views
+(``BmsVmuFailureView``, ISO175 ``GeneralInfoView``) decode just the signals somebody uses.
+
+Usage:
+    bus = SignalBus()
+    kubota = Kubota_D902k_CA("KubotaD902K", sink=bus.sink({"KubotaD902K": "engine"}))
+    bus.subscribe("engine.engine_speed_rpm", lambda signal: ..., min_interval=0.1)
+    bus.signal("engine.engine_coolant_temp_c")  # no subscriber, but keep its latest value
+    bus.value("engine.engine_speed_rpm")
+"""
+
+import re
+import time
+
+
+class Subscription:
+    __slots__ = ("callback", "on_change", "min_interval", "last_value", "last_notified")
+
+    def __init__(self, callback, on_change=True, min_interval=0.0):
+        self.callback = callback
+        self.on_change = on_change
+        self.min_interval = min_interval
+        self.last_value = None
+        self.last_notified = None
+
+    def offer(self, signal):
+        if self.last_notified is not None:
+            # Compared with what this subscriber was last told, so a change held back by the
+            # throttle is still delivered with the next update
+            if self.on_change and signal.value == self.last_value:
+                return
+            if signal.timestamp - self.last_notified < self.min_interval:
+                return
+        self.last_value = signal.value
+        self.last_notified = signal.timestamp
+        self.callback(signal)
+
+
+class Signal:
+    __slots__ = ("name", "type", "value", "timestamp", "updates", "subscriptions")
+
+    def __init__(self, name, type=None):
+        """
+        :param type: values are converted to this type when published; values that don't convert
+            are stored as None (not valid). None accepts anything.
+        """
+        self.name = name
+        self.type = type
+        self.value = None
+        self.timestamp = None
+        self.updates = 0
+        self.subscriptions = []
+
+    def set(self, value, timestamp):
+        if value is not None and self.type is not None and type(value) is not self.type:
+            try:
+                value = self.type(value)
+            except (TypeError, ValueError):
+                value = None
+        self.value = value
+        self.timestamp = timestamp
+        self.updates += 1
+        for subscription in self.subscriptions:
+            subscription.offer(self)
+
+    def __repr__(self):
+        return f"Signal({self.name!r}, value={self.value!r}, timestamp={self.timestamp!r})"
+
+
+class SignalBus:
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.signals = {}
+        self._names = {}  # (prefix, field) -> signal name, see sink()
+
+    def __getitem__(self, name):
+        return self.signals[name]
+
+    def __contains__(self, name):
+        return name in self.signals
+
+    def signal(self, name, type=None):
+        """Get the signal called ``name``, registering it first if needed."""
+        signal = self.signals.get(name)
+        if signal is None:
+            signal = self.signals[name] = Signal(name, type)
+        elif signal.type is None and type is not None:
+            signal.type = type
+        return signal
+
+    def publish(self, name, value, timestamp=None):
+        signal = self.signals.get(name)
+        if signal is None:
+            signal = self.signals[name] = Signal(name, _value_type(value))
+        elif signal.type is None and value is not None:
+            # First valid value of a signal registered without a type
+            signal.type = _value_type(value)
+        signal.set(value, self.clock() if timestamp is None else timestamp)
+        return signal
+
+    def value(self, name, default=None):
+        """Latest value of a signal (``default`` if it was never published)."""
+        signal = self.signals.get(name)
+        return default if signal is None or signal.value is None else signal.value
+
+    def subscribe(self, name, callback, on_change=True, min_interval=0.0):
+        """Call ``callback(signal)`` when ``name`` is published. Returns the subscription."""
+        subscription = Subscription(callback, on_change, min_interval)
+        self.signal(name).subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, name, subscription):
+        self.signals[name].subscriptions.remove(subscription)
+
+    def sink(self, prefixes=None):
+        """A ``sink(source, key, decoded)`` publishing the registered fields of decoded frames.
+
+        :param prefixes: {source: signal name prefix}, sources not listed use their snake case name
+        """
+        prefixes = dict(prefixes or {})
+        signals = self.signals
+
+        def publish_decoded(source, key, decoded):
+            if "error" in decoded:
+                return
+            prefix = prefixes.get(source)
+            if prefix is None:
+                prefix = prefixes[source] = snake_case(source)
+            timestamp = None
+            if "label" in decoded and "value" in decoded:
+                # IVT result: one channel per frame
+                name = self._name(prefix, decoded["label"])
+                if name in signals:
+                    self.publish(name, decoded["value"], self.clock())
+                return
+            # Iterating a view only lists its keys; a value is decoded when it is looked up
+            for field in decoded:
+                if field == "PGN":
+                    continue
+                name = self._name(prefix, field)
+                if name not in signals:
+                    continue
+                if timestamp is None:
+                    timestamp = self.clock()
+                value = decoded[field]
+                self.publish(name, None if value == "SNV" else value, timestamp)
+
+        return publish_decoded
+
+    def _name(self, prefix, field):
+        name = self._names.get((prefix, field))
+        if name is None:
+            name = self._names[(prefix, field)] = f"{prefix}.{snake_case(field)}"
+        return name
+
+
+def snake_case(text):
+    """Signal name for a decoded field, e.g. "Engine Speed (RPM)" -> engine_speed_rpm."""
+    return re.sub(r"[^0-9a-z]+", "_", text.lower()).strip("_")
+
+
+def _value_type(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return bool
+    if isinstance(value, (int, float)):
+        return float
+    return type(value)
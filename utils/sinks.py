@@ -0,0 +1,138 @@
+"""
+Where decoded frames go instead of ``print``.
+
+A sink is any callable ``sink(source, key, decoded)``: the same signature as the ``listener`` of
+``AsyncCanStack``, so a plain function works as a callback sink. The J1939 CAs take one as
+``sink=`` and call it once per decoded frame; with no sink they only decode.
+
+- ``NullSink``: drops everything (same as passing no sink)
+- ``MemorySink``: keeps the latest value per (source, key) and optionally a bounded history
+- ``LogSink``: one ``logging`` record per frame, with source/key/decoded as structured ``extra``
+- ``ConsoleSink``: the old per-key printout, for the scripts' listen modes
+- ``BatchingSink``: queues frames and hands them to another sink from a background thread, so the
+  receive path never waits on I/O. The queue is bounded: when the target falls behind, the oldest
+  frames are dropped and counted in ``dropped``
+
+Usage:
+    sink = BatchingSink(ConsoleSink())
+    kubota = Kubota_D902k_CA("KubotaD902K", sink=sink)
+    ...
+    sink.close()  # flushes what is still queued
+"""
+
+import logging
+import sys
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class NullSink:
+    def __call__(self, source, key, decoded):
+        pass
+
+
+class MemorySink:
+    def __init__(self, history=0):
+        """
+        :param history: number of frames to keep in ``frames`` besides the latest values (0: none)
+        """
+        self.latest = {}
+        self.frames = deque(maxlen=history) if history else None
+
+    def __call__(self, source, key, decoded):
+        self.latest[(source, key)] = decoded
+        if self.frames is not None:
+            self.frames.append((source, key, decoded))
+
+
+class LogSink:
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger or logging.getLogger("can.decoded")
+        self.level = level
+
+    def __call__(self, source, key, decoded):
+        # Formatting is deferred to the handlers, and skipped entirely when the level is disabled
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(
+                self.level,
+                "%s %s: %s",
+                source,
+                key,
+                decoded,
+                extra={"source": source, "key": key, "decoded": decoded},
+            )
+
+
+class ConsoleSink:
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def __call__(self, source, key, decoded):
+        if "error" in decoded:
+            lines = [f"{source}: could not decode PGN {key}: {decoded['error']}"]
+        else:
+            lines = [f"\nDecoded PGN {key} ({source}):"]
+            lines.extend(f"  {name}: {value}" for name, value in decoded.items())
+        self.stream.write("\n".join(lines) + "\n")
+
+
+class BatchingSink:
+    def __init__(self, target, interval=0.1, max_batch=1024, max_queue=65536):
+        """
+        :param target: sink the frames are handed to, from the background thread
+        :param interval: seconds between flushes
+        :param max_batch: flush early once this many frames are queued
+        :param max_queue: frames kept while the target falls behind, older ones are dropped
+        """
+        self.target = target
+        self.interval = interval
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.dropped = 0  # frames pushed out of a full queue
+        self.errors = 0  # frames the target raised on
+        self._queue = deque(maxlen=max_queue)
+        self._wakeup = threading.Event()
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="batching sink", daemon=True)
+        self._thread.start()
+
+    def __call__(self, source, key, decoded):
+        # deque.append is atomic, the receive path takes no lock. A full deque drops its oldest item
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+        self._queue.append((source, key, decoded))
+        if len(self._queue) >= self.max_batch:
+            self._wakeup.set()
+
+    def flush(self):
+        """Hand everything queued so far to the target (from the calling thread)."""
+        while True:
+            try:
+                item = self._queue.popleft()
+            except IndexError:
+                break
+            self.target(*item)
+
+    def _drain(self):
+        # A target that raises loses that one frame, not the thread or the rest of the queue
+        while True:
+            try:
+                self.flush()
+                return
+            except Exception:
+                self.errors += 1
+                logger.exception("Sink %r failed, frame dropped", self.target)
+
+    def _loop(self):
+        while self._running:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self._drain()
+
+    def close(self):
+        self._running = False
+        self._wakeup.set()
+        self._thread.join()
+        self._drain()
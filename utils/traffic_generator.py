@@ -0,0 +1,377 @@
+"""
+Synthetic CAN traffic for load and soak tests, without the engine, BMS or IVT on the bench.
+
+Every frame is built by the project's own encoders: ``Kubota_D902k_CA.encode_65363``/
+``encode_65265`` for the engine commands, the wattalps ``encode_info``/``encode_bms_vmu_failure``...
+for the BMS and ``IVTSensor.RESULT_FORMAT`` for the IVT results. A ``Stream`` sends one message at a
+fixed period, optionally in bursts (``burst`` frames back to back every ``burst_every`` cycles), and
+``speedup`` divides every period to run the same mix at N times real time. The periods run on a
+``CyclicScheduler``, so late cycles are skipped (and counted in ``scheduler.stats()``) rather than
+piling up.
+
+``LatencyProbe`` is the receiving side: it is a python-can listener that decodes every frame through
+a ``DispatchTable`` and records how long after ``bus.send`` the frame was received and decoded.
+Frames of one ID arrive in the order they were sent, so send times are matched per ID, first in
+first out. Both ends have to be in the same process (the times are ``time.perf_counter``).
+
+The payloads are real encodings with no room for a sequence number, so a frame is matched by
+position only. Once a frame of an ID is lost, every later frame of that ID is matched with the send
+time of the frame before it: its latency is off by one period (more after further losses) for the
+rest of the run. ``outstanding`` staying above zero after the drain shows this happened; treat the
+latencies of such a run as suspect.
+
+Usage:
+    python -m utils.traffic_generator --duration 10 --speedup 20          # in-process virtual bus
+    python -m utils.traffic_generator --interface socketcan --channel vcan0 --burst 8
+"""
+
+import argparse
+import time
+from array import array
+from collections import defaultdict, deque
+from typing import Callable, NamedTuple
+
+import can
+import numpy as np
+
+from controller_applications.bender_ISO175_j1939 import ISO175_CA
+from controller_applications.ca_kubota_engine import Kubota_D902k_CA
+from controller_applications.ivt_can_controller import IVTSensor
+from controller_applications.wattalps.messages import (
+    generated,
+    msg_info,
+    msg_status,
+    msg_warnings,
+)
+from utils.can_dispatch import DispatchTable
+from utils.cyclic_scheduler import CyclicScheduler
+
+CAN_EFF_MASK = 0x1FFFFFFF
+# Source address of the generated engine commands (the VMU)
+CONTROLLER_ADDRESS = 0x27
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class Stream(NamedTuple):
+    name: str
+    arbitration_id: int
+    period: float  # s, at real time
+    encode: Callable[[], bytes]  # called for every frame
+    burst: int = 1  # frames sent back to back...
+    burst_every: int = 1  # ...every this many cycles, single frames in between
+    is_extended_id: bool = True
+
+
+def j1939_id(pgn, source_address, priority=6):
+    return (priority << 26) | (pgn << 8) | source_address
+
+
+def ivt_result_encoder(mux_id, value):
+    """Encoder of IVT result frames for ``mux_id``, with the message counter running."""
+    counter = 0
+
+    def encode():
+        nonlocal counter
+        counter = (counter + 1) & 0x0F
+        return IVTSensor.RESULT_FORMAT.pack(mux_id, counter, value)
+
+    return encode
+
+
+def default_mix(kubota=None):
+    """The traffic of one genset: engine commands, IVT results and the BMS messages.
+
+    Engine and IVT periods are the documented ones (see the ``info.md`` files). The DBC has no cycle
+    times for the BMS, so its status/info messages are sent at 100 ms and the slow ones at 1 s.
+    """
+    if kubota is None:
+        kubota = Kubota_D902k_CA("TrafficGenerator")
+        kubota.set_throttle_percent(40)
+    streams = [
+        Stream(
+            "kubota.engine_control",
+            j1939_id(kubota.PGN_TRANSMIT_ENGINE_CONTROL, CONTROLLER_ADDRESS, priority=3),
+            0.010,
+            kubota.encode_65363,
+        ),
+        Stream(
+            "kubota.vehicle_speed",
+            j1939_id(kubota.PGN_TRANSMIT_VEHICLE_SPEED, CONTROLLER_ADDRESS),
+            0.100,
+            kubota.encode_65265,
+        ),
+    ]
+
+    for mux_id, (label, _), period, value in (
+        (0x00, IVTSensor.MESSAGE_IDS[0x00], 0.020, -12500),
+        (0x01, IVTSensor.MESSAGE_IDS[0x01], 0.060, 52000),
+        (0x02, IVTSensor.MESSAGE_IDS[0x02], 0.060, 51800),
+        (0x03, IVTSensor.MESSAGE_IDS[0x03], 0.060, 51700),
+    ):
+        streams.append(
+            Stream(
+                f"ivt.{label}",
+                IVTSensor.BASE_ID + mux_id,
+                period,
+                ivt_result_encoder(mux_id, value),
+                is_extended_id=False,
+            )
+        )
+
+    info = msg_info.BmsVmuInfo(
+        soh=97, downstream_voltage=51.8, upstream_voltage=52.0, current=-12.5
+    )
+    cells = msg_info.BmsVmuInfoCells(
+        maximum_cell_voltage=3712, average_cell_voltage=3705, minimum_cell_voltage=3698
+    )
+    status = msg_status.decode_bms_vmu_status(bytes(msg_status.BmsVmuStatus.NUM_BYTES))
+    failure = msg_warnings.decode_bms_vmu_failure(bytes(msg_warnings.BmsVmuFailure.NUM_BYTES))
+    for name, message_id, period, encode, msg in (
+        ("bms.status", msg_status.MESSAGE_ID_BMS_VMU_STATUS, 0.100,
+         msg_status.encode_bms_vmu_status, status),
+        ("bms.info", msg_info.MESSAGE_ID_INFO, 0.100, msg_info.encode_info, info),
+        ("bms.info_cells", msg_info.MESSAGE_ID_INFO_CELLS, 0.100,
+         msg_info.encode_info_cells, cells),
+        ("bms.failure", msg_warnings.MESSAGE_ID_BMS_VMU_FAILURE, 1.0,
+         msg_warnings.encode_bms_vmu_failure, failure),
+    ):  # fmt: skip
+        # DBC message IDs carry the extended frame flag in bit 31
+        arbitration_id = message_id & CAN_EFF_MASK
+        streams.append(
+            Stream(name, arbitration_id, period, lambda encode=encode, msg=msg: encode(msg))
+        )
+    return streams
+
+
+def default_dispatch():
+    """Routes for everything ``default_mix`` sends that the project can decode."""
+    dispatch = DispatchTable()
+    ivt = IVTSensor("IVT", connect=False)
+    for arbitration_id in IVTSensor.RESULT_IDS:
+        dispatch.add_id(arbitration_id, ivt._decode_mux, "IVT Sensor")
+    dispatch.add_j1939_ca(Kubota_D902k_CA("KubotaD902K"), "Kubota Engine")
+    dispatch.add_j1939_ca(ISO175_CA("ISO175"), "ISO175")
+    for arbitration_id, decoder in generated.DECODERS_BY_ARBITRATION_ID.items():
+        dispatch.add_id(arbitration_id, decoder, "Wattalps BMS")
+    # 42 flags of which a check reads one or two: decode them lazily
+    dispatch.add_id(
+        msg_warnings.MESSAGE_ID_BMS_VMU_FAILURE & CAN_EFF_MASK,
+        msg_warnings.decode_bms_vmu_failure_view,
+        "Wattalps BMS",
+    )
+    return dispatch
+
+
+class TrafficGenerator:
+    def __init__(self, bus, streams, speedup=1.0, scheduler=None, on_send=None):
+        """
+        :param speedup: run the mix this many times faster than real time
+        :param scheduler: scheduler for the periods, a ``CyclicScheduler`` of its own if None
+        :param on_send: called with the arbitration ID right before every frame is sent
+        """
+        self.bus = bus
+        self.streams = list(streams)
+        self.speedup = speedup
+        self.scheduler = scheduler or CyclicScheduler()
+        self._own_scheduler = scheduler is None
+        self.on_send = on_send
+        self.sent = 0
+        self.send_errors = 0
+        self.scheduler_stats = {}  # scheduler.stats() when stopped
+        self._callbacks = []
+
+    def _stream_callback(self, stream):
+        message = can.Message(
+            arbitration_id=stream.arbitration_id, is_extended_id=stream.is_extended_id
+        )
+        cycle = 0
+
+        def send_cycle(cookie):
+            nonlocal cycle
+            frames = stream.burst if cycle % stream.burst_every == 0 else 1
+            cycle += 1
+            for _ in range(frames):
+                self.send(message, stream.encode())
+            return True
+
+        return send_cycle
+
+    def send(self, message, data):
+        message.data = data
+        message.dlc = len(data)
+        if self.on_send is not None:
+            self.on_send(message.arbitration_id)
+        try:
+            self.bus.send(message)
+        except can.CanError:
+            # TX queue full: the frame is lost, as it would be on a saturated bus
+            self.send_errors += 1
+            return
+        self.sent += 1
+
+    def start(self):
+        for stream in self.streams:
+            callback = self._stream_callback(stream)
+            self._callbacks.append(callback)
+            self.scheduler.add(stream.period / self.speedup, callback)
+        if self._own_scheduler:
+            self.scheduler.start()
+
+    def stop(self):
+        if self._own_scheduler:
+            self.scheduler.stop()
+        self.scheduler_stats = self.scheduler.stats()
+        for callback in self._callbacks:
+            self.scheduler.remove(callback)
+        self._callbacks = []
+
+    def frames_per_second(self):
+        """Average frame rate of the configured mix."""
+        return self.speedup * sum(
+            (stream.burst + stream.burst_every - 1) / stream.burst_every / stream.period
+            for stream in self.streams
+        )
+
+
+class LatencyProbe:
+    def __init__(self, dispatch=None, clock=time.perf_counter):
+        self.dispatch = dispatch or default_dispatch()
+        self.clock = clock
+        self.received = 0
+        self.decoded = 0
+        self.unmatched = 0  # received frames without a recorded send time
+        self.decode_errors = 0
+        self.receive_latency = array("d")
+        self.decode_latency = array("d")
+        self._sent = defaultdict(deque)  # arbitration ID -> send times, oldest first
+
+    def sent(self, arbitration_id):
+        """Record a send time. Call right before ``bus.send``, e.g. as ``on_send``."""
+        self._sent[arbitration_id].append(self.clock())
+
+    def on_message_received(self, msg):
+        received_at = self.clock()
+        self.received += 1
+        try:
+            sent_at = self._sent[msg.arbitration_id].popleft()
+        except IndexError:
+            self.unmatched += 1
+            return
+        self.receive_latency.append(received_at - sent_at)
+
+        route = self.dispatch.lookup(msg.arbitration_id, msg.is_extended_id)
+        if route is None:
+            return
+        try:
+            route.decoder(msg.data)
+        except Exception:
+            # A decoder bug only costs this frame, it must not escape into the notifier thread
+            self.decode_errors += 1
+            return
+        self.decoded += 1
+        self.decode_latency.append(self.clock() - sent_at)
+
+    __call__ = on_message_received
+
+    @property
+    def outstanding(self):
+        """Frames sent but not received (yet)."""
+        return sum(len(times) for times in self._sent.values())
+
+    def report(self):
+        return {
+            "received": self.received,
+            "decoded": self.decoded,
+            "unmatched": self.unmatched,
+            "decode_errors": self.decode_errors,
+            "outstanding": self.outstanding,
+            "receive_latency_us": latency_percentiles(self.receive_latency),
+            "decode_latency_us": latency_percentiles(self.decode_latency),
+        }
+
+
+def latency_percentiles(latencies, percentiles=PERCENTILES):
+    """{"count", "p50", ..., "max"} of latencies in s, reported in µs."""
+    values = np.asarray(latencies, dtype=np.float64)
+    report = {"count": len(values)}
+    if not len(values):
+        return report
+    for percentile, value in zip(percentiles, np.percentile(values, percentiles) * 1e6):
+        report[f"p{percentile:g}"] = float(value)
+    report["max"] = float(values.max() * 1e6)
+    return report
+
+
+def run(tx_bus, rx_bus, streams, duration, speedup=1.0, probe=None, drain=0.5):
+    """Send ``streams`` on ``tx_bus`` for ``duration`` s and measure them on ``rx_bus``."""
+    probe = probe or LatencyProbe()
+    generator = TrafficGenerator(tx_bus, streams, speedup, on_send=probe.sent)
+    notifier = can.Notifier(rx_bus, [probe.on_message_received])
+    started = time.perf_counter()
+    generator.start()
+    try:
+        time.sleep(duration)
+    finally:
+        generator.stop()
+        elapsed = time.perf_counter() - started
+        deadline = time.monotonic() + drain
+        while probe.outstanding and time.monotonic() < deadline:
+            time.sleep(0.01)
+        notifier.stop()
+
+    report = probe.report()
+    report.update(
+        sent=generator.sent,
+        send_errors=generator.send_errors,
+        target_fps=generator.frames_per_second(),
+        achieved_fps=generator.sent / elapsed,
+        scheduler=generator.scheduler_stats,
+    )
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic CAN traffic and measure latency"
+    )
+    parser.add_argument("--interface", default="virtual", help="python-can interface")
+    parser.add_argument("--channel", default="traffic", help="e.g. vcan0 with socketcan")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to send for")
+    parser.add_argument("--speedup", type=float, default=1.0, help="N times real time")
+    parser.add_argument("--burst", type=int, default=1, help="frames per burst, for every stream")
+    parser.add_argument("--burst-every", type=int, default=1, help="cycles between bursts")
+    args = parser.parse_args(argv)
+
+    streams = [
+        stream._replace(burst=args.burst, burst_every=args.burst_every) for stream in default_mix()
+    ]
+    tx_bus = can.interface.Bus(channel=args.channel, interface=args.interface)
+    rx_bus = can.interface.Bus(channel=args.channel, interface=args.interface)
+    try:
+        report = run(tx_bus, rx_bus, streams, args.duration, args.speedup)
+    finally:
+        tx_bus.shutdown()
+        rx_bus.shutdown()
+
+    print(
+        f"sent {report['sent']} frames ({report['achieved_fps']:.0f}/s of "
+        f"{report['target_fps']:.0f}/s), {report['send_errors']} send errors"
+    )
+    print(
+        f"received {report['received']}, decoded {report['decoded']}, "
+        f"{report['outstanding']} lost, {report['decode_errors']} decode errors"
+    )
+    for name in ("receive_latency_us", "decode_latency_us"):
+        percentiles = ", ".join(
+            f"{key} {value:.0f}" for key, value in report[name].items() if key != "count"
+        )
+        print(f"{name}: {percentiles}")
+    for period, stats in sorted(report["scheduler"].items()):
+        print(
+            f"period {period * 1000:g} ms: {stats['missed']} missed cycles, "
+            f"mean late {stats['mean_late_ms']:.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()